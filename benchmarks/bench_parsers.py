@@ -0,0 +1,115 @@
+"""
+Compare listing parser backends on large listing pages.
+
+Usage:
+    python benchmarks/bench_parsers.py [saved_listing.html ...] [--fixtures DIR] [--synthetic] [--repeat N]
+
+Without page arguments the listing pages of a fixture set are parsed, by default
+the committed benchmarks/fixtures/sample-blog. --synthetic adds a generated 1.5 MB
+Elementor listing padded with navigation, footer and script noise, which stresses
+the backends on the largest pages we scrape.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from blog_seo.scraper.parsers import PAGE_NUMBER_RE, PARSER_BACKENDS, StreamingListingParser  # noqa: E402
+
+from fixtures import load_fixtures  # noqa: E402
+
+DEFAULT_FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'sample-blog')
+
+
+def synthetic_listing(num_articles: int = 60, noise_kb: int = 1500) -> bytes:
+    """Build a listing page with ``num_articles`` posts and roughly ``noise_kb`` KB of boilerplate."""
+    nav = ''.join(f'<li class="menu-item"><a href="/section-{i}/">Section {i}</a></li>' for i in range(200))
+    script = '<script>var data = "' + 'x' * 1024 + '";</script>'
+    noise_blocks = max(noise_kb - 60, 1) // 2
+    articles = ''.join(
+        f'<article class="elementor-post elementor-grid-item post-{i}">'
+        f'<div class="elementor-post__text">'
+        f'<h3 class="elementor-post__title"><a href="https://example.com/blog/post-{i}/">Coping with anxiety, part {i}</a></h3>'
+        f'<div class="elementor-post__excerpt"><p>{"Practical steps for managing stress and worry. " * 6}</p></div>'
+        f'</div></article>'
+        for i in range(num_articles)
+    )
+    pagination = ''.join(f'<a class="page-numbers" href="https://example.com/blog/page/{i}/">{i}</a>' for i in range(2, 12))
+    html = (
+        f'<html><head>{script * noise_blocks}</head><body><nav><ul>{nav}</ul></nav>'
+        f'<main>{articles}<nav class="pagination">{pagination}</nav></main>'
+        f'<footer>{script * noise_blocks}{nav}</footer></body></html>'
+    )
+    return html.encode('utf-8')
+
+
+def fixture_listings(directory: str) -> list[tuple[str, bytes]]:
+    """Pages of a fixture set that hold a post listing."""
+    fixtures = load_fixtures(directory)
+    return [
+        (f"{os.path.basename(directory)}{path}", content)
+        for path, content in sorted(fixtures.pages.items())
+        if path == fixtures.listing_path or PAGE_NUMBER_RE.search(path)
+    ]
+
+
+def time_call(func, repeat: int) -> float:
+    """Return the best wall time of ``repeat`` calls, in milliseconds."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def stream_parse(content: bytes, limit: int | None, chunk_size: int = 16 * 1024) -> int:
+    """Feed the page to the streaming parser in chunks, as a streamed response would."""
+    parser = StreamingListingParser(limit)
+    text = content.decode('utf-8', errors='replace')
+    for start in range(0, len(text), chunk_size):
+        parser.feed(text[start:start + chunk_size])
+        if parser.done:
+            break
+    return len(parser.listing.posts)
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument('pages', nargs='*', help='Saved listing pages to parse')
+    arg_parser.add_argument('--fixtures', default=DEFAULT_FIXTURES,
+                            help='Fixture set whose listing pages are parsed when no pages are given')
+    arg_parser.add_argument('--synthetic', action='store_true', help='Also parse a generated 1.5 MB listing')
+    arg_parser.add_argument('--repeat', type=int, default=5, help='Runs per backend (best is reported)')
+    arg_parser.add_argument('--limit', type=int, default=10, help='Post limit for early-exit runs')
+    args = arg_parser.parse_args()
+
+    pages = [(path, open(path, 'rb').read()) for path in args.pages] or fixture_listings(args.fixtures)
+    if args.synthetic:
+        pages.append(('synthetic', synthetic_listing()))
+
+    for name, content in pages:
+        print(f"\n{name}: {len(content) / 1024:.0f} KB")
+        print(f"  {'backend':<24}{'posts':>8}{'best ms':>12}")
+        for backend_name, backend_cls in PARSER_BACKENDS.items():
+            if not backend_cls.available():
+                print(f"  {backend_name:<24}{'not installed':>20}")
+                continue
+            backend = backend_cls()
+            posts = len(backend.parse_listing(content).posts)
+            elapsed = time_call(lambda: backend.parse_listing(content), args.repeat)
+            print(f"  {backend_name:<24}{posts:>8}{elapsed:>12.1f}")
+
+        posts = stream_parse(content, None)
+        elapsed = time_call(lambda: stream_parse(content, None), args.repeat)
+        print(f"  {'streaming':<24}{posts:>8}{elapsed:>12.1f}")
+
+        posts = stream_parse(content, args.limit)
+        elapsed = time_call(lambda: stream_parse(content, args.limit), args.repeat)
+        print(f"  {f'streaming (limit={args.limit})':<24}{posts:>8}{elapsed:>12.1f}")
+
+
+if __name__ == '__main__':
+    main()
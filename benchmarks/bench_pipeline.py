@@ -0,0 +1,205 @@
+"""
+Benchmark scraping throughput and analysis latency offline.
+
+Usage:
+    python benchmarks/bench_pipeline.py [--fixtures DIR | --synthetic] [--posts N] [--latency S]
+                                        [--output results.json] [--baseline old.json]
+
+Blog pages are served from a local HTTP server and every LLM call goes to a
+deterministic stub with a fixed latency. Pages come from the committed fixture set
+in benchmarks/fixtures/sample-blog by default, from another set recorded with
+record_fixtures.py, or from a generated blog with --synthetic. Results are written as
+JSON and compared with benchmarks/results/baseline.json (or --baseline).
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import statistics
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from blog_seo.analyzer.batch import BatchAnalyzer  # noqa: E402
+from blog_seo.scraper.article_fetcher import ArticleFetcher, format_post_content  # noqa: E402
+from blog_seo.scraper.blog_scraper import BlogScraper  # noqa: E402
+from blog_seo.telemetry import get_telemetry  # noqa: E402
+
+from fixtures import FixtureServer, load_fixtures, synthetic_site  # noqa: E402
+from stub_llm import StubAnalyzer  # noqa: E402
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_DIR = os.path.join(BENCH_DIR, 'results')
+DEFAULT_FIXTURES = os.path.join(BENCH_DIR, 'fixtures', 'sample-blog')
+DEFAULT_BASELINE = os.path.join(RESULTS_DIR, 'baseline.json')
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process so far, in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def latency_stats(samples: list[float]) -> dict:
+    """Summary of latencies in seconds."""
+    ordered = sorted(samples)
+    return {
+        'runs': len(ordered),
+        'mean_s': statistics.fmean(ordered),
+        'p50_s': ordered[len(ordered) // 2],
+        'p95_s': ordered[min(int(len(ordered) * 0.95), len(ordered) - 1)],
+        'max_s': ordered[-1],
+    }
+
+
+def bench_scrape(server: FixtureServer, num_posts: int, runs: int, streaming: bool) -> tuple[dict, list[dict]]:
+    """Best-of-``runs`` throughput of scrape_blogs, uncached, through the whole listing."""
+    scraper = BlogScraper(use_cache=False, prefer_feeds=False, dedupe=False, streaming=streaming)
+    best, posts = float('inf'), []
+    for _ in range(runs):
+        start = time.perf_counter()
+        posts = scraper.scrape_blogs(server.listing_url, num_posts)
+        best = min(best, time.perf_counter() - start)
+    return {'posts': len(posts), 'best_s': best, 'posts_per_s': len(posts) / best}, posts
+
+
+def bench_fetch(posts: list[dict], runs: int) -> dict:
+    """Best-of-``runs`` throughput of fetching and extracting every article body."""
+    fetcher = ArticleFetcher(BlogScraper(use_cache=False, dedupe=False))
+    best = float('inf')
+    for _ in range(runs):
+        fresh = [{key: post[key] for key in ('title', 'link', 'excerpt')} for post in posts]
+        start = time.perf_counter()
+        fetcher.fetch_all(fresh)
+        best = min(best, time.perf_counter() - start)
+    posts[:] = fresh
+    return {'posts': len(posts), 'best_s': best, 'posts_per_s': len(posts) / best}
+
+
+def bench_analyze(posts: list[dict], latency: float, mode: str, samples: int) -> dict:
+    """End-to-end latency of analyze_content (keywords, headlines, then the article)."""
+    analyzer = StubAnalyzer(latency=latency, mode=mode)
+    timings = []
+    for post in posts[:samples]:
+        start = time.perf_counter()
+        analyzer.analyze_content(format_post_content(post))
+        timings.append(time.perf_counter() - start)
+    return latency_stats(timings)
+
+
+def bench_batch(posts: list[dict], latency: float, mode: str, concurrency: int) -> dict:
+    """Throughput of batch analysis, with the rate limits lifted so only the stub latency counts."""
+    batch = BatchAnalyzer(
+        StubAnalyzer(latency=latency, mode=mode), max_concurrency=concurrency,
+        requests_per_minute=1e9, tokens_per_minute=1e12
+    )
+    fresh = [dict(post, keywords='', summary='', analyzed=False) for post in posts]
+    start = time.perf_counter()
+    batch.analyze_posts(fresh)
+    elapsed = time.perf_counter() - start
+    return {'posts': len(fresh), 'elapsed_s': elapsed, 'posts_per_s': len(fresh) / elapsed}
+
+
+def flatten(results: dict, prefix: str = '') -> dict:
+    """Numeric metrics keyed by dotted path, for comparing runs."""
+    flat = {}
+    for key, value in results.items():
+        path = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, path + '.'))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[path] = value
+    return flat
+
+
+def print_comparison(baseline: dict, results: dict) -> None:
+    old, new = flatten(baseline), flatten(results)
+    print(f"\n  {'metric':<40}{'baseline':>12}{'current':>12}{'change':>10}")
+    for key, value in new.items():
+        # Stage totals depend on how many runs were made; only headline metrics are compared
+        if key not in old or key.startswith(('config.', 'stages.')):
+            continue
+        change = f"{(value - old[key]) / old[key] * 100:+.1f}%" if old[key] else ''
+        print(f"  {key:<40}{old[key]:>12.4g}{value:>12.4g}{change:>10}")
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    source = arg_parser.add_mutually_exclusive_group()
+    source.add_argument('--fixtures', default=DEFAULT_FIXTURES,
+                        help='Recorded fixture directory (default: benchmarks/fixtures/sample-blog)')
+    source.add_argument('--synthetic', action='store_true', help='Benchmark a generated blog instead')
+    arg_parser.add_argument('--posts', type=int, default=200,
+                            help='Posts to scrape, capped by the posts in the fixtures (default: 200)')
+    arg_parser.add_argument('--runs', type=int, default=3, help='Runs per scrape benchmark (best is reported)')
+    arg_parser.add_argument('--latency', type=float, default=0.05, help='Stub LLM latency per call, seconds')
+    arg_parser.add_argument('--samples', type=int, default=10, help='Posts timed through analyze_content per mode')
+    arg_parser.add_argument('--batch-posts', type=int, default=50, help='Posts analyzed in the batch benchmark')
+    arg_parser.add_argument('--concurrency', type=int, default=8, help='Batch analysis concurrency')
+    arg_parser.add_argument('--output', help='Results file (default: benchmarks/results/pipeline-<time>.json)')
+    arg_parser.add_argument('--baseline', default=DEFAULT_BASELINE,
+                            help='Earlier results file to compare against (default: benchmarks/results/baseline.json)')
+    arg_parser.add_argument('--no-baseline', action='store_true', help='Skip the comparison')
+    args = arg_parser.parse_args()
+
+    fixtures = synthetic_site(args.posts) if args.synthetic else load_fixtures(args.fixtures)
+    results = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'config': {
+            'fixtures': 'synthetic' if args.synthetic else os.path.relpath(args.fixtures, BENCH_DIR),
+            'posts': args.posts, 'runs': args.runs,
+            'latency_s': args.latency, 'samples': args.samples, 'batch_posts': args.batch_posts,
+            'concurrency': args.concurrency,
+        },
+    }
+
+    with FixtureServer(fixtures) as server:
+        results['scrape'], posts = bench_scrape(server, args.posts, args.runs, streaming=False)
+        results['scrape_streaming'], _ = bench_scrape(server, args.posts, args.runs, streaming=True)
+        results['fetch_articles'] = bench_fetch(posts, args.runs)
+
+    results['analyze_content'] = {
+        mode: bench_analyze(posts, args.latency, mode, args.samples) for mode in ('thorough', 'fast')
+    }
+    results['batch'] = {
+        mode: bench_batch(posts[:args.batch_posts], args.latency, mode, args.concurrency)
+        for mode in ('thorough', 'fast')
+    }
+    results['peak_rss_mb'] = peak_rss_mb()
+    results['stages'] = {row.pop('stage'): row for row in get_telemetry().summary()}
+
+    print(f"scrape_blogs:        {results['scrape']['posts_per_s']:.1f} posts/s ({results['scrape']['posts']} posts)")
+    print(f"  streaming:         {results['scrape_streaming']['posts_per_s']:.1f} posts/s")
+    print(f"fetch articles:      {results['fetch_articles']['posts_per_s']:.1f} posts/s")
+    for mode, stats in results['analyze_content'].items():
+        print(f"analyze_content ({mode}): mean {stats['mean_s']:.3f}s, p95 {stats['p95_s']:.3f}s")
+    for mode, stats in results['batch'].items():
+        print(f"batch ({mode}):      {stats['posts_per_s']:.1f} posts/s")
+    print(f"peak RSS:            {results['peak_rss_mb']:.1f} MB")
+
+    output = args.output or os.path.join(RESULTS_DIR, f"pipeline-{datetime.now():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {output}")
+
+    if args.no_baseline or os.path.abspath(output) == os.path.abspath(args.baseline):
+        return
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline.get('config', {}).get('fixtures') != results['config']['fixtures']:
+            print(f"\nNote: the baseline was run on {baseline.get('config', {}).get('fixtures')}")
+        print_comparison(baseline, results)
+    elif args.baseline != DEFAULT_BASELINE:
+        print(f"\nBaseline {args.baseline} not found")
+
+
+if __name__ == '__main__':
+    main()
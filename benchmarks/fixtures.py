@@ -0,0 +1,155 @@
+"""
+Blog fixtures served from a local HTTP server, for offline benchmarks.
+
+A fixture set maps URL paths to page bodies. Recorded sets keep absolute links to
+the recorded site as an ``{{origin}}`` placeholder, which is replaced by the local
+server's origin when a page is served. Without a recorded set a synthetic blog
+with paginated Elementor listings and full article pages is generated.
+"""
+import json
+import os
+import random
+import threading
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+ORIGIN_PLACEHOLDER = b'{{origin}}'
+MANIFEST_NAME = 'manifest.json'
+
+
+@dataclass
+class Fixtures:
+    """Page bodies by URL path, and the path of the first listing page."""
+    pages: dict[str, bytes]
+    listing_path: str
+
+
+def _sentence(rng: random.Random, vocabulary: list[str], words: int) -> str:
+    return ' '.join(rng.choice(vocabulary) for _ in range(words)).capitalize() + '.'
+
+
+def synthetic_site(num_posts: int = 200, per_page: int = 10, seed: int = 0) -> Fixtures:
+    """Generate a blog of ``num_posts`` articles listed ``per_page`` to a listing page."""
+    rng = random.Random(seed)
+    vocabulary = [
+        ''.join(rng.choice('abcdefghilmnoprstuvw') for _ in range(rng.randint(3, 10)))
+        for _ in range(3000)
+    ]
+    nav = ''.join(f'<li class="menu-item"><a href="/section-{i}/">Section {i}</a></li>' for i in range(60))
+    script = '<script>var data = "' + 'x' * 1024 + '";</script>'
+    pages = {}
+
+    for i in range(num_posts):
+        sections = ''.join(
+            f'<h2>{_sentence(rng, vocabulary, 5)}</h2>'
+            + ''.join(f'<p>{" ".join(_sentence(rng, vocabulary, 14) for _ in range(5))}</p>' for _ in range(3))
+            for _ in range(4)
+        )
+        pages[f'/blog/post-{i}/'] = (
+            f'<html><head><title>Post {i}</title>{script * 20}</head><body><nav><ul>{nav}</ul></nav>'
+            f'<article><h1>Post {i}</h1>{sections}</article>'
+            f'<footer>{nav}</footer></body></html>'
+        ).encode('utf-8')
+
+    num_pages = max((num_posts + per_page - 1) // per_page, 1)
+    for page in range(1, num_pages + 1):
+        articles = ''.join(
+            f'<article class="elementor-post elementor-grid-item post-{i}">'
+            f'<div class="elementor-post__text">'
+            f'<h3 class="elementor-post__title"><a href="{{{{origin}}}}/blog/post-{i}/">{_sentence(rng, vocabulary, 6)}</a></h3>'
+            f'<div class="elementor-post__excerpt"><p>{_sentence(rng, vocabulary, 30)}</p></div>'
+            f'</div></article>'
+            for i in range((page - 1) * per_page, min(page * per_page, num_posts))
+        )
+        pagination = ''.join(
+            f'<a class="page-numbers" href="{{{{origin}}}}/blog/page/{number}/">{number}</a>'
+            for number in range(1, num_pages + 1) if number != page
+        )
+        path = '/blog/' if page == 1 else f'/blog/page/{page}/'
+        pages[path] = (
+            f'<html><head>{script * 40}</head><body><nav><ul>{nav}</ul></nav>'
+            f'<main>{articles}<nav class="pagination">{pagination}</nav></main>'
+            f'<footer>{script * 40}{nav}</footer></body></html>'
+        ).encode('utf-8')
+
+    return Fixtures(pages, '/blog/')
+
+
+def save_fixtures(directory: str, bodies: dict[str, bytes], listing_url: str) -> None:
+    """Store recorded pages, keyed by absolute URL, as a fixture set."""
+    origin = '{0.scheme}://{0.netloc}'.format(urlparse(listing_url)).encode('utf-8')
+    os.makedirs(directory, exist_ok=True)
+    pages = {}
+    for index, (url, body) in enumerate(sorted(bodies.items())):
+        filename = f'page-{index:05d}.html'
+        with open(os.path.join(directory, filename), 'wb') as f:
+            f.write(body.replace(origin, ORIGIN_PLACEHOLDER))
+        pages[urlparse(url).path or '/'] = filename
+    manifest = {'listing_path': urlparse(listing_url).path or '/', 'pages': pages}
+    with open(os.path.join(directory, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+
+
+def load_fixtures(directory: str) -> Fixtures:
+    """Load a fixture set written by ``save_fixtures``."""
+    with open(os.path.join(directory, MANIFEST_NAME), encoding='utf-8') as f:
+        manifest = json.load(f)
+    pages = {}
+    for path, filename in manifest['pages'].items():
+        with open(os.path.join(directory, filename), 'rb') as f:
+            pages[path] = f.read()
+    return Fixtures(pages, manifest['listing_path'])
+
+
+class FixtureServer:
+    """
+    Serve a fixture set on a random local port for the duration of a ``with`` block.
+
+    Unknown paths return 404, so feed and sitemap probes behave as on a blog without them.
+    """
+
+    def __init__(self, fixtures: Fixtures):
+        self.fixtures = fixtures
+        self._server = None
+        self._thread = None
+        self.origin = ''
+
+    @property
+    def listing_url(self) -> str:
+        return self.origin + self.fixtures.listing_path
+
+    def __enter__(self) -> 'FixtureServer':
+        pages = self.fixtures.pages
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                body = pages.get(urlparse(self.path).path)
+                if body is None:
+                    self.send_response(404)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+                body = body.replace(ORIGIN_PLACEHOLDER, server.origin.encode('utf-8'))
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._server.daemon_threads = True
+        self.origin = f'http://127.0.0.1:{self._server.server_address[1]}'
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,51 @@
+"""
+Record a live blog as a fixture set for bench_pipeline.py.
+
+Usage:
+    python benchmarks/record_fixtures.py https://example.com/blog/ -n 100 -o benchmarks/fixtures/example
+
+Every listing page and article page the scraper fetches is saved, with links to the
+blog's own origin rewritten so the pages can be served from a local server.
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from blog_seo.scraper.article_fetcher import ArticleFetcher  # noqa: E402
+from blog_seo.scraper.blog_scraper import BlogScraper  # noqa: E402
+
+from fixtures import save_fixtures  # noqa: E402
+
+
+class RecordingScraper(BlogScraper):
+    """Scraper that keeps the body of every page it fetches successfully."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.recorded: dict[str, bytes] = {}
+
+    def fetch(self, url: str) -> bytes:
+        body = super().fetch(url)
+        self.recorded[url] = body
+        return body
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument('url', help='Blog listing URL')
+    arg_parser.add_argument('-n', '--num-posts', type=int, default=100, help='Posts to record (default: 100)')
+    arg_parser.add_argument('-o', '--output', required=True, help='Fixture directory to write')
+    args = arg_parser.parse_args()
+
+    # Feeds are skipped so the recording exercises the HTML listing path
+    scraper = RecordingScraper(use_cache=False, prefer_feeds=False, dedupe=False)
+    posts = scraper.scrape_blogs(args.url, args.num_posts)
+    ArticleFetcher(scraper).fetch_all(posts)
+    save_fixtures(args.output, scraper.recorded, args.url)
+    print(f"Recorded {len(scraper.recorded)} pages for {len(posts)} posts in {args.output}")
+
+
+if __name__ == '__main__':
+    main()
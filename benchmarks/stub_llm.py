@@ -0,0 +1,133 @@
+"""
+Deterministic stand-ins for the crewai and LangChain clients used by SEOAnalyzer.
+
+Every call sleeps for a configurable latency and answers from the prompt alone, so
+pipeline benchmarks measure orchestration overhead and concurrency rather than the
+model or the network, and cost nothing.
+"""
+import json
+import os
+import re
+import sys
+import time
+from collections import Counter
+from types import SimpleNamespace
+from typing import Iterator
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from blog_seo.analyzer.seo_analyzer import SEOAnalyzer  # noqa: E402
+from blog_seo.telemetry import estimate_tokens  # noqa: E402
+
+WORD_RE = re.compile(r'[a-z]{6,}')
+
+
+def _top_words(text: str, count: int) -> list[str]:
+    return [word for word, _ in Counter(WORD_RE.findall(text.lower())).most_common(count)]
+
+
+def respond(prompt: str) -> str:
+    """Deterministic answer shaped like what the real prompt asks for."""
+    words = _top_words(prompt, 12) or ['counselling']
+    if 'single JSON object' in prompt:
+        return json.dumps({
+            'keywords': words[:8],
+            'headlines': [{'headline': word.title(), 'key_points': words[:3]} for word in words[:4]],
+            'summary': f"A post about {', '.join(words[:3])}.",
+        })
+    if 'comma-separated list of keywords' in prompt:
+        return ', '.join(words[:8])
+    if 'summary' in prompt:
+        return f"A post about {', '.join(words[:3])}."
+    if 'headlines' in prompt.lower() and 'Planning Phase' not in prompt:
+        return '\n'.join(f"**{word.title()}**\n- {', '.join(words[:3])}" for word in words[:4])
+    paragraph = ' '.join(words) + '. '
+    return '<article>' + paragraph * 80 + '</article>'
+
+
+class StubLLM:
+    """Stands in for ``crewai.LLM``: ``call`` sleeps, then answers from the prompt."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def call(self, messages: list[dict]) -> str:
+        time.sleep(self.latency)
+        return respond(messages[-1]['content'])
+
+
+class StubCrew:
+    """Stands in for a single-task ``crewai.Crew``, including its optional planning call."""
+
+    def __init__(self, agent: StubLLM, description: str, planner: StubLLM | None):
+        self.agent = agent
+        self.description = description
+        self.planner = planner
+
+    def kickoff(self) -> SimpleNamespace:
+        prompt_tokens = completion_tokens = requests = 0
+        messages = [{'role': 'user', 'content': self.description}]
+        if self.planner is not None:
+            plan = self.planner.call([{'role': 'user', 'content': 'Plan this task: ' + self.description}])
+            prompt_tokens += estimate_tokens(self.description)
+            completion_tokens += estimate_tokens(plan)
+            requests += 1
+        raw = self.agent.call(messages)
+        prompt_tokens += estimate_tokens(self.description)
+        completion_tokens += estimate_tokens(raw)
+        usage = SimpleNamespace(
+            prompt_tokens=prompt_tokens, completion_tokens=completion_tokens, successful_requests=requests + 1
+        )
+        return SimpleNamespace(raw=raw, token_usage=usage)
+
+
+class StubChatModel:
+    """Stands in for ``ChatAnthropic``: streams the answer after a first-token delay."""
+
+    def __init__(self, latency: float, chunk_words: int = 20):
+        self.latency = latency
+        self.chunk_words = chunk_words
+
+    def stream(self, messages: list[tuple[str, str]]) -> Iterator[SimpleNamespace]:
+        prompt = messages[-1][1]
+        time.sleep(self.latency)
+        words = respond(prompt).split(' ')
+        yield SimpleNamespace(content='', usage_metadata={'input_tokens': estimate_tokens(prompt), 'output_tokens': 0})
+        for start in range(0, len(words), self.chunk_words):
+            chunk = ' '.join(words[start:start + self.chunk_words]) + ' '
+            yield SimpleNamespace(content=chunk, usage_metadata={'input_tokens': 0, 'output_tokens': estimate_tokens(chunk)})
+
+
+class StubAnalyzer(SEOAnalyzer):
+    """
+    SEOAnalyzer whose LLM, agents, crews and chat model are the stubs above.
+
+    Everything between the public API and the client calls (pipeline scheduling,
+    planning round trips, fast mode call sharing, telemetry) runs unchanged.
+    The result cache is off by default so every run pays the stub latency.
+    """
+
+    def __init__(self, latency: float = 0.05, mode: str = 'thorough', use_cache: bool = False, **kwargs):
+        super().__init__(use_cache=use_cache, mode=mode, **kwargs)
+        self.latency = latency
+
+    def _create_llm(self, **kwargs) -> StubLLM:
+        return StubLLM(self.latency)
+
+    def _create_keyword_agent(self) -> StubLLM:
+        return self._create_llm()
+
+    def _create_summary_agent(self) -> StubLLM:
+        return self._create_llm()
+
+    def _create_headline_agent(self) -> StubLLM:
+        return self._create_llm()
+
+    def _create_content_generator_agent(self) -> StubLLM:
+        return self._create_llm()
+
+    def _create_crew(self, agent: StubLLM, description: str, expected_output: str) -> StubCrew:
+        return StubCrew(agent, description, self.manager_llm if self.planning else None)
+
+    def _create_chat_model(self) -> StubChatModel:
+        return StubChatModel(self.latency)
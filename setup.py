@@ -1,11 +1,14 @@
 import os
+import sys
+
+from setuptools import find_packages, setup
 
 port = int(os.environ.get("PORT", 8501))
 
 def setup_config():
     config_dir = os.path.join(os.path.expanduser('~'), '.streamlit')
     os.makedirs(config_dir, exist_ok=True)
-    
+
     config_path = os.path.join(config_dir, 'config.toml')
     with open(config_path, 'w') as f:
         f.write(f"""
@@ -19,5 +22,27 @@ address = "0.0.0.0"
 gatherUsageStats = false
         """)
 
+def read_requirements():
+    requirements_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'requirements.txt')
+    with open(requirements_path) as f:
+        return [line.strip() for line in f if line.strip() and not line.startswith('#')]
+
 if __name__ == "__main__":
-    setup_config()
\ No newline at end of file
+    if len(sys.argv) == 1:
+        # `python setup.py` on its own writes the Streamlit server config
+        setup_config()
+    else:
+        setup(
+            name="blog-seo-analyzer",
+            version="0.1.0",
+            description="Scrape blog posts and generate SEO insights",
+            package_dir={"": "src"},
+            packages=find_packages("src"),
+            python_requires=">=3.10",
+            install_requires=read_requirements(),
+            entry_points={
+                "console_scripts": [
+                    "blog-seo=blog_seo.cli:main",
+                ],
+            },
+        )
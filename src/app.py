@@ -1,46 +1,29 @@
+import io
+from typing import Iterator
+
 import streamlit as st
 from dotenv import load_dotenv
-import os
-from concurrent.futures import ThreadPoolExecutor
-from typing import Dict, Any
 
-from scraper.blog_scraper import BlogScraper
-from analyzer.seo_analyzer import SEOAnalyzer
+from blog_seo.scraper.blog_scraper import BlogScraper
+from blog_seo.scraper.article_fetcher import ArticleFetcher
+from blog_seo.scraper.dedupe import mark_duplicates, share_analysis
+from blog_seo.scraper.export import EXPORT_FORMATS, export_posts, import_posts
+from blog_seo.scraper.post_store import ANALYSIS_FIELDS, get_post_store
+from blog_seo.scraper.posts import compact_posts
+from blog_seo.analyzer.seo_analyzer import SEOAnalyzer, is_error_result
+from blog_seo.analyzer.batch import BatchAnalyzer
+from blog_seo.analyzer.jobs import JobWorkerPool
+from blog_seo.analyzer.keywords import extract_post_keywords
+from blog_seo.telemetry import get_telemetry
 
 # Load environment variables
 load_dotenv()
 
-def analyze_content_async(analyzer: SEOAnalyzer, content: str, analysis_type: str) -> Dict[str, Any]:
-    """Run specific analysis asynchronously."""
-    from multiprocessing import Manager
-    manager = Manager()
-    return_dict = manager.dict()
-    
-    if analysis_type == 'keywords':
-        analyzer._extract_keywords(content, return_dict)
-        return {'keywords': return_dict.get('keywords', '')}
-    elif analysis_type == 'headlines':
-        analyzer._extract_headlines_and_keypoints(content, return_dict)
-        return {'headlines_and_keypoints': return_dict.get('headlines_and_keypoints', '')}
-    elif analysis_type == 'generate_article':
-        # First get keywords and headlines if not already present
-        if not return_dict.get('keywords'):
-            analyzer._extract_keywords(content, return_dict)
-        if not return_dict.get('headlines_and_keypoints'):
-            analyzer._extract_headlines_and_keypoints(content, return_dict)
-        
-        # Generate the article
-        analyzer._generate_new_article(
-            return_dict.get('headlines_and_keypoints', ''),
-            return_dict.get('keywords', ''),
-            return_dict
-        )
-        return {
-            'keywords': return_dict.get('keywords', ''),
-            'headlines_and_keypoints': return_dict.get('headlines_and_keypoints', ''),
-            'generated_article': return_dict.get('generated_article', '')
-        }
-    return {}
+PAGE_SIZES = (25, 50, 100)
+
+def create_analyzer() -> SEOAnalyzer:
+    """Create an analyzer in the analysis mode selected in the sidebar."""
+    return SEOAnalyzer(mode=st.session_state.get('analysis_mode', 'thorough'))
 
 def show_blog_list():
     """Display the list of blog posts and scraping interface."""
@@ -58,34 +41,185 @@ def show_blog_list():
         num_posts = st.number_input(
             "Number of posts to scrape:", 
             min_value=1, 
-            max_value=100, 
+            max_value=1000, 
             value=10
         )
     
     # Initialize components
-    scraper = BlogScraper()
+    scraper = BlogScraper(on_error=st.error)
+    store = get_post_store()
 
     if st.button("Scrape Blog Posts"):
         with st.spinner("Scraping blog posts..."):
             blog_posts = scraper.scrape_blogs(url, num_posts)
-            if blog_posts:
-                st.session_state['blog_posts'] = blog_posts
-                st.success(f"Found {len(blog_posts)} blog posts!")
-            else:
-                st.warning(
-                    "No blog posts found. Try adjusting the URL or check if the website is accessible."
-                )
+        if blog_posts:
+            # Unchanged posts come back from the store with their content and analysis
+            blog_posts = store.sync(url, blog_posts)
+            # Pull the full article bodies so analysis sees more than the excerpt
+            missing = [post for post in blog_posts if not post.get('content')]
+            if missing:
+                progress = st.progress(0.0, text="Fetching article content...")
+                fetcher = ArticleFetcher(scraper)
+                for done, _ in enumerate(fetcher.iter_articles(missing), start=1):
+                    progress.progress(done / len(missing), text=f"Fetched {done}/{len(missing)} articles")
+                progress.empty()
+            # Re-check near-duplicates now that full bodies are known, and reuse
+            # analysis already done on the first copy of each
+            mark_duplicates(blog_posts, scraper.dedupe_index)
+            share_analysis(blog_posts, ANALYSIS_FIELDS)
+            # Instant offline keywords for every post, scored against the whole scrape
+            extract_post_keywords(blog_posts)
+            store.save(blog_posts)
+            st.session_state['blog_posts'] = compact_posts(blog_posts)
+            counts = {status: sum(1 for post in blog_posts if post['status'] == status)
+                      for status in ('new', 'changed', 'unchanged')}
+            st.success(
+                f"Found {len(blog_posts)} blog posts! "
+                f"{counts['new']} new, {counts['changed']} changed, {counts['unchanged']} unchanged."
+            )
+        else:
+            st.warning(
+                "No blog posts found. Try adjusting the URL or check if the website is accessible."
+            )
+    elif 'blog_posts' not in st.session_state:
+        saved = store.count(url)
+        if saved and st.button(f"Load {saved} saved posts"):
+            st.session_state['blog_posts'] = compact_posts(store.get_posts(url))
+            st.rerun()
+
+    show_import_export()
 
     if 'blog_posts' in st.session_state:
         st.subheader("Blog Posts")
+
+        pending = [post for post in st.session_state['blog_posts'] if not post.get('analyzed')]
+        if pending and st.button(f"Analyze All Posts ({len(pending)} remaining)"):
+            progress = st.progress(0.0, text="Analyzing posts...")
+            done = []
+
+            def on_result(post: dict) -> None:
+                done.append(post)
+                store.update(post['link'], {field: post.get(field, '') for field in (*ANALYSIS_FIELDS, 'analyzed')})
+                progress.progress(len(done) / len(pending), text=f"Analyzed {len(done)}/{len(pending)}: {post['title']}")
+
+            BatchAnalyzer(create_analyzer()).analyze_posts(pending, on_result=on_result)
+            progress.empty()
+            failed = sum(1 for post in pending if not post.get('analyzed'))
+            if failed:
+                st.warning(f"{failed} posts could not be fully analyzed. Run the batch again to retry them.")
+            else:
+                st.success(f"Analyzed {len(pending)} posts!")
         
-        for index, post in enumerate(st.session_state['blog_posts']):
-            # Create a clickable title that sets the selected post
-            if st.button(f"{index+1}. {post['title']}", key=f"post_{index}"):
-                st.session_state['selected_post'] = index
-                st.session_state['page'] = 'detail'
+        show_post_page(st.session_state['blog_posts'])
+
+def show_post_page(posts: list) -> None:
+    """List one page of posts, optionally filtered by title, as buttons opening their detail view."""
+    col1, col2, col3 = st.columns([3, 1, 1])
+    with col1:
+        query = st.text_input("Filter by title", key='post_filter').strip().lower()
+    with col2:
+        page_size = st.selectbox("Posts per page", PAGE_SIZES, key='page_size')
+
+    # Only the current page is rendered, so reruns stay fast however many posts there are
+    indexes = range(len(posts))
+    if query:
+        indexes = [index for index, post in enumerate(posts) if query in post['title'].lower()]
+    page_count = max(-(-len(indexes) // page_size), 1)
+    if st.session_state.get('post_page', 1) > page_count:
+        st.session_state['post_page'] = page_count
+    with col3:
+        page = st.number_input(f"Page (of {page_count})", min_value=1, max_value=page_count, key='post_page')
+
+    start = (page - 1) * page_size
+    for index in indexes[start:start + page_size]:
+        post = posts[index]
+        # Create a clickable title that sets the selected post
+        label = f"{index+1}. {post['title']}"
+        if post.get('status') in ('new', 'changed'):
+            label += f" ({post['status']})"
+        if post.get('duplicate_of'):
+            label += " (duplicate)"
+        if st.button(label, key=f"post_{index}"):
+            st.session_state['selected_post'] = index
+            st.session_state['page'] = 'detail'
+            st.rerun()
+    if len(indexes) > page_size:
+        st.caption(f"Showing {start + 1}-{min(start + page_size, len(indexes))} of {len(indexes)} posts")
+
+def show_import_export() -> None:
+    """Export the session's posts with their analysis, or replace them with an imported file."""
+    with st.expander("Export or import posts"):
+        posts = st.session_state.get('blog_posts')
+        fmt = st.selectbox("Format", sorted(set(EXPORT_FORMATS.values())), key='export_format')
+        # Built on request rather than on every rerun, since large corpora take a while to serialize
+        if posts and st.button("Prepare export"):
+            buffer = io.BytesIO()
+            try:
+                count = export_posts(posts, buffer, fmt)
+            except ImportError as e:
+                st.error(str(e))
+            else:
+                st.download_button(
+                    f"Download {count} posts", buffer.getvalue(), file_name=f"blog-posts.{fmt}",
+                    mime='application/octet-stream'
+                )
+
+        uploaded = st.file_uploader(
+            "Import posts", type=[extension.lstrip('.') for extension in EXPORT_FORMATS], key='import_file'
+        )
+        if uploaded is not None and st.button("Import"):
+            try:
+                posts = compact_posts(import_posts(uploaded))
+                # Background jobs write their results to the store, so imported posts must be in it
+                get_post_store().upsert(posts)
+                st.session_state['blog_posts'] = posts
+            except (ImportError, ValueError) as e:
+                st.error(f"Could not import {uploaded.name}: {e}")
+            else:
+                st.session_state.pop('selected_post', None)
                 st.rerun()
 
+@st.cache_resource
+def get_job_pool() -> JobWorkerPool:
+    """Background analysis workers shared by every session of this server."""
+    return JobWorkerPool().start()
+
+def submit_analysis(post: dict, task: str) -> None:
+    """Queue an analysis task for a post in the mode selected in the sidebar."""
+    get_job_pool().submit(post, task, st.session_state.get('analysis_mode', 'thorough'))
+
+def refresh_post(post: dict) -> None:
+    """Copy results written by background jobs into this session's copy of the post."""
+    stored = get_post_store().get(post['link'])
+    if stored:
+        post.update({field: stored[field] for field in ANALYSIS_FIELDS if stored.get(field)})
+
+def catch_errors(stream: Iterator[str], errors: list) -> Iterator[str]:
+    """
+    Pass a stream through, ending it quietly and recording the error if it raises.
+
+    Only the stream's own errors are caught, so Streamlit's rerun and stop signals,
+    raised in the script around it, still propagate.
+    """
+    try:
+        yield from stream
+    except Exception as e:
+        errors.append(e)
+
+def is_ready(post: dict, task: str) -> bool:
+    return bool(post.get(task)) and not is_error_result(task, post[task])
+
+@st.fragment(run_every=2)
+def watch_jobs(link: str):
+    """Poll a post's background jobs, rerunning the page once they have all finished."""
+    active = [job.task for job in get_job_pool().queue.latest(link).values() if job.active]
+    if not active:
+        st.rerun()
+    st.caption(
+        f"Running in the background: {', '.join(task.replace('_', ' ') for task in active)}. "
+        "You can switch posts or pages meanwhile."
+    )
+
 def show_blog_detail():
     """Display detailed analysis for a selected blog post."""
     if 'selected_post' not in st.session_state:
@@ -94,6 +228,8 @@ def show_blog_detail():
         return
 
     post = st.session_state['blog_posts'][st.session_state['selected_post']]
+    refresh_post(post)
+    jobs = get_job_pool().queue.latest(post['link'])
     
     # Add a back button
     if st.button("← Back to Blog List"):
@@ -103,54 +239,110 @@ def show_blog_detail():
 
     st.title(post['title'])
     st.write("**Link:**", post['link'])
+    if post.get('duplicate_of'):
+        st.caption(f"Near-duplicate of {post['duplicate_of']}")
+    if any(job.active for job in jobs.values()):
+        watch_jobs(post['link'])
     
     # Create tabs for different sections
     tab1, tab2, tab3, tab4 = st.tabs(["Content", "Keywords", "Headlines & Key Points", "Generated Article"])
     
     with tab1:
         st.subheader("Blog Content")
-        st.write(post['excerpt'])
+        if post.get('summary'):
+            st.info(post['summary'])
+        st.write(post.get('content') or post['excerpt'])
     
     with tab2:
         st.subheader("Keywords Analysis")
-        content = f"Title: {post['title']}\n\nExcerpt: {post['excerpt']}"
+
+        if post.get('local_keywords'):
+            st.caption("Quick keywords (local, no LLM)")
+            st.write(post['local_keywords'])
         
-        if not post.get('keywords'):
+        if 'keywords' in jobs and jobs['keywords'].active:
+            st.info("Extracting keywords...")
+        elif not post.get('keywords'):
             if st.button("Extract Keywords", key="analyze_keywords"):
-                with st.spinner("Extracting keywords..."):
-                    analyzer = SEOAnalyzer()
-                    result = analyze_content_async(analyzer, content, 'keywords')
-                    post.update(result)
-                    st.rerun()
+                submit_analysis(post, 'keywords')
+                st.rerun()
         
         if post.get('keywords'):
+            if post.get('keywords_source') == 'local':
+                st.caption("The LLM keyword task failed; these are local keywords and will be "
+                           "replaced the next time keywords are extracted")
             st.write(post['keywords'])
     
     with tab3:
         st.subheader("Headlines and Key Points")
-        if not post.get('headlines_and_keypoints'):
+        if 'headlines_and_keypoints' in jobs and jobs['headlines_and_keypoints'].active:
+            st.info("Extracting headlines and key points...")
+        elif not post.get('headlines_and_keypoints'):
             if st.button("Extract Headlines", key="analyze_headlines"):
-                with st.spinner("Extracting headlines and key points..."):
-                    analyzer = SEOAnalyzer()
-                    result = analyze_content_async(analyzer, content, 'headlines')
-                    post.update(result)
-                    st.rerun()
+                submit_analysis(post, 'headlines_and_keypoints')
+                st.rerun()
         
         if post.get('headlines_and_keypoints'):
             st.write(post['headlines_and_keypoints'])
     
     with tab4:
         st.subheader("Generated SEO-Optimized Article")
-        if st.button("Generate New Article", key="generate_article"):
-            with st.spinner("Generating SEO-optimized article..."):
-                analyzer = SEOAnalyzer()
-                result = analyze_content_async(analyzer, content, 'generate_article')
-                post.update(result)
+        prerequisites = ('keywords', 'headlines_and_keypoints')
+        waiting = st.session_state.setdefault('articles_waiting', set())
+        generate = st.button("Generate New Article", key="generate_article")
+
+        if generate and not all(is_ready(post, task) for task in prerequisites):
+            # Extract the inputs in the background; generation starts once they are stored
+            for task in prerequisites:
+                if not is_ready(post, task):
+                    submit_analysis(post, task)
+            waiting.add(post['link'])
+            st.rerun()
+        if post['link'] in waiting:
+            if all(is_ready(post, task) for task in prerequisites):
+                waiting.discard(post['link'])
+                generate = True
+            elif not any(jobs[task].active for task in prerequisites if task in jobs):
+                waiting.discard(post['link'])
+                st.error("Keywords and headlines could not be extracted, so no article was generated.")
+            else:
+                st.info("Extracting keywords and headlines first...")
+
+        if generate and all(is_ready(post, task) for task in prerequisites):
+            analyzer = create_analyzer()
+            # Clicking Stop reruns the script, which abandons the stream mid-request;
+            # the partial article is neither cached nor stored
+            st.button("Stop Generation", key="stop_generation")
+            errors = []
+            article = st.write_stream(
+                catch_errors(analyzer.stream_article(post['headlines_and_keypoints'], post['keywords']), errors)
+            )
+            if errors:
+                st.error(f"Error generating article: {str(errors[0])}")
+            else:
+                post['generated_article'] = article
+                get_post_store().update(post['link'], {'generated_article': article})
                 st.rerun()
+        elif st.session_state.get('stop_generation'):
+            st.info("Article generation stopped.")
         
         if post.get('generated_article'):
             st.write(post['generated_article'])
 
+def show_timing_panel():
+    """Show per-stage timings, token usage and cost recorded in this server process."""
+    telemetry = get_telemetry()
+    with st.sidebar.expander("Timing & cost"):
+        rows = telemetry.summary()
+        if not rows:
+            st.caption("Nothing recorded yet.")
+            return
+        st.metric("Estimated LLM cost", f"${sum(row['cost_usd'] for row in rows):.4f}")
+        st.dataframe(rows, hide_index=True, use_container_width=True)
+        if st.button("Reset timings", key="reset_telemetry"):
+            telemetry.reset()
+            st.rerun()
+
 def main():
     """Main application function."""
     # Set page config
@@ -159,6 +351,17 @@ def main():
     # Initialize session state
     if 'page' not in st.session_state:
         st.session_state['page'] = 'list'
+
+    st.sidebar.radio(
+        "Analysis mode",
+        options=['fast', 'thorough'],
+        format_func=lambda mode: {
+            'fast': "Fast (single call, no planning)",
+            'thorough': "Thorough (one planned crew per task)"
+        }[mode],
+        index=1,
+        key='analysis_mode'
+    )
     
     # Show appropriate page
     if st.session_state['page'] == 'list':
@@ -166,5 +369,7 @@ def main():
     else:
         show_blog_detail()
 
+    show_timing_panel()
+
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -0,0 +1,3 @@
+"""
+Command-line entry point and shared runtime services such as telemetry.
+"""
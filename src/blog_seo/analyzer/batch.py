@@ -0,0 +1,197 @@
+"""
+Batch analysis of many posts under the LLM provider's rate limits.
+"""
+import asyncio
+import os
+import random
+import time
+from typing import Callable, Dict, Iterable
+
+from ..scraper.article_fetcher import ArticleFetcher, format_post_content
+from ..scraper.dedupe import NearDuplicateIndex
+from ..scraper.posts import post_text
+from ..telemetry import estimate_tokens
+
+from .pipeline import KEYWORDS_SOURCE, AnalysisPipeline, run_sync
+from .seo_analyzer import ERROR_MESSAGES, SEOAnalyzer
+
+DEFAULT_BATCH_TASKS = ('keywords', 'headlines_and_keypoints', 'summary')
+
+# Rough completion budget per task, used to reserve output tokens up front
+OUTPUT_TOKEN_ESTIMATES = {
+    'keywords': 200,
+    'summary': 200,
+    'headlines_and_keypoints': 1000,
+    'generated_article': 4000,
+}
+
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504, 529}
+RETRYABLE_MESSAGES = ('rate limit', 'rate_limit', 'overloaded', 'too many requests', 'timed out', 'timeout')
+
+
+class TokenBucket:
+    """Asyncio token bucket refilled continuously at ``rate`` tokens per second."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, amount: float = 1) -> None:
+        """Wait until ``amount`` tokens are available and take them."""
+        # A request larger than the bucket could never be admitted; let it drain the bucket instead
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                await asyncio.sleep((amount - self.tokens) / self.rate)
+
+
+class RateLimiter:
+    """Request-per-minute and token-per-minute limits applied together."""
+
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float):
+        self.requests = TokenBucket(requests_per_minute / 60, requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute / 60, tokens_per_minute)
+
+    async def acquire(self, requests: float, tokens: float) -> None:
+        await self.requests.acquire(requests)
+        await self.tokens.acquire(tokens)
+
+
+def is_retryable(error: Exception) -> bool:
+    """Whether an LLM error is a rate limit or transient server error worth retrying."""
+    status = getattr(error, 'status_code', None)
+    if status is None:
+        status = getattr(getattr(error, 'response', None), 'status_code', None)
+    if isinstance(status, int):
+        return status in RETRYABLE_STATUS_CODES
+    message = str(error).lower()
+    return any(str(code) in message for code in (429, 503, 529)) or any(
+        text in message for text in RETRYABLE_MESSAGES
+    )
+
+
+class RateLimitedPipeline(AnalysisPipeline):
+    """
+    Analysis pipeline that admits LLM calls through a shared rate limiter and
+    retries rate-limit and 5xx errors with jittered exponential backoff.
+    """
+
+    def __init__(self, analyzer: SEOAnalyzer, limiter: RateLimiter, max_retries: int = 5,
+                 base_delay: float = 2.0, max_delay: float = 60.0):
+        super().__init__(analyzer)
+        self.limiter = limiter
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    async def call_task(self, task: str, text: str, inputs: Dict[str, str]) -> str:
+        prompt_tokens = estimate_tokens(text) + sum(estimate_tokens(value) for value in inputs.values())
+        calls = self.analyzer.estimated_calls(task)
+        tokens = (prompt_tokens + OUTPUT_TOKEN_ESTIMATES.get(task, 500)) * calls
+
+        for attempt in range(self.max_retries + 1):
+            await self.limiter.acquire(calls, tokens)
+            try:
+                return await super().call_task(task, text, inputs)
+            except Exception as e:
+                if attempt == self.max_retries or not is_retryable(e):
+                    raise
+                # Full jitter: sleep anywhere between zero and the exponential cap
+                delay = min(self.max_delay, self.base_delay * 2 ** attempt)
+                await asyncio.sleep(random.uniform(0, delay))
+
+
+class BatchAnalyzer:
+    """
+    Analyze a whole list of posts with bounded concurrency.
+
+    Every post runs through a rate-limited analysis pipeline; at most
+    ``max_concurrency`` posts are in flight at once, and each post's ``analyzed``
+    flag is updated as soon as its tasks finish. With ``dedupe``, near-duplicate
+    posts are grouped and only the first of each group is sent to the LLM; its
+    results are copied to the rest.
+    """
+
+    def __init__(self, analyzer: SEOAnalyzer | None = None, tasks: Iterable[str] = DEFAULT_BATCH_TASKS,
+                 max_concurrency: int = 4, requests_per_minute: float | None = None,
+                 tokens_per_minute: float | None = None, max_retries: int = 5, dedupe: bool = True):
+        self.analyzer = analyzer or SEOAnalyzer()
+        self.tasks = list(tasks)
+        self.max_concurrency = max_concurrency
+        self.requests_per_minute = requests_per_minute or float(os.getenv('LLM_REQUESTS_PER_MINUTE', 50))
+        self.tokens_per_minute = tokens_per_minute or float(os.getenv('LLM_TOKENS_PER_MINUTE', 40000))
+        self.max_retries = max_retries
+        self.dedupe = dedupe
+
+    def _group_duplicates(self, posts: list[dict]) -> Dict[int, list[dict]]:
+        """Map the position of each canonical post to its near-duplicates."""
+        groups = {index: [] for index in range(len(posts))}
+        if not self.dedupe:
+            return groups
+        duplicates = NearDuplicateIndex()
+        for index, post in enumerate(posts):
+            canonical = duplicates.add(index, post_text(post))
+            if canonical is not None:
+                del groups[index]
+                groups[canonical].append(post)
+        return groups
+
+    async def analyze_posts_async(self, posts: list[dict],
+                                  on_result: Callable[[dict], None] | None = None) -> list[dict]:
+        """
+        Analyze every post, updating each one in place.
+
+        Args:
+            posts (list[dict]): Posts to analyze; existing results are reused
+            on_result (Callable[[dict], None] | None): Called with each post as it finishes
+
+        Returns:
+            list[dict]: The same posts, in their original order
+        """
+        limiter = RateLimiter(self.requests_per_minute, self.tokens_per_minute)
+        pipeline = RateLimitedPipeline(self.analyzer, limiter, max_retries=self.max_retries)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        groups = self._group_duplicates(posts)
+
+        async def analyze_post(post: dict, duplicates: list[dict]) -> None:
+            async with semaphore:
+                existing = {task: post.get(task, '') for task in (*self.tasks, KEYWORDS_SOURCE)}
+                results, errors = await pipeline.run_detailed(format_post_content(post), self.tasks, existing)
+            post.update(results)
+            for task, error in errors.items():
+                post[task] = ERROR_MESSAGES[task].format(error)
+            post['analyzed'] = not errors
+            for duplicate in duplicates:
+                duplicate.update({task: post.get(task, '') for task in (*self.tasks, KEYWORDS_SOURCE)})
+                duplicate['analyzed'] = post['analyzed']
+            if on_result:
+                for finished in (post, *duplicates):
+                    on_result(finished)
+
+        await asyncio.gather(*(analyze_post(posts[index], duplicates) for index, duplicates in groups.items()))
+        return posts
+
+    def analyze_posts(self, posts: list[dict], on_result: Callable[[dict], None] | None = None) -> list[dict]:
+        """Synchronous wrapper around ``analyze_posts_async`` for Streamlit and scripts."""
+        return run_sync(self.analyze_posts_async(posts, on_result))
+
+    def analyze_urls(self, urls: Iterable[str], on_result: Callable[[dict], None] | None = None) -> list[dict]:
+        """Fetch the given article URLs and analyze their full text."""
+        posts = [
+            {'title': url, 'link': url, 'excerpt': '', 'keywords': '', 'summary': '', 'analyzed': False}
+            for url in urls
+        ]
+        ArticleFetcher().fetch_all(posts)
+        return self.analyze_posts(posts, on_result)
@@ -0,0 +1,144 @@
+"""
+Token-budgeted chunking of long articles and merging of per-chunk results.
+
+Long articles are split on their heading lines (``##``/``###`` from the article
+extractor) into chunks that fit a token budget, each chunk is analyzed on its own,
+and the partial keyword lists and headline outlines are merged and deduplicated.
+"""
+import re
+from collections import Counter
+from typing import Iterable
+
+from ..telemetry import estimate_tokens
+
+DEFAULT_CHUNK_TOKENS = 3000
+
+HEADING_RE = re.compile(r'^#{1,6}\s', re.MULTILINE)
+SENTENCE_RE = re.compile(r'(?<=[.!?])\s+')
+# Key point lines: bullets, or numbered items indented under a headline
+BULLET_RE = re.compile(r'^(?:\s*[-*•–]|\s+(?:\d+[.)]|[a-z][.)]))\s+')
+HEADLINE_MARKUP_RE = re.compile(r'^\s*(?:#+\s*|\d+[.)]\s*|[IVX]+[.)]\s*)|[*_`]+')
+
+
+def _split_oversized(section: str, max_tokens: int) -> list[str]:
+    """Split a section that exceeds the budget on paragraphs, then sentences, then characters."""
+    for separator, parts in (('\n\n', section.split('\n\n')), (' ', SENTENCE_RE.split(section))):
+        if len(parts) > 1:
+            return _pack(parts, max_tokens, separator)
+    max_chars = max_tokens * 4
+    return [section[start:start + max_chars] for start in range(0, len(section), max_chars)]
+
+
+def _pack(parts: Iterable[str], max_tokens: int, separator: str) -> list[str]:
+    """Greedily join consecutive parts into chunks of at most ``max_tokens``."""
+    chunks, current, size = [], [], 0
+    for part in parts:
+        tokens = estimate_tokens(part)
+        if tokens > max_tokens:
+            if current:
+                chunks.append(separator.join(current))
+                current, size = [], 0
+            chunks.extend(_split_oversized(part, max_tokens))
+            continue
+        if current and size + tokens > max_tokens:
+            chunks.append(separator.join(current))
+            current, size = [], 0
+        current.append(part)
+        size += tokens
+    if current:
+        chunks.append(separator.join(current))
+    return chunks
+
+
+def split_text(text: str, max_tokens: int = DEFAULT_CHUNK_TOKENS) -> list[str]:
+    """
+    Split text into chunks of roughly ``max_tokens`` tokens on heading boundaries.
+
+    A leading ``Title:`` line, as built by ``format_post_content``, is repeated at the
+    top of every chunk so each one keeps the article's context.
+
+    Args:
+        text (str): Article text with markdown heading lines
+        max_tokens (int): Token budget per chunk
+
+    Returns:
+        list[str]: The chunks, in order; a single chunk when the text already fits
+    """
+    if estimate_tokens(text) <= max_tokens:
+        return [text]
+
+    title = ''
+    if text.startswith('Title:'):
+        title, _, text = text.partition('\n\n')
+    budget = max(max_tokens - estimate_tokens(title), max_tokens // 2)
+
+    starts = [match.start() for match in HEADING_RE.finditer(text)]
+    bounds = [0] + [start for start in starts if start > 0] + [len(text)]
+    sections = [text[begin:end].strip() for begin, end in zip(bounds, bounds[1:])]
+    chunks = _pack([section for section in sections if section], budget, '\n\n')
+    return [f"{title}\n\n{chunk}" if title else chunk for chunk in chunks]
+
+
+def merge_keywords(partials: Iterable[str], top_n: int = 25) -> str:
+    """
+    Merge comma-separated keyword lists, most widely shared keywords first.
+
+    Keywords are deduplicated case-insensitively; ties keep their first appearance.
+    """
+    counts = Counter()
+    first_seen = {}
+    for partial in partials:
+        for keyword in partial.replace('\n', ',').split(','):
+            keyword = keyword.strip().strip('.').strip()
+            key = keyword.lower()
+            if not keyword or key == 'no keywords found':
+                continue
+            counts[key] += 1
+            first_seen.setdefault(key, (len(first_seen), keyword))
+    ranked = sorted(counts, key=lambda key: (-counts[key], first_seen[key][0]))
+    return ', '.join(first_seen[key][1] for key in ranked[:top_n])
+
+
+def _normalize(text: str) -> str:
+    return re.sub(r'\W+', ' ', text.lower()).strip()
+
+
+def merge_headlines(partials: Iterable[str], max_tokens: int | None = None) -> str:
+    """
+    Merge headline outlines into one markdown outline without repeated headlines.
+
+    Non-bullet lines are read as headlines and bullet lines as key points of the
+    headline above them. Headlines and key points repeated across chunks are kept
+    once. With ``max_tokens``, later headlines are dropped once the outline would
+    exceed the budget, so downstream prompts stay bounded.
+    """
+    outline: dict[str, tuple[str, list[str], set]] = {}
+    for partial in partials:
+        current = None
+        for line in partial.splitlines():
+            if not line.strip():
+                continue
+            if BULLET_RE.match(line) and current is not None:
+                point = BULLET_RE.sub('', line).strip()
+                key = _normalize(point)
+                _, points, seen = outline[current]
+                if key and key not in seen:
+                    seen.add(key)
+                    points.append(point)
+                continue
+            headline = HEADLINE_MARKUP_RE.sub('', BULLET_RE.sub('', line)).strip().rstrip(':').strip()
+            current = _normalize(headline)
+            if not current:
+                current = None
+                continue
+            outline.setdefault(current, (headline, [], set()))
+
+    blocks, size = [], 0
+    for headline, points, _ in outline.values():
+        block = '\n'.join([f"**{headline}**", *(f"- {point}" for point in points)])
+        tokens = estimate_tokens(block)
+        if max_tokens is not None and blocks and size + tokens > max_tokens:
+            break
+        blocks.append(block)
+        size += tokens
+    return '\n\n'.join(blocks)
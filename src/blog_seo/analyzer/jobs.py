@@ -0,0 +1,313 @@
+"""
+Background analysis jobs: a persistent SQLite queue and a local worker pool.
+
+The Streamlit script submits a job per post and task and polls for it instead of
+blocking on the LLM, so jobs keep running across reruns, page changes and browser
+sessions. Finished results are written back into the post store.
+
+Several processes may share the queue file. A job is claimed by exactly one worker,
+and running jobs carry a heartbeat from the process running them, so only jobs whose
+process stopped beating are put back in the queue.
+"""
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Dict
+
+from ..scraper.article_fetcher import format_post_content
+from ..scraper.http_cache import DEFAULT_CACHE_DIR
+from ..scraper.post_store import ANALYSIS_FIELDS, PostStore, get_post_store
+
+from .pipeline import AnalysisPipeline, run_sync
+from .seo_analyzer import ERROR_MESSAGES, SEOAnalyzer
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_STATUSES = ('queued', 'running')
+JOB_COLUMNS = 'id, link, task, mode, status, error, created_at, finished_at'
+
+# Seconds between heartbeats of a pool's running jobs, and without one before a
+# running job is considered abandoned by a crashed process
+HEARTBEAT_INTERVAL = 10.0
+STALE_AFTER = 60.0
+
+
+@dataclass
+class Job:
+    """One analysis task for one post."""
+    id: int
+    link: str
+    task: str
+    mode: str
+    status: str
+    error: str | None
+    created_at: float
+    finished_at: float | None
+
+    @property
+    def active(self) -> bool:
+        return self.status in ACTIVE_STATUSES
+
+
+class JobQueue:
+    """
+    SQLite-backed queue of analysis jobs.
+
+    At most one queued or running job exists per post link and task; submitting the
+    same work again returns the job already in flight. Running jobs record the
+    ``owner`` that claimed them and when it last reported them alive.
+    """
+
+    def __init__(self, path: str | None = None):
+        if path is None:
+            cache_dir = os.getenv('BLOG_SEO_CACHE_DIR', DEFAULT_CACHE_DIR)
+            os.makedirs(cache_dir, exist_ok=True)
+            path = os.path.join(cache_dir, 'jobs.sqlite3')
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                link TEXT NOT NULL,
+                task TEXT NOT NULL,
+                mode TEXT NOT NULL,
+                text TEXT NOT NULL,
+                existing TEXT NOT NULL,
+                status TEXT NOT NULL,
+                error TEXT,
+                created_at REAL NOT NULL,
+                started_at REAL,
+                finished_at REAL,
+                owner TEXT,
+                heartbeat_at REAL
+            )
+            """
+        )
+        columns = [row[1] for row in self._conn.execute('PRAGMA table_info(jobs)')]
+        for column, kind in (('owner', 'TEXT'), ('heartbeat_at', 'REAL')):
+            if column not in columns:
+                # Queues created before jobs were claimed with an owner and heartbeat
+                self._conn.execute(f'ALTER TABLE jobs ADD COLUMN {column} {kind}')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_jobs_post ON jobs (link, task, id)')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, id)')
+        self._conn.commit()
+
+    def submit(self, link: str, task: str, mode: str, text: str, existing: Dict[str, str]) -> tuple[Job, bool]:
+        """
+        Queue a task for a post unless the same task is already queued or running.
+
+        Returns:
+            tuple[Job, bool]: The job, and whether it was newly created
+        """
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {JOB_COLUMNS} FROM jobs WHERE link = ? AND task = ? AND status IN (?, ?)",
+                (link, task, *ACTIVE_STATUSES)
+            ).fetchone()
+            if row:
+                return Job(*row), False
+            cursor = self._conn.execute(
+                'INSERT INTO jobs (link, task, mode, text, existing, status, created_at) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (link, task, mode, text, json.dumps(existing), 'queued', time.time())
+            )
+            self._conn.commit()
+            row = self._conn.execute(f"SELECT {JOB_COLUMNS} FROM jobs WHERE id = ?", (cursor.lastrowid,)).fetchone()
+        return Job(*row), True
+
+    def claim(self, owner: str = '') -> tuple[Job, str, Dict[str, str]] | None:
+        """
+        Mark the oldest queued job as running for ``owner`` and return it with its text
+        and existing results.
+
+        The job only changes hands while it is still queued, so when workers of several
+        processes race for the same job exactly one of them gets it.
+        """
+        with self._lock:
+            while True:
+                row = self._conn.execute(
+                    f"SELECT {JOB_COLUMNS}, text, existing FROM jobs WHERE status = 'queued' ORDER BY id LIMIT 1"
+                ).fetchone()
+                if row is None:
+                    return None
+                now = time.time()
+                claimed = self._conn.execute(
+                    """
+                    UPDATE jobs SET status = 'running', started_at = ?, owner = ?, heartbeat_at = ?
+                    WHERE id = ? AND status = 'queued'
+                    """,
+                    (now, owner, now, row[0])
+                ).rowcount
+                self._conn.commit()
+                if claimed:
+                    break
+                # Another process claimed it first; try the next queued job
+        job = Job(*row[:8])
+        job.status = 'running'
+        return job, row[8], json.loads(row[9])
+
+    def finish(self, job_id: int, error: str | None = None) -> None:
+        """Mark a job as done, or as failed with ``error``."""
+        with self._lock:
+            self._conn.execute(
+                'UPDATE jobs SET status = ?, error = ?, finished_at = ? WHERE id = ?',
+                ('failed' if error else 'done', error, time.time(), job_id)
+            )
+            self._conn.commit()
+
+    def latest(self, link: str) -> Dict[str, Job]:
+        """The most recent job of each task for a post."""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {JOB_COLUMNS} FROM jobs WHERE link = ? ORDER BY id", (link,)
+            ).fetchall()
+        return {job.task: job for job in (Job(*row) for row in rows)}
+
+    def pending_count(self) -> int:
+        """Number of jobs queued or running."""
+        with self._lock:
+            return self._conn.execute(
+                'SELECT COUNT(*) FROM jobs WHERE status IN (?, ?)', ACTIVE_STATUSES
+            ).fetchone()[0]
+
+    def heartbeat(self, owner: str) -> None:
+        """Report the jobs ``owner`` is running as still alive."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET heartbeat_at = ? WHERE owner = ? AND status = 'running'", (time.time(), owner)
+            )
+            self._conn.commit()
+
+    def requeue_stale(self, stale_after: float = STALE_AFTER) -> int:
+        """
+        Put running jobs without a heartbeat for ``stale_after`` seconds back in the queue.
+
+        Their process crashed or was killed; jobs of processes still running them keep
+        beating and are left alone.
+        """
+        with self._lock:
+            count = self._conn.execute(
+                """
+                UPDATE jobs SET status = 'queued', started_at = NULL, owner = NULL, heartbeat_at = NULL
+                WHERE status = 'running' AND COALESCE(heartbeat_at, started_at, 0) < ?
+                """,
+                (time.time() - stale_after,)
+            ).rowcount
+            self._conn.commit()
+        return count
+
+    def prune(self, max_age: float = 7 * 24 * 60 * 60) -> None:
+        """Delete finished jobs older than ``max_age`` seconds."""
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM jobs WHERE status IN ('done', 'failed') AND finished_at < ?",
+                (time.time() - max_age,)
+            )
+            self._conn.commit()
+
+
+class JobWorkerPool:
+    """
+    Worker threads that run queued analysis jobs and store their results.
+
+    Each job runs the analysis pipeline for its task (plus any missing dependencies)
+    and writes every result it produced into the post store, so it also reaches
+    browser sessions other than the one that submitted it. A heartbeat thread keeps
+    the pool's running jobs alive in the queue and requeues those of crashed pools.
+
+    Args:
+        queue (JobQueue | None): Job queue; the default file under the cache directory
+        store (PostStore | None): Where results are written; the shared post store
+        workers (int): Jobs run concurrently
+    """
+
+    def __init__(self, queue: JobQueue | None = None, store: PostStore | None = None, workers: int = 4):
+        self.queue = queue or JobQueue()
+        self.store = store or get_post_store()
+        self.workers = workers
+        self._analyzers: Dict[str, SEOAnalyzer] = {}
+        self._analyzers_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._threads: list[threading.Thread] = []
+        # Identifies this pool's claims in a queue shared with other processes
+        self.owner = f"{os.getpid()}-{uuid.uuid4().hex}"
+
+    def start(self) -> 'JobWorkerPool':
+        """Recover jobs interrupted by a crash and start the workers."""
+        self._requeue_stale()
+        self.queue.prune()
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f'analysis-worker-{index}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        thread = threading.Thread(target=self._beat, name='analysis-heartbeat', daemon=True)
+        thread.start()
+        self._threads.append(thread)
+        self._wakeup.set()
+        return self
+
+    def stop(self) -> None:
+        """Let the workers exit once their current job finishes."""
+        self._stop.set()
+        self._wakeup.set()
+
+    def submit(self, post: dict, task: str, mode: str = 'thorough') -> Job:
+        """Queue ``task`` for ``post``, reusing a job already in flight for the same post and task."""
+        existing = {field: post.get(field, '') for field in ANALYSIS_FIELDS}
+        job, created = self.queue.submit(post['link'], task, mode, format_post_content(post), existing)
+        if created:
+            self._wakeup.set()
+        return job
+
+    def _requeue_stale(self) -> None:
+        recovered = self.queue.requeue_stale()
+        if recovered:
+            logger.info("Requeued %d interrupted analysis jobs", recovered)
+            self._wakeup.set()
+
+    def _beat(self) -> None:
+        while not self._stop.wait(HEARTBEAT_INTERVAL):
+            try:
+                self.queue.heartbeat(self.owner)
+                self._requeue_stale()
+            except sqlite3.Error:
+                logger.exception("Analysis job heartbeat failed")
+
+    def _analyzer(self, mode: str) -> SEOAnalyzer:
+        with self._analyzers_lock:
+            if mode not in self._analyzers:
+                self._analyzers[mode] = SEOAnalyzer(mode=mode)
+            return self._analyzers[mode]
+
+    def _work(self) -> None:
+        while not self._stop.is_set():
+            claimed = self.queue.claim(self.owner)
+            if claimed is None:
+                # Woken by submit; the timeout also picks up jobs queued by other processes
+                self._wakeup.wait(timeout=2)
+                self._wakeup.clear()
+                continue
+            self._wakeup.set()  # Let another idle worker look for more jobs
+            job, text, existing = claimed
+            try:
+                self._run(job, text, existing)
+            except Exception as e:
+                logger.exception("Analysis job %d failed", job.id)
+                self.queue.finish(job.id, str(e))
+
+    def _run(self, job: Job, text: str, existing: Dict[str, str]) -> None:
+        pipeline = AnalysisPipeline(self._analyzer(job.mode))
+        results, errors = run_sync(pipeline.run_detailed(text, [job.task], existing))
+
+        fields = {task: value for task, value in results.items() if task in ANALYSIS_FIELDS}
+        fields.update({task: ERROR_MESSAGES[task].format(error) for task, error in errors.items()})
+        self.store.update(job.link, fields)
+        self.queue.finish(job.id, errors.get(job.task))
@@ -0,0 +1,216 @@
+"""
+Local keyword extraction over a whole corpus of posts, without any LLM calls.
+
+Candidate phrases are found RAKE-style (runs of content words between stopwords and
+punctuation) and every 1..n-gram inside them is scored by TF-IDF across the corpus,
+weighted by its RAKE degree/frequency score. Tokenizing happens once per document
+and tokens are then replaced by integer codes, so all counting and scoring runs on
+NumPy integer arrays rather than strings and thousands of posts take seconds.
+"""
+import re
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+
+from ..scraper.posts import post_text
+
+# Words, plus punctuation that ends a candidate phrase
+TOKEN_RE = r"[a-z][a-z'’-]*[a-z]|[a-z]|[.,;:!?()\[\]{}\"“”#|/]"
+TOKEN_PATTERN = re.compile(TOKEN_RE)
+
+FALLBACK_STOPWORDS = frozenset("""
+a about above after again against all also am an and any are aren't as at be because been before
+being below between both but by can can't cannot could couldn't did didn't do does doesn't doing
+don't down during each even ever every few for from further get gets getting go goes going got had
+hadn't has hasn't have haven't having he he'd he'll he's her here here's hers herself him himself
+his how how's however i i'd i'll i'm i've if in into is isn't it it's its itself just let's like
+make makes many may me might more most much must mustn't my myself need no nor not now of off often
+on once one only or other ought our ours ourselves out over own really same say says shan't she
+she'd she'll she's should shouldn't so some such take than that that's the their theirs them
+themselves then there there's these they they'd they'll they're they've this those through to too
+under until up us very was wasn't way we we'd we'll we're we've well were weren't what what's when
+when's where where's whether which while who who's whom why why's will with won't would wouldn't
+yet you you'd you'll you're you've your yours yourself yourselves
+""".split())
+
+_stopwords = None
+
+
+def get_stopwords() -> frozenset:
+    """English stopwords from NLTK when its corpus is installed, else a built-in list."""
+    global _stopwords
+    if _stopwords is None:
+        try:
+            from nltk.corpus import stopwords
+            _stopwords = FALLBACK_STOPWORDS | frozenset(stopwords.words('english'))
+        except (ImportError, LookupError):
+            _stopwords = FALLBACK_STOPWORDS
+    return _stopwords
+
+
+class KeywordEngine:
+    """
+    Score keywords for every document of a corpus in one pass.
+
+    Args:
+        max_ngram (int): Longest key phrase, in words
+        top_n (int): Keywords returned per document
+        min_word_length (int): Shorter words are treated as stopwords
+        min_phrase_count (int): Multi-word phrases seen fewer times in the corpus are ignored
+        stopwords (Iterable[str] | None): Overrides the default English stopwords
+    """
+
+    def __init__(self, max_ngram: int = 3, top_n: int = 10, min_word_length: int = 3,
+                 min_phrase_count: int = 2, stopwords: Iterable[str] | None = None):
+        self.max_ngram = max_ngram
+        self.min_phrase_count = min_phrase_count
+        self.top_n = top_n
+        self.min_word_length = min_word_length
+        self.stopwords = frozenset(stopwords) if stopwords is not None else get_stopwords()
+        self.scores: pd.DataFrame | None = None
+        self.num_docs = 0
+
+    def _tokens(self, texts: list[str]) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Tokenize the corpus into integer codes.
+
+        Returns:
+            Document of every token, its code, the vocabulary the codes index, and
+            whether each vocabulary entry can be part of a key phrase
+        """
+        tokens = [TOKEN_PATTERN.findall(text.lower()) if isinstance(text, str) else [] for text in texts]
+        docs = np.repeat(np.arange(len(tokens)), [len(doc_tokens) for doc_tokens in tokens])
+        codes, vocabulary = pd.factorize(pd.Series([token for doc_tokens in tokens for token in doc_tokens],
+                                                   dtype='object'))
+        # Word tests run once per distinct token rather than once per occurrence
+        words = pd.Series(vocabulary, dtype='object')
+        content = (
+            words.str.len().ge(self.min_word_length)
+            & ~words.isin(self.stopwords)
+            & words.str.match(r"[a-z]")
+        ).to_numpy(dtype=bool)
+        return docs, codes, np.asarray(vocabulary, dtype='object'), content
+
+    def fit(self, texts: Iterable[str]) -> 'KeywordEngine':
+        """Tokenize and score the whole corpus."""
+        texts = list(texts)
+        self.num_docs = len(texts)
+        docs, codes, vocabulary, content = self._tokens(texts)
+        is_content = content[codes] if len(codes) else np.zeros(0, dtype=bool)
+        if not is_content.any():
+            self.scores = pd.DataFrame(columns=['doc', 'gram', 'score'])
+            return self
+
+        # Consecutive content words within a document form one candidate phrase
+        boundary = ~is_content
+        boundary[1:] |= docs[1:] != docs[:-1]
+        phrase = np.cumsum(boundary)[is_content]
+        doc = docs[is_content]
+        code = codes[is_content]
+        phrase_len = np.bincount(phrase)[phrase]
+
+        # RAKE word score: degree (co-occurrence within phrases) over frequency
+        word_score = (np.bincount(code, weights=phrase_len, minlength=len(vocabulary))
+                      / np.maximum(np.bincount(code, minlength=len(vocabulary)), 1))[code]
+
+        # n-grams are identified by integer ids: each id pairs the id of the (n-1)-gram
+        # it extends with the code of its last word, and is only turned into text once
+        # per distinct gram at the end
+        gram_docs, gram_ids, gram_rake = [], [], []
+        texts_by_id = [vocabulary]
+        offset = 0
+        ids = code.astype(np.int64)
+        score_sum = word_score
+        for n in range(1, self.max_ngram + 1):
+            if n > 1:
+                size = len(phrase) - (n - 1)
+                if size <= 0:
+                    break
+                pairs = ids[:size] * len(vocabulary) + code[n - 1:]
+                ids, pair_values = pd.factorize(pairs)
+                previous = pair_values // len(vocabulary)
+                texts_by_id.append(texts_by_id[-1][previous] + ' ' + vocabulary[pair_values % len(vocabulary)])
+                score_sum = score_sum[:size] + word_score[n - 1:]
+                valid = phrase[n - 1:] == phrase[:size]
+            else:
+                valid = np.ones(len(phrase), dtype=bool)
+            gram_docs.append(doc[:len(ids)][valid])
+            # Offset so ids of different lengths don't collide
+            gram_ids.append(ids[valid] + offset)
+            # Mean word score, with a mild bonus for longer phrases
+            gram_rake.append(score_sum[valid] / n * (1 + np.log(n)))
+            offset += len(texts_by_id[-1])
+        gram_text = np.concatenate(texts_by_id)
+        gram_doc = np.concatenate(gram_docs)
+        gram_id = np.concatenate(gram_ids)
+        rake = np.zeros(offset)
+        rake[gram_id] = np.concatenate(gram_rake)
+
+        # Phrases that occur only once are usually accidental word runs, not key phrases
+        corpus_count = np.bincount(gram_id, minlength=offset)
+        keep = (gram_id < len(vocabulary)) | (corpus_count[gram_id] >= self.min_phrase_count)
+        gram_doc, gram_id = gram_doc[keep], gram_id[keep]
+
+        # TF-IDF of each gram in each document
+        pair_ids, pairs = pd.factorize(gram_doc * offset + gram_id)
+        tf = np.bincount(pair_ids)
+        pair_doc, pair_gram = pairs // offset, pairs % offset
+        doc_lengths = np.bincount(gram_doc, minlength=self.num_docs)[pair_doc]
+        doc_freq = np.bincount(pair_gram, minlength=offset)[pair_gram]
+        idf = np.log((1 + self.num_docs) / (1 + doc_freq)) + 1
+        score = (tf / doc_lengths) * idf * rake[pair_gram]
+
+        # Best first within each document; equal scores keep the order grams were first seen in
+        order = np.lexsort((-score, pair_doc))
+        self.scores = pd.DataFrame({
+            'doc': pair_doc[order],
+            'gram': gram_text[pair_gram[order]],
+            'score': score[order],
+        })
+        return self
+
+    def _select(self, candidates: list[str], top_n: int) -> list[str]:
+        """Take the best candidates, skipping ones contained in an already chosen phrase."""
+        chosen = []
+        for gram in candidates:
+            padded = f" {gram} "
+            if any(padded in f" {other} " or f" {other} " in padded for other in chosen):
+                continue
+            chosen.append(gram)
+            if len(chosen) == top_n:
+                break
+        return chosen
+
+    def keywords_all(self, top_n: int | None = None) -> list[str]:
+        """Comma-separated keywords for every document, in corpus order."""
+        if self.scores is None:
+            raise RuntimeError("KeywordEngine.fit must be called first")
+        top_n = top_n or self.top_n
+        # Over-fetch a little so phrases dropped as duplicates can be replaced
+        best = self.scores.groupby('doc').head(top_n * 3)
+        by_doc = best.groupby('doc')['gram'].agg(list)
+        return [
+            ', '.join(self._select(by_doc.get(doc, []), top_n))
+            for doc in range(self.num_docs)
+        ]
+
+    def keywords(self, index: int, top_n: int | None = None) -> str:
+        """Comma-separated keywords for a single document."""
+        if self.scores is None:
+            raise RuntimeError("KeywordEngine.fit must be called first")
+        top_n = top_n or self.top_n
+        candidates = self.scores.loc[self.scores['doc'] == index, 'gram'].head(top_n * 3).tolist()
+        return ', '.join(self._select(candidates, top_n))
+
+
+def extract_keywords(texts: Iterable[str], top_n: int = 10) -> list[str]:
+    """Comma-separated keywords for each text, scored against the others as a corpus."""
+    return KeywordEngine(top_n=top_n).fit(texts).keywords_all()
+
+
+def extract_post_keywords(posts: list[dict], top_n: int = 10) -> list[dict]:
+    """Store local keywords for every post in ``post['local_keywords']``."""
+    for post, keywords in zip(posts, extract_keywords(map(post_text, posts), top_n)):
+        post['local_keywords'] = keywords
+    return posts
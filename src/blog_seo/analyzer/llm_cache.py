@@ -0,0 +1,124 @@
+"""
+Persistent cache for LLM analysis results.
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+from ..scraper.http_cache import DEFAULT_CACHE_DIR
+
+
+def make_cache_key(task: str, prompt_version: str, model: str, text: str) -> str:
+    """Hash everything that determines an LLM result into a cache key."""
+    digest = hashlib.sha256()
+    for part in (task, prompt_version, model, text):
+        digest.update(part.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+class LLMCache:
+    """
+    SQLite-backed cache of LLM results keyed by task, prompt version, model and input.
+
+    Entries older than ``max_age`` seconds are treated as misses and purged, and the
+    least recently used entries are evicted once more than ``max_entries`` are stored.
+    """
+
+    def __init__(self, path: str | None = None, max_entries: int = 10000,
+                 max_age: float = 30 * 24 * 60 * 60):
+        if path is None:
+            cache_dir = os.getenv('BLOG_SEO_CACHE_DIR', DEFAULT_CACHE_DIR)
+            os.makedirs(cache_dir, exist_ok=True)
+            path = os.path.join(cache_dir, 'llm.sqlite3')
+        self.path = path
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS results (
+                key TEXT PRIMARY KEY,
+                task TEXT NOT NULL,
+                value TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_results_accessed ON results (accessed_at)')
+        self._conn.commit()
+
+    def get(self, key: str) -> str | None:
+        """Return the cached result for ``key``, or None on a miss."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT value, created_at FROM results WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None or now - row[1] > self.max_age:
+                if row is not None:
+                    self._conn.execute('DELETE FROM results WHERE key = ?', (key,))
+                    self._conn.commit()
+                self.misses += 1
+                return None
+            self._conn.execute('UPDATE results SET accessed_at = ? WHERE key = ?', (now, key))
+            self._conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def put(self, key: str, task: str, value: str) -> None:
+        """Store a result and evict expired or least recently used entries."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)',
+                (key, task, value, now, now)
+            )
+            self._conn.execute('DELETE FROM results WHERE created_at < ?', (now - self.max_age,))
+            self._conn.execute(
+                """
+                DELETE FROM results WHERE key IN (
+                    SELECT key FROM results ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_entries,)
+            )
+            self._conn.commit()
+
+    def stats(self) -> dict:
+        """Return hit/miss counters and the number of stored entries."""
+        with self._lock:
+            entries = self._conn.execute('SELECT COUNT(*) FROM results').fetchone()[0]
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'entries': entries,
+        }
+
+    def clear(self) -> None:
+        """Remove every cached result."""
+        with self._lock:
+            self._conn.execute('DELETE FROM results')
+            self._conn.commit()
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> LLMCache:
+    """Return the process-wide LLM result cache, creating it on first use."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = LLMCache()
+        return _cache
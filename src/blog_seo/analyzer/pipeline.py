@@ -0,0 +1,211 @@
+"""
+Asyncio-based analysis pipeline running independent LLM tasks concurrently.
+"""
+import asyncio
+import contextvars
+import functools
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable
+
+from ..telemetry import estimate_tokens
+
+from .chunking import DEFAULT_CHUNK_TOKENS, merge_headlines, merge_keywords, split_text
+from .keywords import extract_keywords
+from .seo_analyzer import ERROR_MESSAGES, SEOAnalyzer, is_error_result
+
+logger = logging.getLogger(__name__)
+
+# Worker threads for blocking LLM calls. The calls wait on the network, so this is
+# sized for many chunks in flight rather than for the number of CPUs.
+LLM_THREADS = 64
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Return the process-wide thread pool that blocking LLM calls run on."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=LLM_THREADS, thread_name_prefix='llm')
+        return _executor
+
+
+# Tasks whose results must be available before a task can start
+TASK_DEPENDENCIES = {
+    'keywords': (),
+    'summary': (),
+    'headlines_and_keypoints': (),
+    'generated_article': ('headlines_and_keypoints', 'keywords'),
+}
+
+# Result key recording where keywords came from: 'llm', or 'local' for the fallback
+KEYWORDS_SOURCE = 'keywords_source'
+
+
+class AnalysisPipeline:
+    """
+    Run analysis tasks as a dependency graph inside a single event loop.
+
+    Every task starts as soon as the tasks it depends on have finished, so
+    independent tasks (keywords, headlines, summary) run concurrently and article
+    generation starts the moment its inputs are ready. The blocking crew calls run
+    on worker threads, which is all that is needed to overlap their network I/O.
+
+    Texts longer than ``chunk_tokens`` are split on heading boundaries; keywords,
+    headlines and summary are then computed for every chunk concurrently and the
+    partial results merged, so latency stays roughly flat as articles grow.
+
+    With ``keyword_fallback`` (or ``BLOG_SEO_KEYWORD_FALLBACK=1``), a failed keyword
+    task is replaced by local TF-IDF/RAKE keywords. The failure is logged, and the
+    results record ``keywords_source`` as 'local' so the keywords can be told apart
+    from model output and are recomputed by the model on the next run.
+    """
+
+    def __init__(self, analyzer: SEOAnalyzer, keyword_fallback: bool | None = None,
+                 chunk_tokens: int | None = None):
+        self.analyzer = analyzer
+        if keyword_fallback is None:
+            keyword_fallback = os.getenv('BLOG_SEO_KEYWORD_FALLBACK', '') == '1'
+        self.keyword_fallback = keyword_fallback
+        self.chunk_tokens = chunk_tokens or int(os.getenv('BLOG_SEO_CHUNK_TOKENS', DEFAULT_CHUNK_TOKENS))
+
+    async def call_task(self, task: str, text: str, inputs: Dict[str, str]) -> str:
+        """Run one task off the event loop. Override to add rate limiting or retries."""
+        # Like asyncio.to_thread, but on a pool large enough for every chunk of a long article
+        call = functools.partial(contextvars.copy_context().run, self.analyzer.run_task, task, text, inputs)
+        return await asyncio.get_running_loop().run_in_executor(get_executor(), call)
+
+    async def analyze_task(self, task: str, text: str, inputs: Dict[str, str]) -> str:
+        """
+        Run one task, mapping it over the chunks of a long text and reducing the results.
+
+        Every chunk goes through ``call_task`` on its own, so rate limits and retries
+        apply per LLM call.
+        """
+        if task == 'generated_article':
+            outline = inputs.get('headlines_and_keypoints', '')
+            if estimate_tokens(outline) > self.chunk_tokens:
+                # Keep the outline handed to the writer within the prompt budget
+                inputs = dict(inputs, headlines_and_keypoints=merge_headlines([outline], self.chunk_tokens))
+            return await self.call_task(task, text, inputs)
+
+        chunks = split_text(text, self.chunk_tokens)
+        if len(chunks) == 1:
+            return await self.call_task(task, text, inputs)
+
+        partials = await asyncio.gather(*(self.call_task(task, chunk, inputs) for chunk in chunks))
+        if task == 'keywords':
+            return merge_keywords(partials)
+        if task == 'headlines_and_keypoints':
+            return merge_headlines(partials, self.chunk_tokens)
+        if task == 'summary':
+            return await self.call_task(task, '\n\n'.join(partials), inputs)
+        raise ValueError(f"Unknown analysis task: {task}")
+
+    async def run_detailed(self, text: str, tasks: Iterable[str],
+                           existing: Dict[str, str] | None = None) -> tuple[Dict[str, str], Dict[str, str]]:
+        """
+        Run the requested tasks and any missing dependencies.
+
+        Args:
+            text (str): The text content to analyze
+            tasks (Iterable[str]): Result keys to produce, e.g. ['keywords', 'generated_article']
+            existing (Dict[str, str] | None): Results already available, which are not recomputed
+                unless they are empty, the error message of an earlier failed run, or
+                keywords whose ``keywords_source`` is 'local'
+
+        Returns:
+            tuple[Dict[str, str], Dict[str, str]]: Successful results and error messages, by task.
+            Results include ``keywords_source`` whenever keywords were computed.
+        """
+        existing = dict(existing or {})
+        if existing.pop(KEYWORDS_SOURCE, None) == 'local':
+            existing.pop('keywords', None)
+        results = {
+            task: value for task, value in existing.items()
+            if value and not is_error_result(task, value)
+        }
+        errors: Dict[str, str] = {}
+        scheduled: Dict[str, asyncio.Task] = {}
+
+        async def run_node(task: str, dependencies: list[asyncio.Task]) -> None:
+            if dependencies:
+                await asyncio.gather(*dependencies)
+            failed = [dep for dep in TASK_DEPENDENCIES[task] if dep in errors]
+            if failed:
+                errors[task] = f"{', '.join(failed)} failed"
+                return
+            inputs = {dep: results[dep] for dep in TASK_DEPENDENCIES[task]}
+            try:
+                results[task] = await self.analyze_task(task, text, inputs)
+            except Exception as e:
+                if task == 'keywords' and self.keyword_fallback:
+                    logger.warning("Keyword task failed, using local keywords instead: %s", e, exc_info=True)
+                    keywords = extract_keywords([text])[0]
+                    if keywords:
+                        results[task] = keywords
+                        results[KEYWORDS_SOURCE] = 'local'
+                        return
+                errors[task] = str(e)
+            else:
+                if task == 'keywords':
+                    results[KEYWORDS_SOURCE] = 'llm'
+
+        def schedule(task: str) -> asyncio.Task | None:
+            if task not in TASK_DEPENDENCIES:
+                raise ValueError(f"Unknown analysis task: {task}")
+            if task in results:
+                return None
+            if task not in scheduled:
+                dependencies = [schedule(dep) for dep in TASK_DEPENDENCIES[task]]
+                scheduled[task] = asyncio.create_task(
+                    run_node(task, [dep for dep in dependencies if dep is not None])
+                )
+            return scheduled[task]
+
+        for task in tasks:
+            schedule(task)
+        if scheduled:
+            await asyncio.gather(*scheduled.values())
+        return results, errors
+
+    async def run(self, text: str, tasks: Iterable[str],
+                  existing: Dict[str, str] | None = None) -> Dict[str, str]:
+        """Run the requested tasks, storing a readable error message for any that failed."""
+        results, errors = await self.run_detailed(text, tasks, existing)
+        for task, error in errors.items():
+            results[task] = ERROR_MESSAGES[task].format(error)
+        return results
+
+
+def run_sync(coroutine):
+    """Run a coroutine to completion from synchronous code such as a Streamlit script."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+    # Already inside an event loop (e.g. a notebook): run on a separate thread instead
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coroutine).result()
+
+
+def run_analysis(analyzer: SEOAnalyzer, text: str, tasks: Iterable[str],
+                 existing: Dict[str, str] | None = None) -> Dict[str, str]:
+    """
+    Synchronous entry point for the analysis pipeline.
+
+    Args:
+        analyzer (SEOAnalyzer): Analyzer whose tasks are run
+        text (str): The text content to analyze
+        tasks (Iterable[str]): Result keys to produce
+        existing (Dict[str, str] | None): Results already available, which are not recomputed
+
+    Returns:
+        Dict[str, str]: Results for the requested tasks and their dependencies
+    """
+    return run_sync(AnalysisPipeline(analyzer).run(text, tasks, existing))
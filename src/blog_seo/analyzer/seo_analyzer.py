@@ -0,0 +1,532 @@
+import json
+import logging
+import os
+import re
+import threading
+import time
+from concurrent.futures import Future
+from functools import cached_property
+from typing import TYPE_CHECKING, Dict, Any, Callable, Iterator
+
+if TYPE_CHECKING:
+    from crewai import Agent, Crew, LLM
+    from langchain_anthropic import ChatAnthropic
+
+from ..telemetry import Telemetry, estimate_cost, estimate_tokens, get_telemetry
+
+from .llm_cache import LLMCache, get_llm_cache, make_cache_key
+
+logger = logging.getLogger(__name__)
+
+MODEL_NAME = "claude-3-5-sonnet-20241022"
+
+# Bump a task's version whenever its prompt changes so stale cached results are not reused
+PROMPT_VERSIONS = {
+    'keywords': '1',
+    'summary': '1',
+    'headlines_and_keypoints': '1',
+    'generated_article': '1',
+    'combined': '1',
+}
+
+# Analysis modes: "thorough" runs one planned crew per task, "fast" extracts
+# keywords, headlines and summary together in a single unplanned LLM call
+ANALYSIS_MODES = ('thorough', 'fast')
+COMBINED_TASKS = ('keywords', 'headlines_and_keypoints', 'summary')
+
+COMBINED_PROMPT = (
+    "Analyze the blog post below for SEO and respond with a single JSON object, "
+    "without any text before or after it, using exactly these keys:\n"
+    '  "keywords": a list of the most relevant SEO keywords and key phrases,\n'
+    '  "headlines": a list of objects with a "headline" string and a "key_points" list of strings, '
+    "one per headline or subheading in the text,\n"
+    '  "summary": a concise 2-3 sentence summary capturing the main points.\n\n'
+    "Blog post:\n{text}"
+)
+
+CONTENT_WRITER_ROLE = """A
+You are a talented content writer and SEO expert for LotusTherapy, a clinical psychology practice. Your task is to create an SEO-optimized article about a mental health topic that feels warm, relatable, and inviting, appealing to individuals searching for support with mental health challenges in Vancouver.
+Background Information:
+* About Lotus Therapy & Counselling Centre: At Lotus Therapy, we believe in the power of connection, compassion, and the courage it takes to heal. Our team of skilled therapists provides a safe and welcoming space to explore emotions and embrace growth. Specializing in anxiety, depression, ADHD, trauma, and more, we offer a holistic and trauma-informed approach to mental health care. Services are available in Vancouver, Coquitlam, and online."""
+
+# Messages stored in place of a result when a task fails
+ERROR_MESSAGES = {
+    'keywords': "Error extracting keywords: {}",
+    'summary': "Error generating summary: {}",
+    'headlines_and_keypoints': "Error extracting headlines: {}",
+    'generated_article': "Error generating article: {}",
+}
+
+
+def is_error_result(task: str, value: str) -> bool:
+    """Whether a stored result is the error message of a failed run rather than real output."""
+    message = ERROR_MESSAGES.get(task)
+    return bool(message) and value.startswith(message.split('{}')[0])
+
+
+def article_prompt(headlines_and_keypoints: str, keywords: str) -> str:
+    """Build the article generation prompt shared by the crew and streaming paths."""
+    return (
+        "Your Task:\n"
+        f"1. Headlines and Key Points: {headlines_and_keypoints}\n"
+        f"2. Target Keywords: {keywords}\n"
+        "2. Guidelines:\n"
+        "   * Length: 1,000-1,500 words\n" 
+        "   * Tone: Friendly, relational, and approachable\n"
+        "   * Perspective: Third-person language\n"
+        "   * Keyword: holiday anxiety counselling\n"
+        "Instructions:\n"
+        "1. Planning Phase *(Enclosed within *<article_planning> tags):\n"
+        "   a. Outline the article structure with a focus on building a narrative that feels empathetic and supportive.\n"
+        "   b. Identify key points for each section that resonate emotionally with readers.\n"
+        "   c. Plan keyword placement and craft a meta description designed to feel warm and inviting.\n"
+        "   d. Generate two distinct article headlines - one optimized for SEO and one focused on capturing the emotional essence.\n"
+        "2. Writing Phase *(Enclosed within *<article> tags):\n"
+        "   * Title Options:\n"
+        "     - SEO Title: A concise, friendly title (max 60 chars) incorporating the main keyword\n"
+        "     - Alternative Title: An emotionally resonant title that captures the article's essence\n"
+        "   * Meta Description: A relational meta description under 130 characters using the main keyword, designed to draw in readers.\n"
+        "   * Body: Use H2 and H3 headings to create an organized, yet conversational flow. Include internal links to LotusTherapy.ca naturally. Focus on providing helpful insights while maintaining a relatable, compassionate tone.\n"
+        "Special Guidance: Subtly integrate principles from methods like EMDR, somatic experiencing, and related therapies (without directly naming them) to present a holistic, supportive approach to anxiety management. Use relatable examples, calming imagery, and inclusive language to make the reader feel understood and supported.\n"
+        "Note: Present both title options at the start of the article, with a recommendation for which to use based on the target audience and emotional impact."
+    )
+
+
+def _parse_json_object(raw: str) -> Dict[str, Any]:
+    """Extract the JSON object from an LLM response, tolerating code fences and stray prose."""
+    match = re.search(r'\{.*\}', raw, re.DOTALL)
+    if not match:
+        raise ValueError("Response did not contain a JSON object")
+    return json.loads(match.group(0))
+
+
+def parse_combined_output(raw: str) -> Dict[str, str]:
+    """
+    Convert the fast mode JSON response into the result strings the UI displays.
+
+    Args:
+        raw (str): Raw LLM response containing the JSON object
+
+    Returns:
+        Dict[str, str]: 'keywords' (comma-separated), 'headlines_and_keypoints'
+        (a markdown list) and 'summary'
+    """
+    data = _parse_json_object(raw)
+
+    keywords = data.get('keywords') or []
+    if isinstance(keywords, str):
+        keywords = [keyword.strip() for keyword in keywords.split(',')]
+
+    lines = []
+    for item in data.get('headlines') or []:
+        if isinstance(item, str):
+            lines.append(f"**{item}**")
+            continue
+        lines.append(f"**{item.get('headline', '').strip()}**")
+        lines.extend(f"- {point}" for point in item.get('key_points') or [])
+        lines.append('')
+
+    return {
+        'keywords': ', '.join(keyword for keyword in keywords if keyword),
+        'headlines_and_keypoints': '\n'.join(lines).strip(),
+        'summary': (data.get('summary') or '').strip(),
+    }
+
+
+class SEOAnalyzer:
+    def __init__(self, cache: LLMCache | None = None, use_cache: bool = True, mode: str = 'thorough',
+                 verbose: bool = False, telemetry: Telemetry | None = None):
+        if mode not in ANALYSIS_MODES:
+            raise ValueError(f"Unknown analysis mode: {mode}")
+        self.mode = mode
+        # Planning calls roughly double the round trips per task, so fast mode skips them
+        self.planning = mode == 'thorough'
+        self.cache = cache or (get_llm_cache() if use_cache else None)
+        # crewai's console output for agents and crews; timings and tokens go to telemetry
+        self.verbose = verbose
+        self.telemetry = telemetry or get_telemetry()
+        self._combined_inflight: Dict[str, Future] = {}
+        self._combined_lock = threading.Lock()
+
+    # crewai is imported on first use so that scrape-only code paths never load it
+    def _create_llm(self, **kwargs) -> "LLM":
+        """Create a crewai LLM client for the analysis model."""
+        from crewai import LLM
+
+        return LLM(model=MODEL_NAME, api_key=os.getenv('ANTHROPIC_API_KEY'), **kwargs)
+
+    @cached_property
+    def manager_llm(self) -> "LLM":
+        return self._create_llm(max_tokens=8026)
+
+    @cached_property
+    def fast_llm(self) -> "LLM":
+        return self._create_llm(max_tokens=4096, temperature=0)
+
+    @cached_property
+    def keyword_agent(self) -> "Agent":
+        return self._create_keyword_agent()
+
+    @cached_property
+    def summary_agent(self) -> "Agent":
+        return self._create_summary_agent()
+
+    @cached_property
+    def headline_agent(self) -> "Agent":
+        return self._create_headline_agent()
+
+    @cached_property
+    def content_generator_agent(self) -> "Agent":
+        return self._create_content_generator_agent()
+
+    def _create_keyword_agent(self) -> "Agent":
+        """Create and return the keyword analysis agent."""
+        from crewai import Agent
+
+        return Agent(
+            role='SEO Keyword Specialist',
+            goal='Extract relevant SEO keywords from blog content',
+            backstory='Expert in SEO keyword analysis and content optimization',
+            allow_delegation=False,
+            verbose=self.verbose,
+            llm=self._create_llm()
+        )
+
+    def _create_summary_agent(self) -> "Agent":
+        """Create and return the summary agent."""
+        from crewai import Agent
+
+        return Agent(
+            role='Content Summary Analyst',
+            goal='Generate a concise summary of the blog content',
+            backstory='Expert in summarizing content effectively',
+            allow_delegation=False,
+            verbose=self.verbose,
+            llm=self._create_llm()
+        )
+
+    def _create_headline_agent(self) -> "Agent":
+        """Create and return the headline extraction agent."""
+        from crewai import Agent
+
+        return Agent(
+            role='Content Structure Analyst',
+            goal='Extract headlines and key points from blog content',
+            backstory='Expert in content analysis and structure identification',
+            allow_delegation=False,
+            verbose=self.verbose,
+            llm=self._create_llm()
+        )
+
+    def _create_content_generator_agent(self) -> "Agent":
+        """Create and return the content generation agent."""
+        from crewai import Agent
+
+        return Agent(
+            role=CONTENT_WRITER_ROLE,
+            goal='Generate SEO-optimized content based on keywords and structure',
+            backstory='Expert content writer specializing in SEO-optimized articles',
+            allow_delegation=False,
+            verbose=self.verbose,
+            llm=self._create_llm()
+        )
+
+    def _cached(self, task: str, text: str, compute: Callable[[], str | None]) -> str | None:
+        """Return the cached result for ``task`` on ``text``, computing and storing it on a miss."""
+        with self.telemetry.span(f"analyze.{task}", mode=self.mode) as event:
+            if self.cache is None:
+                return compute()
+            key = make_cache_key(task, PROMPT_VERSIONS[task], MODEL_NAME, text)
+            result = self.cache.get(key)
+            event['cache_hit'] = result is not None
+            if result is None:
+                result = compute()
+                if result:
+                    self.cache.put(key, task, result)
+            return result
+
+    def run_task(self, task: str, text: str, inputs: Dict[str, str] | None = None) -> str:
+        """
+        Run a single analysis task, serving it from the cache when possible.
+
+        Args:
+            task (str): One of 'keywords', 'summary', 'headlines_and_keypoints' or 'generated_article'
+            text (str): The text content to analyze
+            inputs (Dict[str, str] | None): Results of the tasks this one depends on
+
+        Returns:
+            str: The task result
+
+        Raises:
+            Exception: Whatever the underlying crew raised; callers decide how to report it
+        """
+        inputs = inputs or {}
+        if self.mode == 'fast' and task in COMBINED_TASKS:
+            return self._run_combined(text)[task]
+        if task == 'keywords':
+            keywords = self._cached('keywords', text, lambda: self._run_keywords_crew(text))
+            return keywords if keywords else "No keywords found"
+        if task == 'summary':
+            return self._cached('summary', text, lambda: self._run_summary_crew(text))
+        if task == 'headlines_and_keypoints':
+            return self._cached('headlines_and_keypoints', text, lambda: self._run_headlines_crew(text))
+        if task == 'generated_article':
+            headlines_and_keypoints = inputs.get('headlines_and_keypoints', '')
+            keywords = inputs.get('keywords', '')
+            return self._cached(
+                'generated_article', f"{headlines_and_keypoints}\0{keywords}",
+                lambda: self._run_article_crew(headlines_and_keypoints, keywords)
+            )
+        raise ValueError(f"Unknown analysis task: {task}")
+
+    def estimated_calls(self, task: str) -> float:
+        """Approximate number of LLM round trips a task costs, for rate limiting."""
+        if self.mode == 'fast':
+            # The three extraction tasks share one call
+            return 1 / len(COMBINED_TASKS) if task in COMBINED_TASKS else 1
+        return 2 if self.planning else 1
+
+    def _complete(self, prompt: str) -> str:
+        """Make a single LLM call without a crew or planning step."""
+        with self.telemetry.span('llm.completion', model=MODEL_NAME) as event:
+            result = self.fast_llm.call([{'role': 'user', 'content': prompt}])
+            # LLM.call returns only text, so token counts are estimated
+            self._record_usage(event, estimate_tokens(prompt), estimate_tokens(result or ''), estimated=True)
+            return result
+
+    @staticmethod
+    def _record_usage(event: Dict[str, Any], prompt_tokens: int, completion_tokens: int,
+                      estimated: bool = False) -> None:
+        """Add token counts and their estimated cost to a telemetry event."""
+        event['prompt_tokens'] = prompt_tokens
+        event['completion_tokens'] = completion_tokens
+        event['cost'] = estimate_cost(MODEL_NAME, prompt_tokens, completion_tokens)
+        if estimated:
+            event['estimated_tokens'] = True
+
+    def _run_combined(self, text: str) -> Dict[str, str]:
+        """
+        Extract keywords, headlines and summary in one structured LLM call.
+
+        Concurrent requests for the same text share a single call, so the pipeline
+        can ask for the three results independently without paying three times.
+        """
+        key = make_cache_key('combined', PROMPT_VERSIONS['combined'], MODEL_NAME, text)
+        with self._combined_lock:
+            future = self._combined_inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._combined_inflight[key] = Future()
+
+        if not owner:
+            return future.result()
+        def compute() -> str:
+            raw = self._complete(COMBINED_PROMPT.format(text=text))
+            parse_combined_output(raw)  # Validate before the response is cached
+            return raw
+
+        try:
+            raw = self._cached('combined', text, compute)
+            future.set_result(parse_combined_output(raw))
+        except Exception as e:
+            future.set_exception(e)
+        finally:
+            with self._combined_lock:
+                del self._combined_inflight[key]
+        return future.result()
+
+    def _run_task_into(self, task: str, text: str, return_dict: Dict[str, Any],
+                       inputs: Dict[str, str] | None = None) -> None:
+        """Run a task and store its result, or a readable error message, in ``return_dict``."""
+        try:
+            return_dict[task] = self.run_task(task, text, inputs)
+        except Exception as e:
+            logger.error("Error in %s analysis: %s", task, e)
+            return_dict[task] = ERROR_MESSAGES[task].format(str(e))
+
+    def _extract_keywords(self, text: str, return_dict: Dict[str, Any]) -> None:
+        """Extract keywords from the given text using CrewAI."""
+        self._run_task_into('keywords', text, return_dict)
+
+    def _generate_summary(self, text: str, return_dict: Dict[str, Any]) -> None:
+        """Generate a summary of the given text using CrewAI."""
+        self._run_task_into('summary', text, return_dict)
+
+    def _extract_headlines_and_keypoints(self, text: str, return_dict: Dict[str, Any]) -> None:
+        """Extract headlines and key points from the given text using CrewAI."""
+        self._run_task_into('headlines_and_keypoints', text, return_dict)
+
+    def _generate_new_article(self, headlines_and_keypoints: str, keywords: str, return_dict: Dict[str, Any]) -> None:
+        """Generate a new SEO-optimized article based on extracted information."""
+        inputs = {'headlines_and_keypoints': headlines_and_keypoints, 'keywords': keywords}
+        self._run_task_into('generated_article', '', return_dict, inputs)
+
+    def _create_crew(self, agent: "Agent", description: str, expected_output: str) -> "Crew":
+        """Create a single-task crew for ``agent``."""
+        from crewai import Crew, Process as CrewProcess, Task
+
+        task = Task(
+            description=description,
+            agent=agent,
+            expected_output=expected_output
+        )
+
+        return Crew(
+            agents=[agent],
+            tasks=[task],
+            verbose=self.verbose,
+            process=CrewProcess.sequential,
+            planning=self.planning,
+            planning_llm=self.manager_llm
+        )
+
+    def _kickoff(self, agent: "Agent", description: str, expected_output: str) -> str | None:
+        """Run a single-task crew and return its raw output, or None if it produced nothing."""
+        crew = self._create_crew(agent, description, expected_output)
+        with self.telemetry.span('llm.crew', model=MODEL_NAME, planning=self.planning) as event:
+            result = crew.kickoff()
+            # Usage of every call the crew made, planning included
+            usage = getattr(result, 'token_usage', None)
+            if usage is not None:
+                self._record_usage(event, usage.prompt_tokens or 0, usage.completion_tokens or 0)
+                event['requests'] = usage.successful_requests
+        return result.raw if result else None
+
+    def _run_keywords_crew(self, text: str) -> str | None:
+        """Run the keyword crew and return its raw output."""
+        return self._kickoff(
+            self.keyword_agent,
+            f"Extract key SEO keywords from this text. Return only a comma-separated list of keywords: {text}",
+            "A comma-separated list of SEO keywords"
+        )
+
+    def _run_summary_crew(self, text: str) -> str | None:
+        """Run the summary crew and return its raw output."""
+        return self._kickoff(
+            self.summary_agent,
+            f"Create a concise 2-3 sentence summary of this text that captures its main points: {text}",
+            "A concise summary of the text"
+        )
+
+    def _run_headlines_crew(self, text: str) -> str | None:
+        """Run the headline extraction crew and return its raw output."""
+        return self._kickoff(
+            self.headline_agent,
+            (
+                "Analyze this text and extract:\n"
+                "1. All headlines/subheadings\n"
+                "2. Key points under each headline\n"
+                f"Text: {text}\n"
+                "Format the output as a structured list with headlines and their corresponding key points."
+            ),
+            "A structured list of headlines and key points"
+        )
+
+    def _run_article_crew(self, headlines_and_keypoints: str, keywords: str) -> str | None:
+        """Run the article generation crew and return its raw output."""
+        return self._kickoff(
+            self.content_generator_agent,
+            article_prompt(headlines_and_keypoints, keywords),
+            "A complete SEO-optimized article with two strategic title options"
+        )
+
+    def _create_chat_model(self) -> "ChatAnthropic":
+        """Create the LangChain chat model used for streaming generation."""
+        from langchain_anthropic import ChatAnthropic
+
+        return ChatAnthropic(
+            model=MODEL_NAME,
+            api_key=os.getenv('ANTHROPIC_API_KEY'),
+            max_tokens=8192
+        )
+
+    def _stream(self, prompt: str, system: str) -> Iterator[str]:
+        """Stream text deltas for a single prompt straight from the model."""
+        llm = self._create_chat_model()
+        # Recorded by hand rather than with a span, whose context must not stay
+        # entered across the yields of a generator
+        event = {'stage': 'llm.stream', 'parent': None, 'model': MODEL_NAME}
+        start = time.perf_counter()
+        prompt_tokens = completion_tokens = 0
+        try:
+            for chunk in llm.stream([('system', system), ('human', prompt)]):
+                usage = getattr(chunk, 'usage_metadata', None) or {}
+                prompt_tokens += usage.get('input_tokens', 0)
+                completion_tokens += usage.get('output_tokens', 0)
+                content = chunk.content
+                if isinstance(content, list):
+                    content = ''.join(
+                        block.get('text', '') for block in content if isinstance(block, dict)
+                    )
+                if content:
+                    yield content
+        except Exception as e:
+            event['error'] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            self._record_usage(event, prompt_tokens, completion_tokens)
+            event['duration'] = time.perf_counter() - start
+            event['timestamp'] = time.time()
+            self.telemetry.record(event)
+
+    def stream_article(self, headlines_and_keypoints: str, keywords: str) -> Iterator[str]:
+        """
+        Generate a new SEO-optimized article, yielding text as the model produces it.
+
+        The finished article is cached like a crew-generated one. Stopping iteration
+        early abandons the request and caches nothing.
+
+        Args:
+            headlines_and_keypoints (str): Structure to base the article on
+            keywords (str): Target keywords
+
+        Yields:
+            str: Successive pieces of the article
+        """
+        key = make_cache_key(
+            'generated_article', PROMPT_VERSIONS['generated_article'], MODEL_NAME,
+            f"{headlines_and_keypoints}\0{keywords}"
+        )
+        cached = self.cache.get(key) if self.cache else None
+        if cached:
+            self.telemetry.record({
+                'stage': 'analyze.generated_article', 'parent': None, 'mode': 'stream',
+                'cache_hit': True, 'duration': 0.0, 'timestamp': time.time()
+            })
+            yield cached
+            return
+
+        parts = []
+        stream = self._stream(article_prompt(headlines_and_keypoints, keywords), CONTENT_WRITER_ROLE)
+        try:
+            for text in stream:
+                parts.append(text)
+                yield text
+        finally:
+            stream.close()
+
+        article = ''.join(parts)
+        if article and self.cache:
+            self.cache.put(key, 'generated_article', article)
+
+    def analyze_content(self, text: str) -> Dict[str, str]:
+        """
+        Analyze the content and generate a new SEO-optimized article.
+
+        Keywords and headlines are extracted concurrently; article generation starts
+        as soon as both are available.
+        
+        Args:
+            text (str): The text content to analyze
+            
+        Returns:
+            Dict[str, str]: Dictionary containing keywords, headlines, and generated article
+        """
+        from .pipeline import run_analysis
+
+        results = run_analysis(self, text, ['generated_article'])
+        return {
+            'keywords': results.get('keywords', ''),
+            'headlines_and_keypoints': results.get('headlines_and_keypoints', ''),
+            'generated_article': results.get('generated_article', '')
+        }
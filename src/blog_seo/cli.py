@@ -0,0 +1,218 @@
+"""
+Headless command-line entry point for scraping and analyzing blogs.
+
+Writes one JSON object per post to the output as soon as the post is ready, so
+results can be piped into other tools or appended to a file from cron.
+"""
+import argparse
+import json
+import logging
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import TextIO
+
+from .scraper.article_fetcher import ArticleFetcher
+from .scraper.blog_scraper import BlogScraper
+from .scraper.export import export_format, export_posts, require_pyarrow
+from .scraper.post_store import PostStore, get_post_store
+from .scraper.profiles import get_profile_registry
+
+from .telemetry import JsonlSink, get_telemetry
+
+logger = logging.getLogger('blog_seo')
+
+ANALYSIS_TASK_NAMES = {
+    'keywords': 'keywords',
+    'headlines': 'headlines_and_keypoints',
+    'summary': 'summary',
+    'article': 'generated_article',
+}
+
+
+class JsonlWriter:
+    """Write records as JSON lines, flushing after each so consumers see them immediately."""
+
+    def __init__(self, stream: TextIO):
+        self.stream = stream
+        self.count = 0
+
+    def write(self, record: dict) -> None:
+        self.stream.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self.stream.flush()
+        self.count += 1
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog='blog-seo',
+        description='Scrape blog posts and optionally analyze them, writing JSONL.'
+    )
+    parser.add_argument('urls', nargs='+', help='Blog listing URLs to scrape')
+    parser.add_argument('-n', '--num-posts', type=int, default=10, help='Posts to scrape per blog (default: 10)')
+    parser.add_argument('-o', '--output', default='-', help='Output JSONL file, or - for stdout (default)')
+    parser.add_argument('--no-content', action='store_true', help='Skip fetching full article bodies')
+    parser.add_argument(
+        '--analyze', default='',
+        help=f"Comma-separated analysis tasks to run: {', '.join(ANALYSIS_TASK_NAMES)}"
+    )
+    parser.add_argument(
+        '--local-keywords', action='store_true',
+        help='Add offline TF-IDF/RAKE keywords for every post as local_keywords'
+    )
+    parser.add_argument('--mode', choices=['fast', 'thorough'], default='fast', help='Analysis mode (default: fast)')
+    parser.add_argument('--concurrency', type=int, default=4, help='Posts analyzed concurrently (default: 4)')
+    parser.add_argument('--parser', help='Listing parser backend: selectolax, lxml or soup')
+    parser.add_argument('--streaming', action='store_true', help='Stream listing pages and stop early')
+    parser.add_argument(
+        '--profile',
+        help='Listing selector profile, e.g. wordpress or ghost (default: detected per blog)'
+    )
+    parser.add_argument('--profiles', action='append', default=[], help='Load selector profiles from this JSON file')
+    parser.add_argument(
+        '--incremental', action='store_true',
+        help='Sync posts with the local post store and only process and output new or changed posts'
+    )
+    parser.add_argument(
+        '--export',
+        help='Also write every post, with content and analysis, to this .jsonl, .parquet or .arrow file'
+    )
+    parser.add_argument('--telemetry', help='Append per-stage timing and token events to this JSONL file')
+    parser.add_argument('--metrics', help='Write Prometheus-format counters and histograms to this file on exit')
+    parser.add_argument('-v', '--verbose', action='store_true', help='Log progress to stderr')
+    return parser.parse_args(argv)
+
+
+def scrape(urls: list[str], num_posts: int, scraper: BlogScraper, store: PostStore | None = None) -> list[dict]:
+    """
+    Scrape every blog concurrently, tagging each post with the blog it came from.
+
+    With a ``store``, only posts that are new or changed since the last sync are returned.
+    """
+    def scrape_one(url: str) -> list[dict]:
+        posts = scraper.scrape_blogs(url, num_posts)
+        logger.info("Found %d posts on %s", len(posts), url)
+        if store is not None:
+            posts = [post for post in store.sync(url, posts) if post['status'] != 'unchanged']
+            logger.info("%d posts on %s are new or changed", len(posts), url)
+        for post in posts:
+            post['blog_url'] = url
+        return posts
+
+    with ThreadPoolExecutor(max_workers=max(len(urls), 1)) as executor:
+        return [post for posts in executor.map(scrape_one, urls) for post in posts]
+
+
+def run(args: argparse.Namespace, output: TextIO) -> int:
+    tasks = [task.strip() for task in args.analyze.split(',') if task.strip()]
+    unknown = [task for task in tasks if task not in ANALYSIS_TASK_NAMES]
+    if unknown:
+        logger.error("Unknown analysis tasks: %s", ', '.join(unknown))
+        return 2
+    if args.export:
+        # Fail before scraping rather than after a long run
+        try:
+            if export_format(args.export) != 'jsonl':
+                require_pyarrow()
+        except (ValueError, ImportError) as e:
+            logger.error("%s", e)
+            return 2
+
+    for path in args.profiles:
+        get_profile_registry().load(path)
+    try:
+        scraper = BlogScraper(parser=args.parser, streaming=args.streaming, profile=args.profile)
+    except ValueError as e:
+        logger.error("%s", e)
+        return 2
+
+    writer = JsonlWriter(output)
+    store = get_post_store() if args.incremental else None
+    posts = scrape(args.urls, args.num_posts, scraper, store)
+    if not posts:
+        if store is not None:
+            logger.info("No new or changed posts")
+            return 0
+        logger.error("No blog posts found")
+        return 1
+
+    try:
+        return process(args, tasks, posts, scraper, writer)
+    finally:
+        if store is not None:
+            store.save(posts)
+        if args.export:
+            count = export_posts(posts, args.export)
+            logger.info("Exported %d posts to %s", count, args.export)
+
+
+def process(args: argparse.Namespace, tasks: list[str], posts: list[dict],
+            scraper: BlogScraper, writer: JsonlWriter) -> int:
+    """Fetch, analyze and write out the scraped posts."""
+    if args.local_keywords:
+        if not args.no_content:
+            ArticleFetcher(scraper).fetch_all(posts)
+        from .analyzer.keywords import extract_post_keywords
+        extract_post_keywords(posts)
+
+    if not tasks:
+        # Scrape-only runs stream each post out as soon as its body is fetched
+        if args.no_content or args.local_keywords:
+            for post in posts:
+                writer.write(post)
+        else:
+            for post in ArticleFetcher(scraper).iter_articles(posts):
+                writer.write(post)
+        return 0
+
+    if not args.no_content and not args.local_keywords:
+        ArticleFetcher(scraper).fetch_all(posts)
+
+    # Imported here so scrape-only runs never load crewai
+    from .analyzer.batch import BatchAnalyzer
+    from .analyzer.seo_analyzer import SEOAnalyzer
+
+    batch = BatchAnalyzer(
+        SEOAnalyzer(mode=args.mode),
+        tasks=[ANALYSIS_TASK_NAMES[task] for task in tasks],
+        max_concurrency=args.concurrency
+    )
+    batch.analyze_posts(posts, on_result=writer.write)
+    return 0 if all(post['analyzed'] for post in posts) else 1
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format='%(asctime)s %(levelname)s %(name)s: %(message)s',
+        stream=sys.stderr
+    )
+
+    try:
+        from dotenv import load_dotenv
+        load_dotenv()
+    except ImportError:
+        pass
+
+    telemetry = get_telemetry()
+    if args.telemetry:
+        telemetry.sinks.append(JsonlSink(args.telemetry))
+    try:
+        if args.output == '-':
+            return run(args, sys.stdout)
+        with open(args.output, 'a', encoding='utf-8') as output:
+            return run(args, output)
+    finally:
+        if args.metrics:
+            with open(args.metrics, 'w', encoding='utf-8') as f:
+                f.write(telemetry.prometheus())
+        for row in telemetry.summary():
+            logger.info(
+                "%s: %d calls, %.2fs total, %d cache hits, %d bytes, %d/%d tokens, $%.4f",
+                row['stage'], row['calls'], row['total_s'], row['cache_hits'], row['bytes'],
+                row['prompt_tokens'], row['completion_tokens'], row['cost_usd']
+            )
+
+
+if __name__ == '__main__':
+    sys.exit(main())
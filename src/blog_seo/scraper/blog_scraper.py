@@ -0,0 +1,404 @@
+import codecs
+import logging
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+from urllib.parse import urljoin, urlparse
+
+from ..telemetry import Telemetry, get_telemetry
+
+from .dedupe import NearDuplicateIndex, get_duplicate_index, mark_duplicates
+from .feeds import feed_candidates, paged_feed_url, parse_feed, parse_sitemap, sitemap_candidates, title_from_url
+from .http_cache import ResponseCache, get_response_cache, get_session
+from .politeness import PolitenessScheduler, get_scheduler
+from .parsers import PAGE_NUMBER_RE, Listing, ParserBackend, StreamingListingParser, get_parser, make_post
+from .profiles import ProfileRegistry, SelectorProfile, get_profile_registry
+
+STREAM_CHUNK_SIZE = 16 * 1024
+
+# Statuses of a listing page past the last one, which end a crawl rather than fail it
+PAST_LAST_PAGE_STATUSES = (404, 410)
+
+logger = logging.getLogger(__name__)
+
+
+def with_source(posts: list[dict], source: str) -> list[dict]:
+    """Record how the posts were discovered ('feed', 'listing' or 'sitemap') on each post."""
+    for post in posts:
+        post['source'] = source
+    return posts
+
+
+class BlogScraper:
+    def __init__(self, max_workers: int = 8, session: requests.Session | None = None,
+                 cache: ResponseCache | None = None, use_cache: bool = True,
+                 parser: ParserBackend | str | None = None, streaming: bool = False,
+                 on_error: Callable[[str], None] | None = None, prefer_feeds: bool = True,
+                 dedupe_index: NearDuplicateIndex | None = None, dedupe: bool = True,
+                 telemetry: Telemetry | None = None, scheduler: PolitenessScheduler | None = None,
+                 profiles: ProfileRegistry | None = None, profile: str | None = None):
+        self.headers = {
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+        }
+        self.max_workers = max_workers
+        self.session = session or get_session()
+        self.cache = cache or (get_response_cache() if use_cache else None)
+        self.parser = parser if isinstance(parser, ParserBackend) else get_parser(parser)
+        # Stream the listing and stop downloading once enough posts have been parsed
+        self.streaming = streaming
+        # User-facing error reporter, e.g. st.error in the Streamlit app; logs by default
+        self.on_error = on_error or logger.error
+        # Discover posts from RSS/Atom feeds before falling back to HTML listings
+        self.prefer_feeds = prefer_feeds
+        # Near-duplicate index shared across scrapes, so syndicated copies are found across blogs
+        if dedupe_index is None and dedupe:
+            dedupe_index = get_duplicate_index()
+        self.dedupe_index = dedupe_index
+        self.telemetry = telemetry or get_telemetry()
+        # Per-host concurrency, robots.txt, retries and timeouts, shared across scrapers
+        self.scheduler = scheduler or get_scheduler()
+        # Listing markup profiles; detected per host unless one is named
+        self.profiles = get_profile_registry() if profiles is None else profiles
+        self.profile = self.profiles.get(profile) if profile else None
+
+    def is_valid_url(self, url: str) -> bool:
+        """Validate if the given URL is properly formatted."""
+        try:
+            result = urlparse(url)
+            return all([result.scheme, result.netloc])
+        except:
+            return False
+
+    def fetch(self, url: str) -> bytes:
+        """
+        Fetch content from the given URL, raising on HTTP errors.
+
+        Fresh cache entries are served locally; stale ones are revalidated with a
+        conditional GET so an unchanged page costs a 304 instead of a full download.
+        """
+        with self.telemetry.span('fetch', url=url) as event:
+            cached = self.cache.get(url) if self.cache else None
+            if cached and cached.is_fresh(self.cache.ttl):
+                event['cache_hit'] = True
+                return cached.body
+
+            headers = dict(self.headers)
+            if cached:
+                headers.update(cached.conditional_headers())
+
+            response = self.scheduler.get(self.session, url, headers=headers, event=event)
+            event['status'] = response.status_code
+            if cached and response.status_code == 304:
+                event['cache_hit'] = True
+                self.cache.refresh(url, response.headers.get('Cache-Control'))
+                return cached.body
+            response.raise_for_status()
+            event['bytes'] = len(response.content)
+
+            if self.cache:
+                self.cache.put(
+                    url,
+                    response.content,
+                    etag=response.headers.get('ETag'),
+                    last_modified=response.headers.get('Last-Modified'),
+                    cache_control=response.headers.get('Cache-Control')
+                )
+            return response.content
+
+    def get_page_content(self, url: str) -> bytes | None:
+        """Fetch content from the given URL."""
+        try:
+            return self.fetch(url)
+        except Exception as e:
+            self.on_error(f"Error fetching URL: {str(e)}")
+            return None
+
+    def _stream_listing(self, url: str, limit: int | None) -> Listing:
+        """
+        Download a listing page in chunks, feeding them to an incremental parser.
+
+        The download is abandoned as soon as ``limit`` posts have been parsed. Pages
+        read to the end are stored in the response cache like any other fetch.
+        """
+        with self.telemetry.span('fetch_stream', url=url) as event:
+            return self._stream_listing_into(url, limit, event)
+
+    def _stream_listing_into(self, url: str, limit: int | None, event: dict) -> Listing:
+        cached = self.cache.get(url) if self.cache else None
+        if cached and cached.is_fresh(self.cache.ttl):
+            event['cache_hit'] = True
+            return self._parse_listing(cached.body, url, limit)
+
+        headers = dict(self.headers)
+        if cached:
+            headers.update(cached.conditional_headers())
+
+        with self.scheduler.request(self.session, url, headers=headers, stream=True, event=event) as response:
+            event['status'] = response.status_code
+            if cached and response.status_code == 304:
+                event['cache_hit'] = True
+                self.cache.refresh(url, response.headers.get('Cache-Control'))
+                return self._parse_listing(cached.body, url, limit)
+            response.raise_for_status()
+
+            charset_declared = 'charset' in response.headers.get('Content-Type', '').lower()
+            decoder = codecs.getincrementaldecoder(
+                response.encoding if charset_declared else 'utf-8'
+            )(errors='replace')
+            parser = StreamingListingParser(limit, self._listing_profiles(url))
+            chunks = []
+            event['bytes'] = 0
+            for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+                chunks.append(chunk)
+                event['bytes'] += len(chunk)
+                parser.feed(decoder.decode(chunk))
+                if parser.done:
+                    return self._detected(url, parser.listing)
+            parser.feed(decoder.decode(b'', final=True))
+            parser.close()
+
+        if self.cache:
+            self.cache.put(
+                url,
+                b''.join(chunks),
+                etag=response.headers.get('ETag'),
+                last_modified=response.headers.get('Last-Modified'),
+                cache_control=response.headers.get('Cache-Control')
+            )
+        return self._detected(url, parser.listing)
+
+    def _listing_profiles(self, url: str) -> list[SelectorProfile]:
+        """Selector profiles to try on a listing page, the one seen on its host before first."""
+        if self.profile is not None:
+            return [self.profile]
+        return self.profiles.candidates(urlparse(url).netloc)
+
+    def _detected(self, url: str, listing: Listing) -> Listing:
+        """Remember the profile the listing's posts were found with for its host."""
+        if listing.profile and self.profile is None:
+            self.profiles.remember(urlparse(url).netloc, listing.profile)
+        return listing
+
+    def _parse_listing(self, content: bytes, url: str, limit: int | None = None) -> Listing:
+        with self.telemetry.span('parse_listing', parser=self.parser.name) as event:
+            listing = self.parser.parse_listing(content, limit, self._listing_profiles(url))
+            event['posts'] = len(listing.posts)
+            event['profile'] = listing.profile
+            return self._detected(url, listing)
+
+    def _fetch_listing(self, url: str, limit: int | None = None) -> Listing:
+        """Fetch and parse a listing page, keeping at most ``limit`` posts."""
+        if self.streaming:
+            return self._stream_listing(url, limit)
+        return self._parse_listing(self.fetch(url), url, limit)
+
+    def _find_pagination(self, page_links: list[tuple[str, bool]], url: str) -> tuple[str | None, int | None]:
+        """
+        Work out how the listing paginates.
+
+        Args:
+            page_links (list[tuple[str, bool]]): Pagination-like links found on the first page
+            url (str): URL the listing was fetched from
+
+        Returns:
+            tuple[str | None, int | None]: A page URL template with a ``{}`` placeholder
+            for the page number (None if the listing does not paginate) and the highest
+            page number linked from the page (None if only a "next" link was found)
+        """
+        host = urlparse(url).netloc
+        template = None
+        last_page = None
+        has_next = False
+
+        for href, is_next in page_links:
+            has_next = has_next or is_next
+            href = urljoin(url, href)
+            if urlparse(href).netloc != host:
+                continue
+            match = PAGE_NUMBER_RE.search(href)
+            if not match:
+                continue
+            page = int(match.group(2))
+            if template is None:
+                template = href[:match.start(2)] + '{}' + href[match.end(2):]
+            if not is_next:
+                last_page = max(last_page or 0, page)
+
+        if template is None and has_next:
+            # Fall back to the WordPress convention when only a bare "next" link exists
+            template = urljoin(url.rstrip('/') + '/', 'page/{}/')
+
+        return template, last_page
+
+    def _fetch_listing_page(self, page_url: str) -> list[dict] | None:
+        """
+        Fetch and parse a single paginated listing page.
+
+        Returns no posts for a page that does not exist, and None, after reporting
+        the error, for a page that could not be fetched.
+        """
+        try:
+            return self._fetch_listing(page_url).posts
+        except requests.HTTPError as e:
+            # Requesting past the last page usually 404s, which simply ends the crawl
+            if e.response is not None and e.response.status_code in PAST_LAST_PAGE_STATUSES:
+                return []
+            self.on_error(f"Error fetching listing page {page_url}: {str(e)}")
+            return None
+        except Exception as e:
+            self.on_error(f"Error fetching listing page {page_url}: {str(e)}")
+            return None
+
+    def _fetch_feed_page(self, feed_url: str) -> list[dict]:
+        """Fetch and parse a single feed page, returning no posts on failure."""
+        try:
+            content = self.fetch(feed_url)
+            with self.telemetry.span('parse_feed') as event:
+                posts = parse_feed(content)
+                event['posts'] = len(posts)
+                return posts
+        except Exception:
+            return []
+
+    def _crawl_pages(self, template: str, last_page: int | None, posts: list[dict], num_posts: int,
+                     fetch_page: Callable[[str], list[dict] | None] | None = None) -> list[dict]:
+        """
+        Fetch the remaining listing pages concurrently until ``num_posts`` is reached.
+
+        Pages are requested in waves sized from the number of posts still missing, so a
+        crawl normally completes in a single round of parallel requests. Results are
+        consumed in page order and the crawl stops at the first page that is empty or
+        only repeats posts already seen. Pages that failed to fetch (``fetch_page``
+        returned None) are skipped; a wave in which every page failed ends the crawl.
+        """
+        fetch_page = fetch_page or self._fetch_listing_page
+        per_page = max(len(posts), 1)
+        next_page = 2
+        seen = {post['link'] for post in posts}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while len(posts) < num_posts:
+                if last_page is not None and next_page > last_page:
+                    break
+                pages_needed = -(-(num_posts - len(posts)) // per_page)
+                stop = next_page + pages_needed
+                if last_page is not None:
+                    stop = min(stop, last_page + 1)
+                page_urls = [template.format(page) for page in range(next_page, stop)]
+                next_page = stop
+
+                exhausted = True
+                for page_posts in executor.map(fetch_page, page_urls):
+                    if page_posts is None:
+                        continue
+                    exhausted = False
+                    new_posts = [post for post in page_posts if post['link'] not in seen]
+                    if not new_posts:
+                        exhausted = True
+                        break
+                    seen.update(post['link'] for post in new_posts)
+                    posts.extend(new_posts)
+                if exhausted:
+                    break
+
+        return posts[:num_posts]
+
+    def _scrape_feed(self, url: str, num_posts: int) -> list[dict]:
+        """Discover posts from the blog's RSS/Atom feed, following the feed's pagination."""
+        for feed_url in feed_candidates(url):
+            posts = self._fetch_feed_page(feed_url)
+            if posts:
+                if len(posts) < num_posts:
+                    posts = self._crawl_pages(
+                        paged_feed_url(feed_url), None, posts, num_posts, self._fetch_feed_page
+                    )
+                return with_source(posts[:num_posts], 'feed')
+        return []
+
+    def _scrape_sitemap(self, url: str, num_posts: int) -> list[dict]:
+        """Discover the most recently modified posts from the site's XML sitemap."""
+        host = urlparse(url).netloc
+        queue = sitemap_candidates(url)
+        visited = set()
+        while queue:
+            sitemap_url = queue.pop(0)
+            if sitemap_url in visited:
+                continue
+            visited.add(sitemap_url)
+            try:
+                entries, children = parse_sitemap(self.fetch(sitemap_url))
+            except Exception:
+                continue
+            # Post sitemaps first; page, category and tag sitemaps rarely hold blog posts
+            queue = sorted(children, key=lambda child: 'post' not in child) + queue
+            entries = [
+                entry for entry in entries
+                if urlparse(entry['link']).netloc == host and entry['link'].rstrip('/') != url.rstrip('/')
+            ]
+            if entries:
+                entries.sort(key=lambda entry: entry['lastmod'], reverse=True)
+                posts = []
+                for entry in entries[:num_posts]:
+                    post = make_post(title_from_url(entry['link']), entry['link'], '')
+                    post['updated'] = entry['lastmod']
+                    posts.append(post)
+                return with_source(posts, 'sitemap')
+        return []
+
+    def scrape_blogs(self, url: str, num_posts: int) -> list[dict]:
+        """
+        Scrape blog posts from the given URL.
+
+        Near-duplicates of posts seen before, on this or any other blog, get a
+        ``duplicate_of`` key holding the link of the first copy. Every post gets a
+        ``source`` key saying whether it came from the feed, listing or sitemap.
+
+        The blog's RSS/Atom feed is tried first. Otherwise the HTML listing is parsed,
+        following its pagination when the first page holds fewer than ``num_posts``
+        posts and fetching the remaining pages concurrently. In streaming mode the
+        first page download stops as soon as ``num_posts`` posts are parsed. If the
+        listing holds no recognisable posts, the site's sitemap is used instead.
+
+        Args:
+            url (str): The URL to scrape from
+            num_posts (int): Number of posts to scrape
+
+        Returns:
+            list[dict]: List of blog post dictionaries containing title, link, and excerpt
+        """
+        posts = self._scrape(url, num_posts)
+        if self.dedupe_index is not None:
+            mark_duplicates(posts, self.dedupe_index)
+        return posts
+
+    def _scrape(self, url: str, num_posts: int) -> list[dict]:
+        if not self.is_valid_url(url):
+            self.on_error("Please enter a valid URL")
+            return []
+
+        if self.prefer_feeds:
+            feed_posts = self._scrape_feed(url, num_posts)
+            if feed_posts:
+                return feed_posts
+
+        try:
+            listing = self._fetch_listing(url, num_posts)
+        except Exception as e:
+            self.on_error(f"Error fetching URL: {str(e)}")
+            return []
+
+        try:
+            blog_posts = listing.posts
+            if not blog_posts and self.prefer_feeds:
+                return self._scrape_sitemap(url, num_posts)
+            if len(blog_posts) >= num_posts:
+                return with_source(blog_posts[:num_posts], 'listing')
+
+            template, last_page = self._find_pagination(listing.page_links, url)
+            if template is None:
+                return with_source(blog_posts, 'listing')
+
+            return with_source(self._crawl_pages(template, last_page, blog_posts, num_posts), 'listing')
+        except Exception as e:
+            self.on_error(f"Error scraping blogs: {str(e)}")
+            return []
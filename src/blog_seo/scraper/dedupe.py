@@ -0,0 +1,213 @@
+"""
+Near-duplicate detection for scraped posts with MinHash and locality-sensitive hashing.
+
+Each post is reduced to a MinHash signature of its word shingles. Signatures are split
+into bands that are hashed into buckets, so finding the posts similar to a new one
+only compares it against the few posts sharing a bucket, not the whole corpus.
+"""
+import re
+import threading
+import zlib
+from collections import defaultdict
+from typing import Callable, Hashable
+
+import numpy as np
+
+from .posts import post_text
+
+WORD_RE = re.compile(r'\w+')
+
+# Odd multiplier for combining word hashes into shingle hashes (wraps modulo 2**64)
+SHINGLE_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+
+
+class NearDuplicateIndex:
+    """
+    MinHash-LSH index of documents, grouping near-duplicates under a canonical key.
+
+    With ``bands`` bands of ``num_perm // bands`` rows, two documents become
+    candidates with high probability once their Jaccard similarity passes roughly
+    ``(1 / bands) ** (bands / num_perm)``; candidates are then confirmed against
+    ``threshold`` using the full signatures.
+
+    Args:
+        threshold (float): Estimated Jaccard similarity above which documents are duplicates
+        num_perm (int): Number of hash functions in each signature
+        bands (int): Number of LSH bands; must divide ``num_perm``
+        shingle_size (int): Words per shingle
+        seed (int): Seed for the hash functions, fixed so signatures are reproducible
+    """
+
+    def __init__(self, threshold: float = 0.8, num_perm: int = 128, bands: int = 16,
+                 shingle_size: int = 4, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, 2 ** 63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+        self._b = rng.integers(0, 2 ** 63, size=num_perm, dtype=np.uint64)
+        self._word_hashes = {}
+        self._buckets = [defaultdict(set) for _ in range(bands)]
+        self._signatures = {}
+        self._canonical = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._signatures
+
+    def _shingles(self, text: str) -> np.ndarray:
+        """Hashes of the overlapping word shingles of ``text``."""
+        words = WORD_RE.findall(text.lower())
+        if not words:
+            return np.empty(0, dtype=np.uint64)
+        word_hashes = self._word_hashes
+        for word in set(words).difference(word_hashes):
+            word_hashes[word] = zlib.crc32(word.encode('utf-8'))
+        hashes = np.fromiter(map(word_hashes.__getitem__, words), dtype=np.uint64, count=len(words))
+        size = min(self.shingle_size, len(hashes))
+        count = len(hashes) - size + 1
+        shingles = hashes[:count].copy()
+        with np.errstate(over='ignore'):
+            for offset in range(1, size):
+                shingles = shingles * SHINGLE_MULTIPLIER + hashes[offset:offset + count]
+        return np.unique(shingles)
+
+    def signature(self, text: str) -> np.ndarray | None:
+        """MinHash signature of ``text``, or None when it has no words."""
+        shingles = self._shingles(text)
+        if not len(shingles):
+            return None
+        with np.errstate(over='ignore'):
+            return (np.outer(self._a, shingles) + self._b[:, None]).min(axis=1)
+
+    def _band_keys(self, signature: np.ndarray) -> list[bytes]:
+        return [signature[band * self.rows:(band + 1) * self.rows].tobytes() for band in range(self.bands)]
+
+    def _match(self, key: Hashable, signature: np.ndarray) -> Hashable | None:
+        """The most similar indexed document above the threshold, if any."""
+        candidates = set()
+        for buckets, band_key in zip(self._buckets, self._band_keys(signature)):
+            candidates.update(buckets.get(band_key, ()))
+        candidates.discard(key)
+        if not candidates:
+            return None
+        candidates = list(candidates)
+        stacked = np.stack([self._signatures[candidate] for candidate in candidates])
+        similarity = (stacked == signature).mean(axis=1)
+        best = int(similarity.argmax())
+        return candidates[best] if similarity[best] >= self.threshold else None
+
+    def query(self, text: str) -> Hashable | None:
+        """Canonical key of an indexed near-duplicate of ``text``, without indexing it."""
+        signature = self.signature(text)
+        if signature is None:
+            return None
+        with self._lock:
+            match = self._match(None, signature)
+            return self._canonical.get(match, match) if match is not None else None
+
+    def add(self, key: Hashable, text: str) -> Hashable | None:
+        """
+        Index a document, replacing any earlier text stored under the same key.
+
+        Args:
+            key (Hashable): Identifier of the document, such as the post URL
+            text (str): Document text
+
+        Returns:
+            Hashable | None: Canonical key of the group the document duplicates, or
+            None when it is the first of its kind
+        """
+        signature = self.signature(text)
+        with self._lock:
+            self._remove(key)
+            if signature is None:
+                return None
+            match = self._match(key, signature)
+            canonical = self._canonical.get(match, match) if match is not None else None
+            if canonical == key:
+                # Re-indexing the canonical copy of a group; it stays canonical
+                canonical = None
+            self._signatures[key] = signature
+            for buckets, band_key in zip(self._buckets, self._band_keys(signature)):
+                buckets[band_key].add(key)
+            if canonical is not None:
+                self._canonical[key] = canonical
+            return canonical
+
+    def _remove(self, key: Hashable) -> None:
+        signature = self._signatures.pop(key, None)
+        if signature is None:
+            return
+        self._canonical.pop(key, None)
+        for buckets, band_key in zip(self._buckets, self._band_keys(signature)):
+            bucket = buckets[band_key]
+            bucket.discard(key)
+            if not bucket:
+                del buckets[band_key]
+
+    def remove(self, key: Hashable) -> None:
+        """Drop a document from the index."""
+        with self._lock:
+            self._remove(key)
+
+
+def mark_duplicates(posts: list[dict], index: NearDuplicateIndex | None = None,
+                    text: Callable[[dict], str] = post_text) -> list[dict]:
+    """
+    Set ``post['duplicate_of']`` to the link of the canonical post for near-duplicates.
+
+    Posts are added to ``index`` (a fresh one when omitted), so duplicates are also
+    found against posts indexed by earlier scrapes. Canonical posts have no
+    ``duplicate_of`` key.
+    """
+    if index is None:
+        index = NearDuplicateIndex()
+    for post in posts:
+        canonical = index.add(post['link'], text(post))
+        if canonical is None:
+            post.pop('duplicate_of', None)
+        else:
+            post['duplicate_of'] = canonical
+    return posts
+
+
+def share_analysis(posts: list[dict], fields: tuple[str, ...]) -> list[dict]:
+    """
+    Copy analysis results from canonical posts to their near-duplicates.
+
+    Returns:
+        list[dict]: The duplicates that received results
+    """
+    by_link = {post['link']: post for post in posts}
+    updated = []
+    for post in posts:
+        canonical = by_link.get(post.get('duplicate_of'))
+        if canonical is None or not canonical.get('analyzed') or post.get('analyzed'):
+            continue
+        for field in fields:
+            if canonical.get(field):
+                post[field] = canonical[field]
+        post['analyzed'] = True
+        updated.append(post)
+    return updated
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_duplicate_index() -> NearDuplicateIndex:
+    """Return the process-wide near-duplicate index, creating it on first use."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = NearDuplicateIndex()
+        return _index
@@ -0,0 +1,166 @@
+"""
+Bulk export and import of posts with their analyses.
+
+Posts are written as JSON lines or, when pyarrow is installed, as Parquet or Arrow
+IPC files with one column per post field. Both directions stream in batches, so
+exporting or importing tens of thousands of posts never holds more than one batch
+of rows in memory on top of the posts themselves.
+"""
+import json
+import os
+from collections.abc import Iterable, Iterator, Mapping
+from contextlib import nullcontext
+from typing import Any, BinaryIO
+
+from .posts import POST_KEYS, BlogPost
+
+EXPORT_FORMATS = {
+    '.jsonl': 'jsonl',
+    '.ndjson': 'jsonl',
+    '.parquet': 'parquet',
+    '.pq': 'parquet',
+    '.arrow': 'arrow',
+    '.feather': 'arrow',
+}
+BATCH_SIZE = 5000
+# Keys without a column of their own are kept as a JSON object in this column
+EXTRA_COLUMN = 'extra'
+
+
+def export_format(path: str) -> str:
+    """Export format for a file name, from its extension."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export file type '{extension}': use {', '.join(EXPORT_FORMATS)}")
+    return EXPORT_FORMATS[extension]
+
+
+def require_pyarrow():
+    """Import pyarrow, with an install hint when it is missing."""
+    try:
+        import pyarrow
+        import pyarrow.ipc  # noqa: F401
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        raise ImportError("Parquet and Arrow export need pyarrow: pip install pyarrow") from None
+    return pyarrow
+
+
+def arrow_schema():
+    """Arrow schema with one column per post field."""
+    pa = require_pyarrow()
+    types = {
+        'analyzed': pa.bool_(),
+        'headings': pa.list_(pa.struct([('level', pa.int8()), ('text', pa.string())])),
+    }
+    return pa.schema(
+        [(key, types.get(key, pa.string())) for key in POST_KEYS] + [(EXTRA_COLUMN, pa.string())]
+    )
+
+
+def _batches(posts: Iterable[Mapping[str, Any]], batch_size: int) -> Iterator[list[Mapping[str, Any]]]:
+    batch = []
+    for post in posts:
+        batch.append(post)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _record_batch(posts: list[Mapping[str, Any]], schema):
+    pa = require_pyarrow()
+    columns = {key: [post.get(key) for post in posts] for key in POST_KEYS}
+    columns[EXTRA_COLUMN] = [
+        json.dumps(extra, ensure_ascii=False, default=str) if extra else None
+        for extra in ({key: value for key, value in post.items() if key not in POST_KEYS} for post in posts)
+    ]
+    return pa.RecordBatch.from_pydict(columns, schema=schema)
+
+
+def _open(target: str | BinaryIO, mode: str):
+    return open(target, mode) if isinstance(target, str) else nullcontext(target)
+
+
+def export_posts(posts: Iterable[Mapping[str, Any]], target: str | BinaryIO, fmt: str | None = None,
+                 batch_size: int = BATCH_SIZE) -> int:
+    """
+    Write posts, including their content and analysis, to a file.
+
+    Args:
+        posts (Iterable[Mapping]): Post dicts or ``BlogPost`` objects
+        target (str | BinaryIO): File path, or a binary stream such as ``io.BytesIO``
+        fmt (str | None): 'jsonl', 'parquet' or 'arrow'; taken from the path's extension by default
+        batch_size (int): Posts converted per batch
+
+    Returns:
+        int: Number of posts written
+    """
+    if fmt is None:
+        fmt = export_format(target) if isinstance(target, str) else 'jsonl'
+    count = 0
+    if fmt == 'jsonl':
+        with _open(target, 'wb') as f:
+            for post in posts:
+                f.write((json.dumps(dict(post.items()), ensure_ascii=False) + '\n').encode('utf-8'))
+                count += 1
+        return count
+
+    pa = require_pyarrow()
+    schema = arrow_schema()
+    with _open(target, 'wb') as f:
+        if fmt == 'parquet':
+            writer = pa.parquet.ParquetWriter(f, schema, compression='zstd')
+        elif fmt == 'arrow':
+            writer = pa.ipc.new_file(f, schema, options=pa.ipc.IpcWriteOptions(compression='zstd'))
+        else:
+            raise ValueError(f"Unknown export format: {fmt}")
+        with writer:
+            for batch in _batches(posts, batch_size):
+                writer.write_batch(_record_batch(batch, schema))
+                count += len(batch)
+    return count
+
+
+def _from_row(row: dict[str, Any]) -> BlogPost:
+    extra = row.pop(EXTRA_COLUMN, None)
+    data = {key: value for key, value in row.items() if value is not None}
+    if extra:
+        data.update(json.loads(extra))
+    return BlogPost.from_dict(data)
+
+
+def import_posts(source: str | BinaryIO, fmt: str | None = None) -> Iterator[BlogPost]:
+    """
+    Read posts written by ``export_posts``, one batch at a time.
+
+    Args:
+        source (str | BinaryIO): File path, or a binary stream such as an uploaded file
+        fmt (str | None): 'jsonl', 'parquet' or 'arrow'; taken from the file name by default
+
+    Yields:
+        BlogPost: Each post in file order
+    """
+    name = source if isinstance(source, str) else getattr(source, 'name', None)
+    if fmt is None:
+        fmt = export_format(name) if name else 'jsonl'
+    if fmt == 'jsonl':
+        with _open(source, 'rb') as f:
+            for line in f:
+                if line.strip():
+                    yield BlogPost.from_dict(json.loads(line))
+        return
+
+    pa = require_pyarrow()
+    with _open(source, 'rb') as f:
+        if fmt == 'parquet':
+            batches = pa.parquet.ParquetFile(f).iter_batches(batch_size=BATCH_SIZE)
+        elif fmt == 'arrow':
+            reader = pa.ipc.open_file(f)
+            batches = (reader.get_batch(index) for index in range(reader.num_record_batches))
+        else:
+            raise ValueError(f"Unknown export format: {fmt}")
+        for batch in batches:
+            for row in batch.to_pylist():
+                yield _from_row(row)
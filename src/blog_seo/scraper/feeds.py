@@ -0,0 +1,125 @@
+"""
+Post discovery from RSS/Atom feeds and XML sitemaps.
+
+Feeds and sitemaps list a blog's posts in a compact, stable format, so they are far
+cheaper to fetch and parse than HTML listing pages. Feeds that carry the full post
+(``content:encoded``) even make fetching the article pages unnecessary.
+"""
+import html
+import re
+import xml.etree.ElementTree as ET
+from urllib.parse import urljoin, urlparse
+
+from .parsers import make_post
+
+NAMESPACES = {
+    'atom': 'http://www.w3.org/2005/Atom',
+    'content': 'http://purl.org/rss/1.0/modules/content/',
+    'sitemap': 'http://www.sitemaps.org/schemas/sitemap/0.9',
+}
+
+TAG_RE = re.compile(r'<[^>]+>')
+WHITESPACE_RE = re.compile(r'\s+')
+
+
+def feed_candidates(url: str) -> list[str]:
+    """Likely feed URLs for a blog listing, most specific first (WordPress conventions)."""
+    parsed = urlparse(url)
+    root = f"{parsed.scheme}://{parsed.netloc}/"
+    candidates = [urljoin(url.rstrip('/') + '/', 'feed/'), urljoin(root, 'feed/')]
+    return list(dict.fromkeys(candidates))
+
+
+def sitemap_candidates(url: str) -> list[str]:
+    """Likely post sitemap URLs for a blog (Yoast, WordPress core and generic names)."""
+    parsed = urlparse(url)
+    root = f"{parsed.scheme}://{parsed.netloc}/"
+    return [urljoin(root, path) for path in ('post-sitemap.xml', 'wp-sitemap-posts-post-1.xml', 'sitemap.xml')]
+
+
+def paged_feed_url(feed_url: str) -> str:
+    """Template for further feed pages, with a ``{}`` placeholder for the page number."""
+    return feed_url + ('&' if '?' in feed_url else '?') + 'paged={}'
+
+
+def strip_html(markup: str) -> str:
+    """Collapse an HTML fragment to plain text."""
+    return WHITESPACE_RE.sub(' ', html.unescape(TAG_RE.sub(' ', markup or ''))).strip()
+
+
+def _text(elem: ET.Element | None) -> str:
+    return (elem.text or '').strip() if elem is not None else ''
+
+
+def parse_feed(content: bytes) -> list[dict]:
+    """
+    Parse an RSS 2.0 or Atom feed into blog post dictionaries.
+
+    Args:
+        content (bytes): Raw feed XML
+
+    Returns:
+        list[dict]: Posts in feed order. Posts whose feed entry carries the full body
+        also get ``content`` and ``headings``; every post gets ``updated`` when known.
+    """
+    from .article_fetcher import extract_article
+
+    root = ET.fromstring(content)
+    posts = []
+
+    if root.tag == f"{{{NAMESPACES['atom']}}}feed":
+        for entry in root.findall('atom:entry', NAMESPACES):
+            link_elem = entry.find("atom:link[@rel='alternate']", NAMESPACES)
+            if link_elem is None:
+                link_elem = entry.find('atom:link', NAMESPACES)
+            post = make_post(
+                strip_html(_text(entry.find('atom:title', NAMESPACES))),
+                link_elem.get('href', '') if link_elem is not None else '',
+                strip_html(_text(entry.find('atom:summary', NAMESPACES)))
+            )
+            if not post:
+                continue
+            post['updated'] = _text(entry.find('atom:updated', NAMESPACES))
+            body = _text(entry.find('atom:content', NAMESPACES))
+            if body:
+                post['content'], post['headings'] = extract_article(body.encode('utf-8'))
+            posts.append(post)
+        return posts
+
+    for item in root.iter('item'):
+        post = make_post(
+            strip_html(_text(item.find('title'))),
+            _text(item.find('link')),
+            strip_html(_text(item.find('description')))
+        )
+        if not post:
+            continue
+        post['updated'] = _text(item.find('pubDate'))
+        body = _text(item.find('content:encoded', NAMESPACES))
+        if body:
+            post['content'], post['headings'] = extract_article(body.encode('utf-8'))
+        posts.append(post)
+    return posts
+
+
+def parse_sitemap(content: bytes) -> tuple[list[dict], list[str]]:
+    """
+    Parse a sitemap or sitemap index.
+
+    Returns:
+        tuple[list[dict], list[str]]: ``{'link', 'lastmod'}`` entries of a url set,
+        and the child sitemap URLs of a sitemap index
+    """
+    root = ET.fromstring(content)
+    entries = [
+        {'link': _text(url.find('sitemap:loc', NAMESPACES)), 'lastmod': _text(url.find('sitemap:lastmod', NAMESPACES))}
+        for url in root.findall('sitemap:url', NAMESPACES)
+    ]
+    children = [_text(child.find('sitemap:loc', NAMESPACES)) for child in root.findall('sitemap:sitemap', NAMESPACES)]
+    return [entry for entry in entries if entry['link']], [child for child in children if child]
+
+
+def title_from_url(url: str) -> str:
+    """Best-effort title for a post only known by URL, taken from its slug."""
+    slug = urlparse(url).path.rstrip('/').rsplit('/', 1)[-1]
+    return slug.replace('-', ' ').replace('_', ' ').strip().capitalize()
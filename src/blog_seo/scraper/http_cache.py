@@ -0,0 +1,215 @@
+"""
+Pooled HTTP session and persistent response cache for the scraper.
+"""
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'blog-seo')
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session(pool_size: int = 32) -> requests.Session:
+    """Return the process-wide keep-alive session, creating it on first use."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            _session = session
+        return _session
+
+
+def parse_cache_control(header: str | None) -> tuple[bool, float | None]:
+    """
+    Read the directives of a ``Cache-Control`` response header that matter here.
+
+    Returns:
+        tuple[bool, float | None]: Whether the response may be stored, and its
+        freshness lifetime in seconds (0 for ``no-cache``; None when not given)
+    """
+    storable, max_age = True, None
+    for directive in (header or '').lower().split(','):
+        name, _, value = directive.strip().partition('=')
+        if name == 'no-store':
+            storable = False
+        elif name == 'no-cache':
+            max_age = 0.0
+        elif name == 'max-age' and max_age is None:
+            try:
+                max_age = max(float(value.strip().strip('"')), 0.0)
+            except ValueError:
+                max_age = 0.0
+    return storable, max_age
+
+
+@dataclass
+class CachedResponse:
+    """A cached response body together with its validators."""
+    url: str
+    body: bytes
+    etag: str | None
+    last_modified: str | None
+    stored_at: float
+    # Freshness lifetime from the response's Cache-Control, overriding the cache TTL
+    max_age: float | None = None
+
+    def is_fresh(self, ttl: float) -> bool:
+        """Whether the entry can be served without revalidating."""
+        lifetime = ttl if self.max_age is None else self.max_age
+        return time.time() - self.stored_at < lifetime
+
+    def conditional_headers(self) -> dict:
+        """Headers for a conditional GET revalidating this entry."""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """
+    SQLite-backed response cache keyed by URL.
+
+    ``ttl`` is a freshness window, not an expiry: entries younger than that are served
+    without touching the network, and older ones are kept and revalidated with a
+    conditional GET. A ``Cache-Control: max-age`` (or ``no-cache``) on the response
+    replaces the window for that entry, and ``no-store`` responses are never cached.
+    Stale entries without an ETag or Last-Modified can't be revalidated and are
+    dropped once stale. When the total body size exceeds ``max_bytes`` the least
+    recently used entries are evicted.
+    """
+
+    def __init__(self, path: str | None = None, max_bytes: int = 256 * 1024 * 1024,
+                 ttl: float = 15 * 60):
+        if path is None:
+            cache_dir = os.getenv('BLOG_SEO_CACHE_DIR', DEFAULT_CACHE_DIR)
+            os.makedirs(cache_dir, exist_ok=True)
+            path = os.path.join(cache_dir, 'http.sqlite3')
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                body BLOB NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                size INTEGER NOT NULL,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                max_age REAL
+            )
+            """
+        )
+        columns = [row[1] for row in self._conn.execute('PRAGMA table_info(responses)')]
+        if 'max_age' not in columns:
+            # Caches created before Cache-Control was honoured
+            self._conn.execute('ALTER TABLE responses ADD COLUMN max_age REAL')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses (accessed_at)')
+        self._conn.commit()
+
+    def get(self, url: str) -> CachedResponse | None:
+        """Look up a cached response, marking it as recently used."""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT body, etag, last_modified, stored_at, max_age FROM responses WHERE url = ?',
+                (url,)
+            ).fetchone()
+            if row is None:
+                return None
+            cached = CachedResponse(url, *row)
+            if not (cached.etag or cached.last_modified) and not cached.is_fresh(self.ttl):
+                # Nothing to revalidate with, so the stale body is of no further use
+                self._conn.execute('DELETE FROM responses WHERE url = ?', (url,))
+                self._conn.commit()
+                return None
+            self._conn.execute('UPDATE responses SET accessed_at = ? WHERE url = ?', (time.time(), url))
+            self._conn.commit()
+        return cached
+
+    def put(self, url: str, body: bytes, etag: str | None = None, last_modified: str | None = None,
+            cache_control: str | None = None) -> None:
+        """
+        Store a response and evict old entries if the cache is over its size limit.
+
+        A ``no-store`` ``cache_control`` removes any entry for the URL
+        instead of storing the response.
+        """
+        storable, max_age = parse_cache_control(cache_control)
+        now = time.time()
+        with self._lock:
+            if not storable:
+                self._conn.execute('DELETE FROM responses WHERE url = ?', (url,))
+            else:
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                    (url, body, etag, last_modified, len(body), now, now, max_age)
+                )
+                self._evict()
+            self._conn.commit()
+
+    def refresh(self, url: str, cache_control: str | None = None) -> None:
+        """Restart the freshness window of an entry after a 304 Not Modified."""
+        storable, max_age = parse_cache_control(cache_control)
+        now = time.time()
+        with self._lock:
+            if not storable:
+                self._conn.execute('DELETE FROM responses WHERE url = ?', (url,))
+            elif max_age is not None:
+                self._conn.execute(
+                    'UPDATE responses SET stored_at = ?, accessed_at = ?, max_age = ? WHERE url = ?',
+                    (now, now, max_age, url)
+                )
+            else:
+                self._conn.execute(
+                    'UPDATE responses SET stored_at = ?, accessed_at = ? WHERE url = ?', (now, now, url)
+                )
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until the cache fits in ``max_bytes``."""
+        total = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._conn.execute('SELECT url, size FROM responses ORDER BY accessed_at').fetchall()
+        stale = []
+        for url, size in rows:
+            if total <= self.max_bytes:
+                break
+            stale.append((url,))
+            total -= size
+        self._conn.executemany('DELETE FROM responses WHERE url = ?', stale)
+
+    def clear(self) -> None:
+        """Remove every cached response."""
+        with self._lock:
+            self._conn.execute('DELETE FROM responses')
+            self._conn.commit()
+
+
+_cache = None
+
+
+def get_response_cache() -> ResponseCache:
+    """Return the process-wide response cache, creating it on first use."""
+    global _cache
+    with _session_lock:
+        if _cache is None:
+            _cache = ResponseCache()
+        return _cache
@@ -0,0 +1,562 @@
+"""
+Pluggable HTML parser backends for blog listing pages.
+
+Every backend turns a listing page into the same ``Listing`` result: the blog posts
+found on the page and the links that may point at further listing pages. The fastest
+installed backend is used by default (selectolax, then lxml), falling back to a
+BeautifulSoup parse restricted to the few tags a listing needs.
+
+Posts are located with selector profiles (see ``profiles``). Each backend compiles a
+profile once into its own matchers and tries the candidate profiles against a single
+parse of the page.
+"""
+import os
+import re
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from functools import lru_cache
+from html.parser import HTMLParser
+from typing import Any, Iterable
+
+import soupsieve
+from bs4 import BeautifulSoup, SoupStrainer
+
+from .profiles import SelectorProfile, SimpleSelector, get_profile_registry, order_by_generator
+
+# Matches WordPress-style pagination such as /page/3/, ?page=3 or ?paged=3
+PAGE_NUMBER_RE = re.compile(r'(/page/|[?&](?:page|paged)=)(\d+)')
+
+
+@dataclass
+class Listing:
+    """Posts and pagination links extracted from one listing page."""
+    posts: list[dict] = field(default_factory=list)
+    # (href, is_rel_next) pairs for links that look like pagination
+    page_links: list[tuple[str, bool]] = field(default_factory=list)
+    # Name of the selector profile the posts were found with
+    profile: str | None = None
+
+
+def make_post(title: str, link: str, excerpt: str) -> dict | None:
+    """Build a blog post dictionary, or None if the article has neither title nor excerpt."""
+    if not (title or excerpt):  # Only keep if we have at least a title or excerpt
+        return None
+    return {
+        'title': title,
+        'link': link,
+        'excerpt': excerpt,
+        'keywords': '',  # Initialize with empty string
+        'summary': '',   # Initialize with empty string
+        'analyzed': False  # Track if post has been analyzed
+    }
+
+
+def is_page_link(href: str, rel: list[str] | str | None) -> tuple[str, bool] | None:
+    """Return an ``(href, is_rel_next)`` pair if the link looks like listing pagination."""
+    if isinstance(rel, str):
+        rel = rel.split()
+    is_next = 'next' in (rel or [])
+    if is_next or PAGE_NUMBER_RE.search(href):
+        return href, is_next
+    return None
+
+
+class ParserBackend(ABC):
+    """
+    Base class for listing parser backends.
+
+    Subclasses parse the page once in ``_parse`` and implement the lookups on the
+    resulting tree; ``parse_listing`` runs the profile detection shared by all of them.
+    """
+
+    name = ''
+
+    @classmethod
+    def available(cls) -> bool:
+        """Whether the libraries this backend needs are installed."""
+        return True
+
+    def parse_listing(self, content: bytes, limit: int | None = None,
+                      profiles: Iterable[SelectorProfile] | None = None) -> Listing:
+        """
+        Parse a listing page, keeping at most ``limit`` posts.
+
+        Args:
+            content (bytes): Page body
+            limit (int | None): Maximum number of posts to keep
+            profiles (Iterable[SelectorProfile] | None): Candidate profiles in order of
+                preference; every registered profile by default
+
+        Returns:
+            Listing: Posts found with the first profile that finds any, and pagination links
+        """
+        profiles = list(get_profile_registry() if profiles is None else profiles)
+        tree = self._parse(content, profiles)
+        listing = Listing(page_links=self._page_links(tree))
+        if len(profiles) > 1:
+            profiles = order_by_generator(profiles, self._generators(tree))
+        for profile in profiles:
+            posts = self._posts(tree, profile, limit)
+            if posts:
+                listing.posts = posts
+                listing.profile = profile.name
+                break
+        return listing
+
+    @abstractmethod
+    def _parse(self, content: bytes, profiles: list[SelectorProfile]) -> Any:
+        """Parse the page once into the tree the other lookups run on."""
+
+    @abstractmethod
+    def _generators(self, tree: Any) -> list[str]:
+        """Contents of the page's generator meta tags."""
+
+    @abstractmethod
+    def _page_links(self, tree: Any) -> list[tuple[str, bool]]:
+        """``(href, is_rel_next)`` pairs for the page's pagination links."""
+
+    @abstractmethod
+    def _posts(self, tree: Any, profile: SelectorProfile, limit: int | None) -> list[dict]:
+        """Posts found with ``profile``, at most ``limit`` of them."""
+
+@lru_cache(maxsize=None)
+def _compile_soup(profile: SelectorProfile) -> dict[str, soupsieve.SoupSieve | None]:
+    return {
+        'article': soupsieve.compile(profile.article),
+        'title': soupsieve.compile(profile.title),
+        'excerpt': soupsieve.compile(profile.excerpt) if profile.excerpt else None,
+        'link': soupsieve.compile(profile.link),
+    }
+
+
+@lru_cache(maxsize=None)
+def _soup_strainer(profiles: tuple[SelectorProfile, ...]) -> SoupStrainer | None:
+    """Strainer keeping the article tags of every profile, or None if one matches any tag."""
+    tags = {'a', 'link', 'meta'}
+    for profile in profiles:
+        for selector in profile.selectors['article']:
+            if selector.tag is None:
+                return None
+            tags.add(selector.tag)
+    return SoupStrainer(sorted(tags))
+
+
+class SoupBackend(ParserBackend):
+    """BeautifulSoup backend that only builds a tree for articles and links."""
+
+    name = 'soup'
+
+    def __init__(self, features: str = 'html.parser'):
+        self.features = features
+
+    def _parse(self, content: bytes, profiles: list[SelectorProfile]) -> BeautifulSoup:
+        return BeautifulSoup(content, self.features, parse_only=_soup_strainer(tuple(profiles)))
+
+    def _generators(self, soup: BeautifulSoup) -> list[str]:
+        return [
+            meta.get('content') or ''
+            for meta in soup.find_all('meta', attrs={'name': True})
+            if meta['name'].lower() == 'generator'
+        ]
+
+    def _page_links(self, soup: BeautifulSoup) -> list[tuple[str, bool]]:
+        page_links = []
+        for elem in soup.find_all(['a', 'link'], href=True):
+            page_link = is_page_link(elem['href'], elem.get('rel'))
+            if page_link:
+                page_links.append(page_link)
+        return page_links
+
+    def _posts(self, soup: BeautifulSoup, profile: SelectorProfile, limit: int | None) -> list[dict]:
+        compiled = _compile_soup(profile)
+        posts = []
+        for article in compiled['article'].select(soup):
+            # Find title
+            title_elem = compiled['title'].select_one(article)
+            title = title_elem.text.strip() if title_elem else ""
+
+            # Find link: the title's own, else the first inside it, else the profile's fallback
+            link = ""
+            if title_elem is not None:
+                link_elem = title_elem if title_elem.name == 'a' else title_elem.find('a', href=True)
+                link = link_elem.get('href', '') if link_elem else ""
+            if not link:
+                link_elem = compiled['link'].select_one(article)
+                link = link_elem.get('href', '') if link_elem else ""
+
+            # Find excerpt
+            excerpt_elem = compiled['excerpt'].select_one(article) if compiled['excerpt'] else None
+            excerpt = excerpt_elem.text.strip() if excerpt_elem else ""
+
+            post = make_post(title, link, excerpt)
+            if post:
+                posts.append(post)
+                if limit is not None and len(posts) >= limit:
+                    break
+        return posts
+
+
+def _has_class_xpath(cls: str) -> str:
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {cls} ')"
+
+
+def _selector_xpath(selectors: tuple[SimpleSelector, ...], axis: str) -> str:
+    """XPath union matching any of the simple selectors along ``axis``."""
+    alternatives = []
+    for selector in selectors:
+        conditions = ' and '.join(_has_class_xpath(cls) for cls in selector.classes)
+        alternatives.append(f"{axis}{selector.tag or '*'}" + (f"[{conditions}]" if conditions else ''))
+    return '|'.join(alternatives)
+
+
+@lru_cache(maxsize=None)
+def _compile_xpath(profile: SelectorProfile) -> dict[str, Any]:
+    from lxml import etree
+
+    selectors = profile.selectors
+    return {
+        'article': etree.XPath(_selector_xpath(selectors['article'], '//')),
+        'title': etree.XPath(_selector_xpath(selectors['title'], './/')),
+        'excerpt': etree.XPath(_selector_xpath(selectors['excerpt'], './/')) if selectors['excerpt'] else None,
+        'link': etree.XPath(_selector_xpath(selectors['link'], './/')),
+    }
+
+
+class LxmlBackend(ParserBackend):
+    """lxml backend using precompiled XPath expressions."""
+
+    name = 'lxml'
+
+    @classmethod
+    def available(cls) -> bool:
+        try:
+            import lxml.html  # noqa: F401
+            return True
+        except ImportError:
+            return False
+
+    def __init__(self):
+        from lxml import etree
+
+        self._link = etree.XPath(".//a[@href]")
+        self._page_link_elems = etree.XPath("//a[@href]|//link[@href]")
+        self._generator_contents = etree.XPath(
+            "//meta[translate(@name, 'GENRATO', 'genrato') = 'generator']/@content"
+        )
+
+    def _parse(self, content: bytes, profiles: list[SelectorProfile]) -> Any:
+        from lxml import html as lxml_html
+
+        return lxml_html.document_fromstring(content)
+
+    def _generators(self, tree: Any) -> list[str]:
+        return [str(content) for content in self._generator_contents(tree)]
+
+    def _page_links(self, tree: Any) -> list[tuple[str, bool]]:
+        page_links = []
+        for elem in self._page_link_elems(tree):
+            page_link = is_page_link(elem.get('href'), elem.get('rel'))
+            if page_link:
+                page_links.append(page_link)
+        return page_links
+
+    def _posts(self, tree: Any, profile: SelectorProfile, limit: int | None) -> list[dict]:
+        compiled = _compile_xpath(profile)
+        posts = []
+        for article in compiled['article'](tree):
+            titles = compiled['title'](article)
+            title = titles[0].text_content().strip() if titles else ""
+
+            link = ""
+            if titles:
+                links = [titles[0]] if titles[0].tag == 'a' else self._link(titles[0])
+                link = links[0].get('href', '') if links else ""
+            if not link:
+                links = compiled['link'](article)
+                link = links[0].get('href', '') if links else ""
+
+            excerpts = compiled['excerpt'](article) if compiled['excerpt'] is not None else []
+            excerpt = excerpts[0].text_content().strip() if excerpts else ""
+
+            post = make_post(title, link, excerpt)
+            if post:
+                posts.append(post)
+                if limit is not None and len(posts) >= limit:
+                    break
+        return posts
+
+
+@lru_cache(maxsize=None)
+def _compile_css(profile: SelectorProfile) -> dict[str, str]:
+    # Lexbor reports an element once per alternative it matches; :is() matches it once
+    return {
+        'article': f":is({profile.article})",
+        'title': f":is({profile.title})",
+        'excerpt': f":is({profile.excerpt})" if profile.excerpt else '',
+        'link': f":is({profile.link})[href]",
+    }
+
+
+class SelectolaxBackend(ParserBackend):
+    """selectolax (Lexbor) backend, the fastest option when installed."""
+
+    name = 'selectolax'
+
+    @classmethod
+    def available(cls) -> bool:
+        try:
+            import selectolax.lexbor  # noqa: F401
+            return True
+        except ImportError:
+            return False
+
+    def _parse(self, content: bytes, profiles: list[SelectorProfile]) -> Any:
+        from selectolax.lexbor import LexborHTMLParser
+
+        return LexborHTMLParser(content)
+
+    def _generators(self, tree: Any) -> list[str]:
+        return [
+            meta.attributes.get('content') or ''
+            for meta in tree.css('meta[name]')
+            if (meta.attributes.get('name') or '').lower() == 'generator'
+        ]
+
+    def _page_links(self, tree: Any) -> list[tuple[str, bool]]:
+        page_links = []
+        for elem in tree.css('a[href], link[href]'):
+            page_link = is_page_link(elem.attributes.get('href') or '', elem.attributes.get('rel'))
+            if page_link:
+                page_links.append(page_link)
+        return page_links
+
+    def _posts(self, tree: Any, profile: SelectorProfile, limit: int | None) -> list[dict]:
+        compiled = _compile_css(profile)
+        posts = []
+        for article in tree.css(compiled['article']):
+            title_elem = article.css_first(compiled['title'])
+            title = title_elem.text().strip() if title_elem else ""
+
+            link = ""
+            if title_elem is not None:
+                link_elem = title_elem if title_elem.tag == 'a' else title_elem.css_first('a[href]')
+                link = (link_elem.attributes.get('href') or '') if link_elem else ""
+            if not link:
+                link_elem = article.css_first(compiled['link'])
+                link = (link_elem.attributes.get('href') or '') if link_elem else ""
+
+            excerpt_elem = article.css_first(compiled['excerpt']) if compiled['excerpt'] else None
+            excerpt = excerpt_elem.text().strip() if excerpt_elem else ""
+
+            post = make_post(title, link, excerpt)
+            if post:
+                posts.append(post)
+                if limit is not None and len(posts) >= limit:
+                    break
+        return posts
+
+
+# Backends in order of preference
+PARSER_BACKENDS = {
+    SelectolaxBackend.name: SelectolaxBackend,
+    LxmlBackend.name: LxmlBackend,
+    SoupBackend.name: SoupBackend,
+}
+
+
+def get_parser(name: str | None = None) -> ParserBackend:
+    """
+    Return a listing parser backend.
+
+    Args:
+        name (str | None): Backend name ('selectolax', 'lxml' or 'soup'). Defaults to
+            the ``BLOG_SEO_PARSER`` environment variable, then the fastest installed one.
+
+    Returns:
+        ParserBackend: An instance of the requested backend
+    """
+    name = name or os.getenv('BLOG_SEO_PARSER')
+    if name:
+        if name not in PARSER_BACKENDS:
+            raise ValueError(f"Unknown parser backend: {name}")
+        backend = PARSER_BACKENDS[name]
+        if not backend.available():
+            raise ImportError(f"Parser backend '{name}' is not installed")
+        return backend()
+
+    for backend in PARSER_BACKENDS.values():
+        if backend.available():
+            return backend()
+    return SoupBackend()
+
+
+class _ArticleMatch:
+    """Title, link and excerpt collected for one profile inside a streamed article element."""
+
+    def __init__(self, profile: SelectorProfile):
+        self.profile = profile
+        self.selectors = profile.selectors
+        self.title_tag = None
+        self.title_depth = 0
+        self.title = []
+        self.link = None
+        self.fallback_link = None
+        self.excerpt_tag = None
+        self.excerpt_depth = 0
+        self.excerpt = []
+
+    def start(self, tag: str, classes: list[str], attrs: dict) -> None:
+        if self.title_tag:
+            if tag == self.title_tag:
+                self.title_depth += 1
+            elif tag == 'a' and self.link is None:
+                self.link = attrs.get('href') or ''
+        elif not self.title and any(selector.matches(tag, classes) for selector in self.selectors['title']):
+            self.title_tag = tag
+            self.title_depth = 1
+            if tag == 'a':
+                self.link = attrs.get('href') or ''
+
+        if (tag == 'a' and self.fallback_link is None and attrs.get('href')
+                and any(selector.matches(tag, classes) for selector in self.selectors['link'])):
+            self.fallback_link = attrs['href']
+
+        if self.excerpt_tag:
+            if tag == self.excerpt_tag:
+                self.excerpt_depth += 1
+        elif not self.excerpt and any(selector.matches(tag, classes) for selector in self.selectors['excerpt']):
+            self.excerpt_tag = tag
+            self.excerpt_depth = 1
+
+    def end(self, tag: str) -> None:
+        if self.title_tag and tag == self.title_tag:
+            self.title_depth -= 1
+            if not self.title_depth:
+                self.title_tag = None
+        if self.excerpt_tag and tag == self.excerpt_tag:
+            self.excerpt_depth -= 1
+            if not self.excerpt_depth:
+                self.excerpt_tag = None
+
+    def data(self, data: str) -> None:
+        if self.title_tag:
+            self.title.append(data)
+        if self.excerpt_tag:
+            self.excerpt.append(data)
+
+    def post(self) -> dict | None:
+        return make_post(''.join(self.title).strip(), self.link or self.fallback_link or '', ''.join(self.excerpt).strip())
+
+
+class StreamingListingParser(HTMLParser):
+    """
+    Incremental listing parser fed with chunks of a streamed response.
+
+    Posts are emitted as soon as their article element closes, and ``done`` is set
+    once ``limit`` posts have been collected so the caller can stop downloading.
+
+    Without a tree to probe, the profile is chosen element by element: an article
+    element is read with every candidate profile whose article selector it matches,
+    and the most preferred one (generator-hinted profiles first) that yields a post
+    fixes the profile. A post found later with a more preferred profile replaces the
+    posts found so far, so a sidebar ``<article>`` matched by the generic profile
+    doesn't hide the real listing.
+    """
+
+    def __init__(self, limit: int | None = None, profiles: Iterable[SelectorProfile] | None = None):
+        super().__init__()
+        self.limit = limit
+        self.listing = Listing()
+        self.done = False
+        self._candidates = list(get_profile_registry() if profiles is None else profiles)
+        self.profiles = self._candidates
+        self._generators = []
+        self._index_articles()
+        self._article_tag = None
+        self._article_depth = 0
+        self._matches: list[_ArticleMatch] = []
+
+    def _index_articles(self) -> None:
+        """
+        Index the article selectors of the profiles an article may still be matched
+        with (the chosen one and those preferred to it) by tag, so most start tags
+        are dismissed with one dict lookup.
+        """
+        profiles = self.profiles
+        if self.listing.profile:
+            names = [profile.name for profile in profiles]
+            profiles = profiles[:names.index(self.listing.profile) + 1]
+        self._article_index = {}
+        for rank, profile in enumerate(profiles):
+            for selector in profile.selectors['article']:
+                self._article_index.setdefault(selector.tag, []).append((rank, profile, selector))
+
+    def _match_article(self, tag: str, classes: list[str]) -> list[SelectorProfile]:
+        """Profiles whose article selector matches the element, most preferred first."""
+        ranks = {}
+        for rank, profile, selector in self._article_index.get(tag, []) + self._article_index.get(None, []):
+            if selector.matches(tag, classes):
+                ranks.setdefault(profile.name, (rank, profile))
+        return [profile for _, profile in sorted(ranks.values(), key=lambda match: match[0])]
+
+    def handle_starttag(self, tag: str, attrs: list) -> None:
+        attrs = dict(attrs)
+        classes = (attrs.get('class') or '').split()
+
+        if tag in ('a', 'link') and attrs.get('href'):
+            page_link = is_page_link(attrs['href'], attrs.get('rel'))
+            if page_link:
+                self.listing.page_links.append(page_link)
+
+        if tag == 'meta' and (attrs.get('name') or '').lower() == 'generator' and not self.listing.profile:
+            self._generators.append(attrs.get('content') or '')
+            # Reorder from the original order, as the tree backends do with every generator tag at once
+            self.profiles = order_by_generator(self._candidates, self._generators)
+            self._index_articles()
+            return
+
+        if self._article_depth:
+            if tag == self._article_tag:
+                self._article_depth += 1
+            for match in self._matches:
+                match.start(tag, classes, attrs)
+        else:
+            profiles = self._match_article(tag, classes)
+            if profiles:
+                self._matches = [_ArticleMatch(profile) for profile in profiles]
+                self._article_tag = tag
+                self._article_depth = 1
+
+    def handle_endtag(self, tag: str) -> None:
+        if not self._article_depth:
+            return
+
+        for match in self._matches:
+            match.end(tag)
+
+        if tag == self._article_tag:
+            self._article_depth -= 1
+            if not self._article_depth:
+                self._finish_article()
+
+    def handle_data(self, data: str) -> None:
+        for match in self._matches:
+            match.data(data)
+
+    def _finish_article(self) -> None:
+        matches, self._matches = self._matches, []
+        if self.done:
+            return
+        for match in matches:
+            post = match.post()
+            if post:
+                break
+        else:
+            return
+        if self.listing.profile != match.profile.name:
+            self.listing.profile = match.profile.name
+            self.listing.posts = []
+            self._index_articles()
+        self.listing.posts.append(post)
+        if self.limit is not None and len(self.listing.posts) >= self.limit:
+            self.done = True
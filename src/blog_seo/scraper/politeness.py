@@ -0,0 +1,263 @@
+"""
+Per-host politeness for scraper requests.
+
+Every request goes through a ``PolitenessScheduler``, which keeps state per host:
+
+- robots.txt is fetched once per host; disallowed URLs are refused and a
+  ``Crawl-delay`` (or ``Request-rate``) spaces out request starts.
+- Concurrency adapts AIMD-style: the per-host limit grows by about one request
+  per round trip while responses are fast, and halves on 429 and 5xx responses,
+  timeouts or slow responses.
+- 429/503 responses pause the whole host for their ``Retry-After`` (or an
+  exponential backoff), then the request is retried; connection errors,
+  timeouts and other 5xx responses are retried with backoff.
+- Every request has a (connect, read) timeout, so a hung server can't block
+  the caller indefinitely.
+"""
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from typing import Iterator
+from urllib.parse import urlparse
+from urllib.robotparser import RobotFileParser
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = (5.0, 30.0)
+# Responses telling us to slow down: they pause the host and shrink its limit
+THROTTLE_STATUSES = {429, 503}
+# Retried responses; all of them shrink the host's limit like a throttle
+RETRY_STATUSES = THROTTLE_STATUSES | {500, 502, 504}
+
+
+class RobotsDisallowed(requests.RequestException):
+    """The host's robots.txt disallows fetching the URL."""
+
+
+def retry_after(response: requests.Response) -> float | None:
+    """Seconds to wait according to a ``Retry-After`` header, if it has a usable value."""
+    value = response.headers.get('Retry-After', '').strip()
+    if not value:
+        return None
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass
+class HostState:
+    """Scheduling state for one scheme and host."""
+    limit: float
+    in_flight: int = 0
+    # Earliest monotonic time the next request may start (crawl delay, Retry-After)
+    next_start: float = 0.0
+    interval: float = 0.0
+    last_backoff: float = 0.0
+    robots: RobotFileParser | None = None
+    robots_checked: bool = False
+    cond: threading.Condition = field(default_factory=threading.Condition)
+    robots_lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+class PolitenessScheduler:
+    """
+    Shared per-host request scheduler with adaptive concurrency.
+
+    Args:
+        initial_per_host (int): Concurrent requests allowed per host at first
+        max_per_host (int): Upper bound the per-host limit can grow to
+        min_per_host (int): Lower bound the limit backs off to
+        timeout (tuple[float, float]): (connect, read) timeout in seconds
+        retries (int): Retries after a failed attempt
+        backoff (float): Base delay in seconds for exponential retry backoff
+        slow_after (float): Response time in seconds treated as a sign of overload
+        max_retry_after (float): Longest Retry-After honoured; longer waits fail instead
+        max_crawl_delay (float): Cap on a robots.txt crawl delay
+        respect_robots (bool): Whether to fetch and obey robots.txt
+    """
+
+    def __init__(self, initial_per_host: int = 4, max_per_host: int = 8, min_per_host: int = 1,
+                 timeout: tuple[float, float] = DEFAULT_TIMEOUT, retries: int = 3, backoff: float = 0.5,
+                 slow_after: float = 10.0, max_retry_after: float = 120.0, max_crawl_delay: float = 30.0,
+                 respect_robots: bool = True):
+        self.initial_per_host = initial_per_host
+        self.max_per_host = max_per_host
+        self.min_per_host = min_per_host
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.slow_after = slow_after
+        self.max_retry_after = max_retry_after
+        self.max_crawl_delay = max_crawl_delay
+        self.respect_robots = respect_robots
+        self._hosts: dict[str, HostState] = {}
+        self._hosts_lock = threading.Lock()
+
+    def _host(self, url: str) -> tuple[str, HostState]:
+        parsed = urlparse(url)
+        origin = f"{parsed.scheme}://{parsed.netloc}"
+        with self._hosts_lock:
+            if origin not in self._hosts:
+                self._hosts[origin] = HostState(limit=float(self.initial_per_host))
+            return origin, self._hosts[origin]
+
+    def limit(self, url: str) -> float:
+        """Current concurrency limit of the URL's host."""
+        return self._host(url)[1].limit
+
+    def _load_robots(self, session: requests.Session, origin: str, host: HostState, agent: str) -> None:
+        """Fetch the host's robots.txt once and apply its crawl delay."""
+        with host.robots_lock:
+            if host.robots_checked:
+                return
+            try:
+                response = session.get(f"{origin}/robots.txt", headers={'User-Agent': agent}, timeout=self.timeout)
+                if response.status_code == 200:
+                    host.robots = RobotFileParser(f"{origin}/robots.txt")
+                    host.robots.parse(response.text.splitlines())
+                # A missing robots.txt (4xx) allows everything; server errors are treated the same
+                # rather than blocking the whole blog on a flaky file
+                elif response.status_code >= 500:
+                    logger.warning("robots.txt for %s returned %d; crawling without it", origin, response.status_code)
+            except requests.RequestException as e:
+                logger.warning("Could not fetch robots.txt for %s: %s", origin, e)
+            host.robots_checked = True
+
+            if host.robots is not None:
+                delay = host.robots.crawl_delay(agent)
+                rate = host.robots.request_rate(agent)
+                if delay is None and rate is not None and rate.requests:
+                    delay = rate.seconds / rate.requests
+                if delay:
+                    if float(delay) > self.max_crawl_delay:
+                        logger.warning("Capping crawl delay of %s from %ss to %ss", origin, delay, self.max_crawl_delay)
+                    with host.cond:
+                        host.interval = min(float(delay), self.max_crawl_delay)
+
+    def allowed(self, session: requests.Session, url: str, agent: str = '*') -> bool:
+        """Whether robots.txt allows ``agent`` to fetch ``url``."""
+        if not self.respect_robots:
+            return True
+        origin, host = self._host(url)
+        self._load_robots(session, origin, host, agent)
+        return host.robots is None or host.robots.can_fetch(agent, url)
+
+    def _acquire(self, host: HostState) -> float:
+        """Wait for a free slot on the host and its next allowed start time."""
+        with host.cond:
+            while True:
+                now = time.monotonic()
+                has_slot = host.in_flight < max(int(host.limit), self.min_per_host)
+                if has_slot and now >= host.next_start:
+                    host.in_flight += 1
+                    host.next_start = now + host.interval
+                    return now
+                host.cond.wait(host.next_start - now if has_slot else None)
+
+    def _release(self, host: HostState, started: float, overloaded: bool, pause: float | None = None) -> None:
+        """Free a slot and adapt the host's limit to how the request went."""
+        now = time.monotonic()
+        with host.cond:
+            host.in_flight -= 1
+            if overloaded or now - started > self.slow_after:
+                # Halve once per round trip: requests already in flight at the last
+                # backoff report the same congestion and must not halve it again
+                if started >= host.last_backoff:
+                    host.limit = max(host.limit / 2, float(self.min_per_host))
+                    host.last_backoff = now
+            else:
+                host.limit = min(host.limit + 1 / host.limit, float(self.max_per_host))
+            if pause:
+                host.next_start = max(host.next_start, now + pause)
+            host.cond.notify_all()
+
+    def _backoff(self, attempt: int) -> float:
+        return self.backoff * 2 ** attempt * random.uniform(0.5, 1.5)
+
+    @contextmanager
+    def request(self, session: requests.Session, url: str, headers: dict | None = None,
+                stream: bool = False, event: dict | None = None) -> Iterator[requests.Response]:
+        """
+        Send a polite GET and hold the host slot while the caller uses the response.
+
+        Args:
+            session (requests.Session): Session sending the request
+            url (str): URL to fetch
+            headers (dict | None): Request headers; the User-Agent is also matched against robots.txt
+            stream (bool): Leave the body unread so it can be consumed in chunks
+            event (dict | None): Telemetry event receiving the number of retries
+
+        Raises:
+            RobotsDisallowed: If robots.txt disallows the URL
+            requests.RequestException: If the last attempt failed to connect or timed out
+
+        The last response is yielded even when it is an error; check its status.
+        """
+        agent = (headers or {}).get('User-Agent', '*')
+        if not self.allowed(session, url, agent):
+            raise RobotsDisallowed(f"robots.txt disallows {url}")
+        _, host = self._host(url)
+
+        for attempt in range(self.retries + 1):
+            if event is not None and attempt:
+                event['retries'] = attempt
+            last = attempt == self.retries
+            started = self._acquire(host)
+            try:
+                response = session.get(url, headers=headers, timeout=self.timeout, stream=stream)
+            except (requests.ConnectionError, requests.Timeout):
+                self._release(host, started, overloaded=True)
+                if last:
+                    raise
+                time.sleep(self._backoff(attempt))
+                continue
+
+            status = response.status_code
+            if status in RETRY_STATUSES and not last:
+                wait = retry_after(response) if status in THROTTLE_STATUSES else None
+                if wait is None or wait <= self.max_retry_after:
+                    response.close()
+                    if status in THROTTLE_STATUSES:
+                        # Pause every request to the host, not just this one
+                        self._release(host, started, overloaded=True,
+                                      pause=wait if wait is not None else self._backoff(attempt))
+                    else:
+                        self._release(host, started, overloaded=True)
+                        time.sleep(self._backoff(attempt))
+                    continue
+
+            try:
+                yield response
+            finally:
+                response.close()
+                self._release(host, started, overloaded=status in RETRY_STATUSES)
+            return
+
+    def get(self, session: requests.Session, url: str, headers: dict | None = None,
+            event: dict | None = None) -> requests.Response:
+        """Polite GET returning the response with its body read."""
+        with self.request(session, url, headers, event=event) as response:
+            response.content
+            return response
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> PolitenessScheduler:
+    """Return the process-wide scheduler, so host limits are shared by every scraper."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = PolitenessScheduler()
+        return _scheduler
@@ -0,0 +1,240 @@
+"""
+Persistent store of scraped posts, for incremental recrawls.
+
+Posts are keyed by URL together with a hash of their listing fields and the way they
+were discovered (feed, listing or sitemap). Re-scraping a blog then only inserts new
+posts and flags changed ones, while unchanged posts keep the article body and
+analysis results gathered on earlier runs.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Iterable, Mapping
+
+from .http_cache import DEFAULT_CACHE_DIR
+
+# Results produced by the analyzer, kept across recrawls while a post is unchanged;
+# keywords_source tells LLM keywords ('llm') from the local fallback ('local')
+ANALYSIS_FIELDS = ('keywords', 'summary', 'headlines_and_keypoints', 'generated_article', 'keywords_source')
+
+
+def content_hash(post: Mapping) -> str:
+    """
+    Hash the listing fields that indicate whether a post was edited.
+
+    The fields differ between a feed entry, a listing excerpt and a sitemap entry of
+    the same post, so hashes are only comparable between posts of the same ``source``.
+    """
+    digest = hashlib.sha256()
+    for field in ('title', 'excerpt', 'updated'):
+        digest.update((post.get(field) or '').encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+class PostStore:
+    """
+    SQLite-backed store of posts keyed by URL.
+
+    Each post is stored as JSON so any field added to a post survives a round trip.
+    A transient ``status`` of ``new``, ``changed`` or ``unchanged`` is set on the
+    posts returned by ``sync`` but never persisted.
+    """
+
+    def __init__(self, path: str | None = None):
+        if path is None:
+            cache_dir = os.getenv('BLOG_SEO_CACHE_DIR', DEFAULT_CACHE_DIR)
+            os.makedirs(cache_dir, exist_ok=True)
+            path = os.path.join(cache_dir, 'posts.sqlite3')
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS posts (
+                link TEXT PRIMARY KEY,
+                blog_url TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                data TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                first_seen REAL NOT NULL,
+                last_seen REAL NOT NULL,
+                source TEXT NOT NULL DEFAULT ''
+            )
+            """
+        )
+        columns = [row[1] for row in self._conn.execute('PRAGMA table_info(posts)')]
+        if 'source' not in columns:
+            # Stores created before the discovery source was recorded with the hash
+            self._conn.execute("ALTER TABLE posts ADD COLUMN source TEXT NOT NULL DEFAULT ''")
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_posts_blog ON posts (blog_url, position)')
+        self._conn.commit()
+
+    @staticmethod
+    def _dump(post: Mapping) -> str:
+        return json.dumps({key: value for key, value in post.items() if key != 'status'}, ensure_ascii=False)
+
+    def sync(self, blog_url: str, posts: list[dict]) -> list[dict]:
+        """
+        Merge freshly scraped posts into the store.
+
+        Args:
+            blog_url (str): Listing URL the posts were scraped from
+            posts (list[dict]): Posts in listing order
+
+        Returns:
+            list[dict]: The posts to work with, in the same order. Unchanged posts are
+            the stored copies, with their content and analysis; new and changed posts
+            are the fresh ones. Every post gets its ``status``. A post only counts as
+            changed when it was discovered the same way (its ``source``) as before.
+        """
+        now = time.time()
+        merged = []
+        with self._lock:
+            stored = {}
+            links = [post['link'] for post in posts]
+            for start in range(0, len(links), 500):
+                chunk = links[start:start + 500]
+                rows = self._conn.execute(
+                    f"SELECT link, content_hash, source, data FROM posts WHERE link IN ({','.join('?' * len(chunk))})",
+                    chunk
+                ).fetchall()
+                stored.update({link: (digest, source, data) for link, digest, source, data in rows})
+
+            for position, post in enumerate(posts):
+                post['blog_url'] = blog_url
+                digest = content_hash(post)
+                source = post.get('source') or ''
+                previous = stored.get(post['link'])
+                if previous is None:
+                    post['status'] = 'new'
+                elif previous[0] == digest or previous[1] != source:
+                    # A post found another way, e.g. in the listing after a failed feed
+                    # fetch, has other listing fields; that is no sign of an edit
+                    post = json.loads(previous[2])
+                    post['blog_url'] = blog_url
+                    if source:
+                        post['source'] = source
+                    post['status'] = 'unchanged'
+                else:
+                    # Analysis of the old version no longer applies
+                    for field in ANALYSIS_FIELDS:
+                        post[field] = ''
+                    post['analyzed'] = False
+                    post['status'] = 'changed'
+                merged.append(post)
+                self._conn.execute(
+                    """
+                    INSERT INTO posts VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (link) DO UPDATE SET
+                        blog_url = excluded.blog_url, content_hash = excluded.content_hash,
+                        data = excluded.data, position = excluded.position, last_seen = excluded.last_seen,
+                        source = excluded.source
+                    """,
+                    (post['link'], blog_url, digest, self._dump(post), position, now, now, source)
+                )
+            self._conn.commit()
+        return merged
+
+    def upsert(self, posts: Iterable[Mapping]) -> int:
+        """
+        Store posts as they are, replacing any stored copy, e.g. posts imported from a file.
+
+        Unlike ``sync`` the given posts win: their content and analysis overwrite what
+        the store holds. Posts without a link are skipped.
+
+        Returns:
+            int: Number of posts stored
+        """
+        now = time.time()
+        rows = [
+            (post['link'], post.get('blog_url') or '', content_hash(post), self._dump(post), position, now, now,
+             post.get('source') or '')
+            for position, post in enumerate(posts) if post.get('link')
+        ]
+        with self._lock:
+            self._conn.executemany(
+                """
+                INSERT INTO posts VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (link) DO UPDATE SET
+                    blog_url = excluded.blog_url, content_hash = excluded.content_hash,
+                    data = excluded.data, position = excluded.position, last_seen = excluded.last_seen,
+                    source = excluded.source
+                """,
+                rows
+            )
+            self._conn.commit()
+        return len(rows)
+
+    def save(self, posts: list[dict]) -> None:
+        """Persist the current state of posts already in the store, such as new analysis."""
+        with self._lock:
+            self._conn.executemany(
+                'UPDATE posts SET data = ? WHERE link = ?',
+                [(self._dump(post), post['link']) for post in posts if post.get('link')]
+            )
+            self._conn.commit()
+
+    def update(self, link: str, fields: dict) -> dict | None:
+        """
+        Merge ``fields`` into a stored post in one step, so concurrent writers of
+        different fields do not overwrite each other.
+
+        Returns:
+            dict | None: The updated post, or None if ``link`` is not in the store
+        """
+        with self._lock:
+            row = self._conn.execute('SELECT data FROM posts WHERE link = ?', (link,)).fetchone()
+            if row is None:
+                return None
+            post = json.loads(row[0])
+            post.update(fields)
+            self._conn.execute('UPDATE posts SET data = ? WHERE link = ?', (self._dump(post), link))
+            self._conn.commit()
+        return post
+
+    def get(self, link: str) -> dict | None:
+        """Return the stored post for ``link``, or None."""
+        with self._lock:
+            row = self._conn.execute('SELECT data FROM posts WHERE link = ?', (link,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def get_posts(self, blog_url: str) -> list[dict]:
+        """Return the posts last seen on ``blog_url``, in listing order."""
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT data FROM posts WHERE blog_url = ? ORDER BY last_seen DESC, position',
+                (blog_url,)
+            ).fetchall()
+        return [json.loads(data) for data, in rows]
+
+    def count(self, blog_url: str) -> int:
+        """Number of posts stored for ``blog_url``, without loading them."""
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM posts WHERE blog_url = ?', (blog_url,)).fetchone()[0]
+
+    def clear(self, blog_url: str | None = None) -> None:
+        """Forget the posts of one blog, or of every blog."""
+        with self._lock:
+            if blog_url is None:
+                self._conn.execute('DELETE FROM posts')
+            else:
+                self._conn.execute('DELETE FROM posts WHERE blog_url = ?', (blog_url,))
+            self._conn.commit()
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_post_store() -> PostStore:
+    """Return the process-wide post store, creating it on first use."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = PostStore()
+        return _store
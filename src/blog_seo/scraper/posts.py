@@ -0,0 +1,132 @@
+"""
+Compact in-memory representation of scraped posts.
+
+The scraper, store and analyzer pass posts around as mappings. ``BlogPost`` keeps
+that mapping interface (``post['title']``, ``post.get``, ``post.update``, ``in``) on
+a ``__slots__`` dataclass, so a large corpus held in a Streamlit session doesn't pay
+for a dict of repeated keys per post. Article bodies are kept zlib-compressed and
+only inflated when read.
+"""
+import sys
+import zlib
+from collections.abc import Iterable, Iterator, Mapping, MutableMapping
+from dataclasses import dataclass, field, fields
+from typing import Any
+
+# Bodies shorter than this stay plain strings; compressing them saves too little
+COMPRESS_MIN_CHARS = 512
+
+
+@dataclass(slots=True, eq=False)
+class BlogPost(MutableMapping):
+    """
+    A scraped post with its article body and analysis.
+
+    Keys map to the fields below. Optional fields set to None are absent from the
+    mapping, as they would be from a post dict; keys without a field of their own
+    are kept in a small side dict.
+    """
+    title: str
+    link: str
+    excerpt: str = ''
+    keywords: str = ''
+    summary: str = ''
+    analyzed: bool = False
+    headlines_and_keypoints: str | None = None
+    generated_article: str | None = None
+    local_keywords: str | None = None
+    headings: list[dict] | None = None
+    content_error: str | None = None
+    blog_url: str | None = None
+    updated: str | None = None
+    # How the post was discovered: 'feed', 'listing' or 'sitemap'
+    source: str | None = None
+    status: str | None = None
+    duplicate_of: str | None = None
+    # Article body, zlib-compressed once it is long enough to be worth it
+    _content: str | bytes | None = field(default=None, repr=False)
+    _extra: dict[str, Any] | None = field(default=None, repr=False)
+
+    @property
+    def content(self) -> str | None:
+        if isinstance(self._content, bytes):
+            return zlib.decompress(self._content).decode('utf-8')
+        return self._content
+
+    @content.setter
+    def content(self, value: str | None) -> None:
+        if value is not None and len(value) >= COMPRESS_MIN_CHARS:
+            value = zlib.compress(value.encode('utf-8'), 1)
+        self._content = value
+
+    def __getitem__(self, key: str) -> Any:
+        if key in POST_KEYS:
+            value = getattr(self, key)
+            if value is not None:
+                return value
+        elif self._extra and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key in POST_KEYS:
+            if key in SHARED_VALUE_KEYS and isinstance(value, str):
+                # The same few blog URLs, sources and statuses repeat across every post
+                value = sys.intern(value)
+            setattr(self, key, value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        if key in POST_KEYS and getattr(self, key) is not None:
+            setattr(self, key, None)
+        elif self._extra and key in self._extra:
+            del self._extra[key]
+        else:
+            raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        for key in POST_KEYS:
+            if getattr(self, key) is not None:
+                yield key
+        if self._extra:
+            yield from self._extra
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f"BlogPost(title={self.title!r}, link={self.link!r})"
+
+    def to_dict(self) -> dict:
+        """The post as a plain dict, e.g. for JSON."""
+        return dict(self.items())
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> 'BlogPost':
+        """Build a post from a post dict, keeping keys without a field of their own."""
+        post = cls(title=data.get('title') or '', link=data.get('link') or '')
+        post.update(data)
+        return post
+
+
+# Mapping keys backed by a field, in the order posts are displayed and exported
+POST_KEYS = tuple(f.name for f in fields(BlogPost) if not f.name.startswith('_')) + ('content',)
+SHARED_VALUE_KEYS = frozenset({'blog_url', 'source', 'status'})
+
+
+def post_text(post: Mapping[str, Any]) -> str:
+    """
+    Text of a post as compared for near-duplicates and scored for local keywords.
+
+    The title ends in a full stop so keyword extraction never joins it with the first
+    sentence of the body, which is the full article when fetched, else the excerpt.
+    """
+    return f"{post.get('title', '')}. {post.get('content') or post.get('excerpt', '')}"
+
+
+def compact_posts(posts: Iterable[Mapping[str, Any]]) -> list[BlogPost]:
+    """Convert post dicts to ``BlogPost``, leaving posts that already are one untouched."""
+    return [post if isinstance(post, BlogPost) else BlogPost.from_dict(post) for post in posts]
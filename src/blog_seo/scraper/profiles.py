@@ -0,0 +1,247 @@
+"""
+Selector profiles describing how blog listings are marked up on common platforms.
+
+A profile names the element wrapping each post on a listing page and, within it,
+the post title, excerpt and link. Built-in profiles cover Elementor, WordPress
+themes, Ghost, Squarespace and Webflow, plus a generic fallback; more can be loaded
+from JSON files listed in ``BLOG_SEO_PROFILES``.
+
+Selectors are deliberately simple so every parser backend, including the streaming
+one, can match them natively: comma-separated alternatives of a tag name and/or
+classes, e.g. ``"article.post, div.post-card"``.
+
+The profile for a listing is detected while it is parsed: profiles whose generator
+hints match the page's ``<meta name="generator">`` are tried first, then the rest in
+registry order, and the first that yields posts wins. The winner is remembered per
+host and tried first on later pages.
+"""
+import json
+import os
+import re
+import threading
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Iterable, Iterator
+
+SIMPLE_SELECTOR_RE = re.compile(r'^([a-zA-Z][a-zA-Z0-9-]*)?((?:\.[\w-]+)*)$')
+
+
+@dataclass(frozen=True)
+class SimpleSelector:
+    """A tag name and/or set of classes an element must carry."""
+    tag: str | None
+    classes: tuple[str, ...]
+
+    def matches(self, tag: str, classes: set[str] | list[str]) -> bool:
+        return (self.tag is None or self.tag == tag) and all(cls in classes for cls in self.classes)
+
+
+def parse_selector(selector: str) -> tuple[SimpleSelector, ...]:
+    """
+    Parse a comma-separated list of simple selectors.
+
+    Raises:
+        ValueError: If an alternative uses anything beyond a tag name and classes
+    """
+    alternatives = []
+    for part in selector.split(','):
+        match = SIMPLE_SELECTOR_RE.match(part.strip())
+        if not part.strip() or not match:
+            raise ValueError(f"Unsupported selector {part.strip()!r}: use a tag name and/or .classes")
+        tag, classes = match.groups()
+        alternatives.append(SimpleSelector(tag.lower() if tag else None, tuple(filter(None, classes.split('.')))))
+    return tuple(alternatives)
+
+
+@dataclass(frozen=True)
+class SelectorProfile:
+    """
+    Where the posts of a listing page are found.
+
+    Args:
+        name (str): Profile name
+        article (str): Element wrapping each post
+        title (str): Post title within the article; its link, or the first link
+            inside it, is the post link
+        excerpt (str): Post excerpt within the article; empty when listings have none
+        link (str): Fallback for the post link when the title holds no link
+        generators (tuple[str, ...]): Case-insensitive fragments of the generator meta
+            tag that suggest this profile
+    """
+    name: str
+    article: str
+    title: str
+    excerpt: str = ''
+    link: str = 'a'
+    generators: tuple[str, ...] = ()
+
+    def __post_init__(self):
+        # Fail on load rather than on the first page parsed
+        self.selectors
+
+    @cached_property
+    def selectors(self) -> dict[str, tuple[SimpleSelector, ...]]:
+        """Parsed selectors by role; an empty excerpt parses to no alternatives."""
+        return {
+            'article': parse_selector(self.article),
+            'title': parse_selector(self.title),
+            'excerpt': parse_selector(self.excerpt) if self.excerpt else (),
+            'link': parse_selector(self.link),
+        }
+
+    def matches_generator(self, generators: Iterable[str]) -> bool:
+        return any(hint in generator.lower() for generator in generators for hint in self.generators)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'SelectorProfile':
+        """Build a profile from its JSON form."""
+        generators = data.get('generators', ())
+        if isinstance(generators, str):
+            generators = (generators,)
+        return cls(
+            name=data['name'],
+            article=data['article'],
+            title=data['title'],
+            excerpt=data.get('excerpt', ''),
+            link=data.get('link', 'a'),
+            generators=tuple(hint.lower() for hint in generators),
+        )
+
+
+# Most specific first: generic profiles would also match the markup of specific ones
+BUILTIN_PROFILES = (
+    SelectorProfile(
+        name='elementor',
+        article='article.elementor-post',
+        title='h2.elementor-post__title, h3.elementor-post__title',
+        excerpt='div.elementor-post__excerpt',
+        generators=('elementor',),
+    ),
+    SelectorProfile(
+        name='ghost',
+        article='article.post-card, article.gh-card',
+        title='.post-card-title, .gh-card-title',
+        excerpt='.post-card-excerpt, .gh-card-excerpt',
+        link='a.post-card-content-link, a.gh-card-link',
+        generators=('ghost',),
+    ),
+    SelectorProfile(
+        name='squarespace',
+        article='article.blog-item, article.BlogList-item, div.summary-item',
+        title='.blog-title, .BlogList-item-title, .summary-title',
+        excerpt='.blog-excerpt, .BlogList-item-excerpt, .summary-excerpt',
+        generators=('squarespace',),
+    ),
+    SelectorProfile(
+        name='webflow',
+        article='div.w-dyn-item',
+        title='h1, h2, h3, h4',
+        excerpt='p',
+        generators=('webflow',),
+    ),
+    SelectorProfile(
+        name='wordpress',
+        article='article.post, article.type-post',
+        title='.entry-title, .post-title',
+        excerpt='.entry-summary, .entry-content, .post-excerpt',
+        generators=('wordpress',),
+    ),
+    SelectorProfile(
+        name='generic',
+        article='article',
+        title='h2, h3, h1',
+        excerpt='p',
+    ),
+)
+
+
+def order_by_generator(profiles: Iterable[SelectorProfile], generators: Iterable[str]) -> list[SelectorProfile]:
+    """Move profiles hinted at by the page's generator tags to the front, keeping their order."""
+    generators = list(generators)
+    return sorted(profiles, key=lambda profile: not profile.matches_generator(generators))
+
+
+class ProfileRegistry:
+    """
+    Ordered set of selector profiles, with the profile detected for each host.
+
+    Registered profiles take precedence over the built-in ones and replace any
+    profile of the same name.
+    """
+
+    def __init__(self, profiles: Iterable[SelectorProfile] = BUILTIN_PROFILES):
+        self._profiles = list(profiles)
+        self._detected: dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def __iter__(self) -> Iterator[SelectorProfile]:
+        with self._lock:
+            return iter(list(self._profiles))
+
+    def names(self) -> list[str]:
+        return [profile.name for profile in self]
+
+    def get(self, name: str) -> SelectorProfile:
+        for profile in self:
+            if profile.name == name:
+                return profile
+        raise ValueError(f"Unknown selector profile: {name} (available: {', '.join(self.names())})")
+
+    def register(self, profile: SelectorProfile) -> None:
+        with self._lock:
+            self._profiles = [profile] + [p for p in self._profiles if p.name != profile.name]
+
+    def load(self, path: str) -> list[SelectorProfile]:
+        """
+        Register the profiles in a JSON file.
+
+        The file holds a list of profile objects, or an object mapping profile names
+        to profile objects. Keys match the ``SelectorProfile`` fields.
+        """
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            data = [{'name': name, **profile} for name, profile in data.items()]
+        profiles = [SelectorProfile.from_dict(item) for item in data]
+        # Register in reverse so the file's first profile ends up first
+        for profile in reversed(profiles):
+            self.register(profile)
+        return profiles
+
+    def candidates(self, host: str | None = None) -> list[SelectorProfile]:
+        """Profiles to try on a page from ``host``, the one detected there before first."""
+        profiles = list(self)
+        with self._lock:
+            detected = self._detected.get(host)
+        if detected:
+            profiles.sort(key=lambda profile: profile.name != detected)
+        return profiles
+
+    def detected(self, host: str) -> str | None:
+        with self._lock:
+            return self._detected.get(host)
+
+    def remember(self, host: str, name: str) -> None:
+        with self._lock:
+            self._detected[host] = name
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_profile_registry() -> ProfileRegistry:
+    """
+    Return the process-wide profile registry, creating it on first use.
+
+    JSON profile files named in ``BLOG_SEO_PROFILES`` (separated by ``os.pathsep``)
+    are loaded on creation.
+    """
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            registry = ProfileRegistry()
+            for path in filter(None, os.getenv('BLOG_SEO_PROFILES', '').split(os.pathsep)):
+                registry.load(path)
+            _registry = registry
+        return _registry
@@ -0,0 +1,207 @@
+"""
+Per-stage instrumentation for scraping and analysis.
+
+Every instrumented stage (fetching, parsing, each analysis task and each LLM call)
+records a structured event with its wall time and whatever it measured: bytes
+fetched, prompt and completion tokens, estimated cost and cache hits. Events are
+aggregated into Prometheus-style counters and histograms and can be appended to a
+JSONL file as they happen.
+"""
+import bisect
+import contextvars
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator
+
+# Histogram bucket upper bounds for stage durations, in seconds
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+# USD per million prompt and completion tokens
+MODEL_PRICING = {
+    'claude-3-5-sonnet-20241022': (3.0, 15.0),
+    'claude-3-5-haiku-20241022': (0.8, 4.0),
+}
+
+# Fields summed per stage; everything else on an event is only kept in the event log
+COUNTED_FIELDS = ('bytes', 'retries', 'prompt_tokens', 'completion_tokens', 'cost')
+
+_current_stage = contextvars.ContextVar('telemetry_stage', default=None)
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (about four characters per token for English prose)."""
+    return len(text) // 4 + 1
+
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    """Estimated USD cost of an LLM call, or 0 for models without known pricing."""
+    prompt_price, completion_price = MODEL_PRICING.get(model, (0.0, 0.0))
+    return (prompt_tokens * prompt_price + completion_tokens * completion_price) / 1_000_000
+
+
+class JsonlSink:
+    """Append events to a JSONL file, one line per event."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def __call__(self, event: Dict[str, Any]) -> None:
+        line = json.dumps(event, ensure_ascii=False, default=str) + '\n'
+        with self._lock, open(self.path, 'a', encoding='utf-8') as f:
+            f.write(line)
+
+
+class StageStats:
+    """Running totals and a duration histogram for one stage."""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.cache_hits = 0
+        self.duration = 0.0
+        self.buckets = [0] * (len(DURATION_BUCKETS) + 1)
+        self.totals = dict.fromkeys(COUNTED_FIELDS, 0)
+
+    def add(self, event: Dict[str, Any]) -> None:
+        self.calls += 1
+        self.errors += 'error' in event
+        self.cache_hits += bool(event.get('cache_hit'))
+        self.duration += event['duration']
+        self.buckets[bisect.bisect_left(DURATION_BUCKETS, event['duration'])] += 1
+        for field in COUNTED_FIELDS:
+            self.totals[field] += event.get(field) or 0
+
+
+class Telemetry:
+    """
+    Thread-safe collector of stage events.
+
+    Args:
+        sinks (list | None): Callables receiving every event as a dict
+        max_events (int): Recent events kept in memory for display
+    """
+
+    def __init__(self, sinks: list | None = None, max_events: int = 1000):
+        self.sinks = list(sinks or [])
+        self.events = deque(maxlen=max_events)
+        self.stages: Dict[str, StageStats] = defaultdict(StageStats)
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, stage: str, **fields) -> Iterator[Dict[str, Any]]:
+        """
+        Time a block of work as one event of ``stage``.
+
+        The yielded dict is the event itself, so the block can add what it measured
+        (``bytes``, ``prompt_tokens``, ``cache_hit``...). Spans opened inside the
+        block, including in threads started with ``asyncio.to_thread``, record this
+        stage as their ``parent``. Exceptions are recorded and re-raised.
+        """
+        event = {'stage': stage, 'parent': _current_stage.get(), **fields}
+        token = _current_stage.set(stage)
+        start = time.perf_counter()
+        try:
+            yield event
+        except BaseException as e:
+            event['error'] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            _current_stage.reset(token)
+            event['duration'] = time.perf_counter() - start
+            event['timestamp'] = time.time()
+            self.record(event)
+
+    def record(self, event: Dict[str, Any]) -> None:
+        """Aggregate a finished event and pass it to the sinks."""
+        with self._lock:
+            self.events.append(event)
+            self.stages[event['stage']].add(event)
+        for sink in self.sinks:
+            try:
+                sink(event)
+            except Exception:
+                # Telemetry must never break the work it measures
+                pass
+
+    def summary(self) -> list[Dict[str, Any]]:
+        """Per-stage totals, slowest stages first, for display."""
+        with self._lock:
+            rows = [
+                {
+                    'stage': stage,
+                    'calls': stats.calls,
+                    'errors': stats.errors,
+                    'total_s': round(stats.duration, 3),
+                    'mean_s': round(stats.duration / stats.calls, 3),
+                    'cache_hits': stats.cache_hits,
+                    'bytes': stats.totals['bytes'],
+                    'retries': stats.totals['retries'],
+                    'prompt_tokens': stats.totals['prompt_tokens'],
+                    'completion_tokens': stats.totals['completion_tokens'],
+                    'cost_usd': round(stats.totals['cost'], 4),
+                }
+                for stage, stats in self.stages.items()
+            ]
+        return sorted(rows, key=lambda row: row['total_s'], reverse=True)
+
+    def prometheus(self, prefix: str = 'blog_seo') -> str:
+        """Render the aggregates in the Prometheus text exposition format."""
+        counters = {
+            'stage_calls_total': ('Instrumented stage executions', lambda s: s.calls),
+            'stage_errors_total': ('Stage executions that raised', lambda s: s.errors),
+            'cache_hits_total': ('Stage executions served from a cache', lambda s: s.cache_hits),
+            'fetched_bytes_total': ('Bytes fetched over HTTP', lambda s: s.totals['bytes']),
+            'http_retries_total': ('HTTP requests retried after errors or throttling', lambda s: s.totals['retries']),
+            'prompt_tokens_total': ('LLM prompt tokens', lambda s: s.totals['prompt_tokens']),
+            'completion_tokens_total': ('LLM completion tokens', lambda s: s.totals['completion_tokens']),
+            'cost_usd_total': ('Estimated LLM cost in USD', lambda s: s.totals['cost']),
+        }
+        lines = []
+        with self._lock:
+            stages = sorted(self.stages.items())
+            for name, (help_text, value) in counters.items():
+                lines.append(f"# HELP {prefix}_{name} {help_text}")
+                lines.append(f"# TYPE {prefix}_{name} counter")
+                lines.extend(f'{prefix}_{name}{{stage="{stage}"}} {value(stats)}' for stage, stats in stages)
+
+            name = f"{prefix}_stage_duration_seconds"
+            lines.append(f"# HELP {name} Wall time of instrumented stages")
+            lines.append(f"# TYPE {name} histogram")
+            for stage, stats in stages:
+                cumulative = 0
+                for bound, count in zip((*DURATION_BUCKETS, '+Inf'), stats.buckets):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+                lines.append(f'{name}_sum{{stage="{stage}"}} {stats.duration}')
+                lines.append(f'{name}_count{{stage="{stage}"}} {stats.calls}')
+        return '\n'.join(lines) + '\n'
+
+    def reset(self) -> None:
+        """Forget all recorded events and aggregates."""
+        with self._lock:
+            self.events.clear()
+            self.stages.clear()
+
+
+_telemetry = None
+_telemetry_lock = threading.Lock()
+
+
+def get_telemetry() -> Telemetry:
+    """
+    Return the process-wide telemetry collector, creating it on first use.
+
+    Events are also appended to the JSONL file named by ``BLOG_SEO_TELEMETRY_FILE``
+    when that variable is set.
+    """
+    global _telemetry
+    with _telemetry_lock:
+        if _telemetry is None:
+            path = os.getenv('BLOG_SEO_TELEMETRY_FILE')
+            _telemetry = Telemetry([JsonlSink(path)] if path else [])
+        return _telemetry
@@ -0,0 +1,71 @@
+"""
+Shared fixtures: an isolated cache directory and a scriptable local HTTP server.
+"""
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable
+
+import pytest
+
+# A route returns (status, headers, body) for the request it is given
+Route = Callable[['RecordedRequest'], tuple[int, dict, bytes]]
+
+
+class RecordedRequest:
+    def __init__(self, path: str, headers: dict):
+        self.path = path
+        self.headers = headers
+
+
+class LocalServer:
+    """HTTP server answering from ``routes`` and recording every request it receives."""
+
+    def __init__(self):
+        self.routes: dict[str, Route] = {}
+        self.requests: list[RecordedRequest] = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                request = RecordedRequest(self.path, dict(self.headers))
+                server.requests.append(request)
+                route = server.routes.get(self.path)
+                status, headers, body = route(request) if route else (404, {}, b'not found')
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self._httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.origin = f"http://127.0.0.1:{self._httpd.server_port}"
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+
+    def url(self, path: str) -> str:
+        return self.origin + path
+
+    def hits(self, path: str) -> list[RecordedRequest]:
+        return [request for request in self.requests if request.path == path]
+
+    def close(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    """Keep every SQLite store a test opens out of the user's real cache directory."""
+    monkeypatch.setenv('BLOG_SEO_CACHE_DIR', str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture
+def server():
+    local = LocalServer()
+    yield local
+    local.close()
@@ -0,0 +1,75 @@
+from blog_seo.scraper.article_fetcher import ArticleFetcher, extract_article, format_post_content
+from blog_seo.scraper.blog_scraper import BlogScraper
+from blog_seo.scraper.politeness import PolitenessScheduler
+from blog_seo.telemetry import Telemetry
+
+ARTICLE = b"""<html><body>
+<header><nav><p>Home</p></nav></header>
+<aside><p>Subscribe to our newsletter</p></aside>
+<article>
+  <h1>Growing tomatoes indoors</h1>
+  <div class="entry-content">
+    <p>Tomatoes need <strong>light</strong>.</p>
+    <h2>Choosing a pot</h2>
+    <p>Bigger is better.</p>
+    <h3>Drainage</h3>
+    <ul><li><p>Holes in the bottom</p></li><li>A saucer</li></ul>
+  </div>
+</article>
+<script>var tracking = 1;</script>
+<footer><p>Copyright</p></footer>
+</body></html>"""
+
+
+def make_fetcher() -> ArticleFetcher:
+    scraper = BlogScraper(
+        use_cache=False, dedupe=False, telemetry=Telemetry(),
+        scheduler=PolitenessScheduler(respect_robots=False)
+    )
+    return ArticleFetcher(scraper, max_workers=4)
+
+
+def test_extract_article_keeps_body_and_headings():
+    text, headings = extract_article(ARTICLE)
+
+    assert text.split('\n\n') == [
+        'Tomatoes need light .',
+        '## Choosing a pot',
+        'Bigger is better.',
+        '### Drainage',
+        'Holes in the bottom',
+        'A saucer',
+    ]
+    assert headings == [{'level': 2, 'text': 'Choosing a pot'}, {'level': 3, 'text': 'Drainage'}]
+
+
+def test_format_post_content_prefers_body():
+    post = {'title': 'T', 'excerpt': 'short'}
+    assert format_post_content(post) == 'Title: T\n\nExcerpt: short'
+    post['content'] = 'full body'
+    assert format_post_content(post) == 'Title: T\n\nfull body'
+
+
+def test_fetch_all_fills_bodies_in_order(server):
+    for n in range(6):
+        server.routes[f'/post-{n}/'] = lambda request: (200, {}, ARTICLE)
+    server.routes['/broken/'] = lambda request: (404, {}, b'gone')
+    posts = [{'title': f'Post {n}', 'link': server.url(f'/post-{n}/'), 'excerpt': ''} for n in range(6)]
+    posts.append({'title': 'Broken', 'link': server.url('/broken/'), 'excerpt': 'kept'})
+
+    result = make_fetcher().fetch_all(posts)
+
+    assert result is posts
+    assert [post['title'] for post in result][:6] == [f'Post {n}' for n in range(6)]
+    assert all(post['headings'][0]['text'] == 'Choosing a pot' for post in result[:6])
+    assert 'content' not in result[6] and result[6]['content_error']
+    assert result[6]['excerpt'] == 'kept'
+
+
+def test_posts_with_content_are_not_refetched(server):
+    post = {'title': 'Feed post', 'link': server.url('/feed-post/'), 'content': 'from the feed'}
+
+    make_fetcher().fetch_all([post])
+
+    assert post['content'] == 'from the feed'
+    assert not server.hits('/feed-post/')
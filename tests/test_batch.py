@@ -0,0 +1,135 @@
+import asyncio
+import time
+
+import pytest
+
+from blog_seo.analyzer.batch import BatchAnalyzer, RateLimitedPipeline, RateLimiter, TokenBucket, is_retryable
+from blog_seo.scraper.dedupe import mark_duplicates
+
+
+class FakeAnalyzer:
+    """Counts calls per task and fails the first ``failures`` calls of each with ``error``."""
+
+    mode = 'thorough'
+
+    def __init__(self, failures: int = 0, error: Exception | None = None):
+        self.failures = failures
+        self.error = error
+        self.calls = {}
+
+    def estimated_calls(self, task: str) -> float:
+        return 1
+
+    def run_task(self, task: str, text: str, inputs: dict) -> str:
+        self.calls[task] = self.calls.get(task, 0) + 1
+        if self.calls[task] <= self.failures:
+            raise self.error
+        return f"{task} of {text.split()[0]}"
+
+
+class RateLimitError(Exception):
+    status_code = 429
+
+
+def test_token_bucket_admits_a_burst_then_the_refill_rate():
+    async def take(bucket: TokenBucket, count: int) -> float:
+        start = time.monotonic()
+        for _ in range(count):
+            await bucket.acquire()
+        return time.monotonic() - start
+
+    async def main() -> tuple[float, float]:
+        bucket = TokenBucket(rate=20, capacity=5)
+        # Ten more tokens after the burst take about half a second at 20 per second
+        return await take(bucket, 5), await take(bucket, 10)
+
+    burst, refill = asyncio.run(main())
+
+    assert burst < 0.05
+    assert 0.45 <= refill < 0.8
+
+
+def test_token_bucket_caps_oversized_requests():
+    async def take():
+        bucket = TokenBucket(rate=1000, capacity=10)
+        await bucket.acquire(50)
+        return bucket.tokens
+
+    assert asyncio.run(take()) < 1
+
+
+def test_rate_limiter_applies_both_limits():
+    async def take():
+        limiter = RateLimiter(requests_per_minute=6000, tokens_per_minute=600)
+        start = time.monotonic()
+        await limiter.acquire(1, 600)
+        await limiter.acquire(1, 5)
+        return time.monotonic() - start
+
+    # The token bucket is empty after the first call and refills at 10 tokens/s
+    assert asyncio.run(take()) >= 0.4
+
+
+@pytest.mark.parametrize('error, expected', [
+    (RateLimitError(), True),
+    (Exception('Error code: 529 - overloaded'), True),
+    (Exception('Request timed out'), True),
+    (ValueError('bad prompt'), False),
+])
+def test_is_retryable(error, expected):
+    assert is_retryable(error) is expected
+
+
+def test_rate_limit_errors_are_retried():
+    analyzer = FakeAnalyzer(failures=2, error=RateLimitError())
+    pipeline = RateLimitedPipeline(analyzer, RateLimiter(1e9, 1e12), base_delay=0.01)
+
+    result = asyncio.run(pipeline.call_task('keywords', 'solar panels', {}))
+
+    assert result == 'keywords of solar'
+    assert analyzer.calls['keywords'] == 3
+
+
+def test_other_errors_are_not_retried():
+    analyzer = FakeAnalyzer(failures=1, error=ValueError('bad prompt'))
+    pipeline = RateLimitedPipeline(analyzer, RateLimiter(1e9, 1e12), base_delay=0.01)
+
+    with pytest.raises(ValueError):
+        asyncio.run(pipeline.call_task('keywords', 'solar panels', {}))
+    assert analyzer.calls['keywords'] == 1
+
+
+def test_batch_analyzes_every_post_and_reuses_results():
+    posts = [
+        {'title': f'Post {i}', 'link': f'https://example.com/{i}/', 'excerpt': f'Topic{i} ' * 20,
+         'keywords': 'kept' if i == 0 else ''}
+        for i in range(5)
+    ]
+    analyzer = FakeAnalyzer()
+    finished = []
+    batch = BatchAnalyzer(analyzer, tasks=['keywords', 'summary'], max_concurrency=2,
+                          requests_per_minute=1e9, tokens_per_minute=1e12, dedupe=False)
+
+    batch.analyze_posts(posts, on_result=finished.append)
+
+    assert all(post['analyzed'] for post in posts)
+    assert posts[0]['keywords'] == 'kept'
+    assert analyzer.calls == {'keywords': 4, 'summary': 5}
+    assert sorted(post['link'] for post in finished) == sorted(post['link'] for post in posts)
+
+
+def test_batch_grouping_agrees_with_scrape_time_duplicates():
+    # Short posts sharing seven of eight words: distinct at the default threshold,
+    # but only when both compare the same post text
+    posts = [
+        {'title': 'T', 'link': 'https://example.com/a/', 'excerpt': 'w411 w9 w128 w18 w7 w9 w375 w258'},
+        {'title': 'T', 'link': 'https://example.com/b/', 'excerpt': 'w411 w9 w128 w18 w7 w9 w375 w125'},
+    ]
+    mark_duplicates(posts)
+    assert not any('duplicate_of' in post for post in posts)
+    analyzer = FakeAnalyzer()
+    batch = BatchAnalyzer(analyzer, tasks=['summary'], requests_per_minute=1e9, tokens_per_minute=1e12)
+
+    batch.analyze_posts(posts)
+
+    assert analyzer.calls == {'summary': 2}
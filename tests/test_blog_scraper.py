@@ -0,0 +1,133 @@
+import pytest
+
+from blog_seo.scraper.blog_scraper import BlogScraper
+from blog_seo.scraper.politeness import PolitenessScheduler
+from blog_seo.telemetry import Telemetry
+
+PER_PAGE = 3
+
+
+def listing_page(server, page: int, last_page: int | None) -> bytes:
+    """A WordPress listing page with PER_PAGE posts, numbered across pages."""
+    articles = ''.join(
+        f'<article class="post type-post"><h2 class="entry-title">'
+        f'<a href="{server.url(f"/post-{number}/")}">Post {number}</a></h2>'
+        f'<div class="entry-summary"><p>Excerpt {number}</p></div></article>'
+        for number in range((page - 1) * PER_PAGE + 1, page * PER_PAGE + 1)
+    )
+    if last_page is None:
+        nav = f'<a class="next" rel="next" href="{server.url(f"/blog/page/{page + 1}/")}">Next</a>'
+    else:
+        nav = ''.join(f'<a href="{server.url(f"/blog/page/{n}/")}">{n}</a>' for n in range(1, last_page + 1))
+    html = (
+        '<html><head><meta name="generator" content="WordPress 6.4"></head><body>'
+        f'<main>{articles}</main><nav class="pagination">{nav}</nav></body></html>'
+    )
+    return html.encode()
+
+
+def serve_blog(server, pages: int, linked_last_page: bool = True) -> None:
+    last_page = pages if linked_last_page else None
+    server.routes['/blog/'] = lambda request: (200, {}, listing_page(server, 1, last_page))
+    for page in range(2, pages + 1):
+        body = listing_page(server, page, last_page)
+        server.routes[f'/blog/page/{page}/'] = lambda request, body=body: (200, {}, body)
+
+
+@pytest.fixture
+def scraper():
+    return BlogScraper(
+        use_cache=False, prefer_feeds=False, dedupe=False, telemetry=Telemetry(),
+        scheduler=PolitenessScheduler(respect_robots=False)
+    )
+
+
+def links(posts: list[dict]) -> list[str]:
+    return [post['link'].rsplit('/', 2)[-2] for post in posts]
+
+
+def test_first_page_satisfies_request_without_crawling(server, scraper):
+    serve_blog(server, pages=4)
+
+    posts = scraper.scrape_blogs(server.url('/blog/'), 2)
+
+    assert links(posts) == ['post-1', 'post-2']
+    assert all(post['source'] == 'listing' for post in posts)
+    assert not server.hits('/blog/page/2/')
+
+
+def test_crawls_only_the_pages_needed_in_order(server, scraper):
+    serve_blog(server, pages=5)
+
+    posts = scraper.scrape_blogs(server.url('/blog/'), 7)
+
+    assert links(posts) == [f'post-{n}' for n in range(1, 8)]
+    assert server.hits('/blog/page/2/') and server.hits('/blog/page/3/')
+    assert not server.hits('/blog/page/4/')
+
+
+def test_crawl_stops_at_last_linked_page(server, scraper):
+    serve_blog(server, pages=3)
+
+    posts = scraper.scrape_blogs(server.url('/blog/'), 50)
+
+    assert len(posts) == 9
+    assert not server.hits('/blog/page/4/')
+
+
+def test_next_link_crawl_ends_at_missing_page(server, scraper):
+    serve_blog(server, pages=2, linked_last_page=False)
+
+    posts = scraper.scrape_blogs(server.url('/blog/'), 12)
+
+    # Page 3 and beyond 404, which ends the crawl with the posts found so far
+    assert links(posts) == [f'post-{n}' for n in range(1, 7)]
+
+
+def test_crawl_stops_when_a_page_repeats_posts(server, scraper):
+    serve_blog(server, pages=2, linked_last_page=False)
+    server.routes['/blog/page/3/'] = server.routes['/blog/page/2/']
+
+    posts = scraper.scrape_blogs(server.url('/blog/'), 12)
+
+    assert len(posts) == 6
+    assert len({post['link'] for post in posts}) == 6
+
+
+def test_failed_page_is_reported_and_skipped(server):
+    serve_blog(server, pages=5)
+    server.routes['/blog/page/3/'] = lambda request: (500, {}, b'error')
+    errors = []
+    scraper = BlogScraper(
+        use_cache=False, prefer_feeds=False, dedupe=False, telemetry=Telemetry(), on_error=errors.append,
+        scheduler=PolitenessScheduler(retries=0, respect_robots=False)
+    )
+
+    posts = scraper.scrape_blogs(server.url('/blog/'), 15)
+
+    assert links(posts) == [f'post-{n}' for n in (1, 2, 3, 4, 5, 6, 10, 11, 12, 13, 14, 15)]
+    assert len(errors) == 1 and '/blog/page/3/' in errors[0]
+
+
+def test_crawl_ends_when_every_page_of_a_wave_fails(server):
+    serve_blog(server, pages=1, linked_last_page=False)
+    for page in range(2, 10):
+        server.routes[f'/blog/page/{page}/'] = lambda request: (503, {}, b'down')
+    errors = []
+    scraper = BlogScraper(
+        use_cache=False, prefer_feeds=False, dedupe=False, telemetry=Telemetry(), on_error=errors.append,
+        scheduler=PolitenessScheduler(retries=0, respect_robots=False)
+    )
+
+    posts = scraper.scrape_blogs(server.url('/blog/'), 9)
+
+    assert links(posts) == ['post-1', 'post-2', 'post-3']
+    assert len(errors) == 2
+
+
+def test_invalid_url_is_reported(scraper):
+    errors = []
+    scraper.on_error = errors.append
+
+    assert scraper.scrape_blogs('not a url', 5) == []
+    assert errors == ['Please enter a valid URL']
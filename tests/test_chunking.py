@@ -0,0 +1,73 @@
+import threading
+
+from blog_seo.analyzer.chunking import merge_headlines, merge_keywords, split_text
+from blog_seo.analyzer.pipeline import AnalysisPipeline, run_sync
+from blog_seo.telemetry import estimate_tokens
+
+ARTICLE = 'Title: Solar panels\n\n' + '\n\n'.join(
+    f"## Section {i}\n\n" + f"Sentence {i} about solar panels and energy bills. " * 40 for i in range(5)
+)
+
+
+def test_short_text_is_one_chunk():
+    assert split_text('Title: Short\n\nA few words.', 100) == ['Title: Short\n\nA few words.']
+
+
+def test_long_text_splits_on_headings_and_keeps_the_title():
+    chunks = split_text(ARTICLE, 600)
+
+    assert len(chunks) > 1
+    for chunk in chunks:
+        assert chunk.startswith('Title: Solar panels\n\n## Section')
+        assert estimate_tokens(chunk) <= 600
+    assert sum(chunk.count('## Section') for chunk in chunks) == 5
+
+
+def test_oversized_sections_split_on_sentences():
+    text = '## One\n\n' + 'A long sentence about heat pumps and insulation. ' * 200
+    chunks = split_text(text, 300)
+
+    assert len(chunks) > 2
+    assert all(estimate_tokens(chunk) <= 300 for chunk in chunks)
+
+
+def test_merge_keywords_ranks_shared_keywords_first():
+    merged = merge_keywords(['Solar panels, energy bills', 'solar panels, Inverters.', 'No keywords found'])
+    assert merged == 'Solar panels, energy bills, Inverters'
+
+
+def test_merge_headlines_deduplicates_and_respects_the_budget():
+    partials = [
+        '## Why solar\n- Lower bills\n- Less carbon',
+        '1. Why Solar:\n- lower bills\n- Resale value\n## Installation\n- One day',
+    ]
+    assert merge_headlines(partials) == (
+        '**Why solar**\n- Lower bills\n- Less carbon\n- Resale value\n\n**Installation**\n- One day'
+    )
+    assert merge_headlines(partials, max_tokens=10) == '**Why solar**\n- Lower bills\n- Less carbon\n- Resale value'
+
+
+class FakeAnalyzer:
+    def __init__(self):
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def run_task(self, task: str, text: str, inputs: dict) -> str:
+        with self._lock:
+            self.calls.append((task, text))
+        return f"{task} result"
+
+
+def test_long_texts_are_analyzed_per_chunk():
+    analyzer = FakeAnalyzer()
+    pipeline = AnalysisPipeline(analyzer, chunk_tokens=600)
+    results, _ = run_sync(pipeline.run_detailed(ARTICLE, ['summary', 'keywords']))
+
+    chunks = split_text(ARTICLE, 600)
+    keyword_calls = [text for task, text in analyzer.calls if task == 'keywords']
+    summary_calls = [text for task, text in analyzer.calls if task == 'summary']
+    assert sorted(keyword_calls) == sorted(chunks)
+    # One summary per chunk, then one over the partial summaries
+    assert len(summary_calls) == len(chunks) + 1
+    assert results['summary'] == 'summary result'
+    assert results['keywords'] == 'keywords result'
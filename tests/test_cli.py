@@ -0,0 +1,76 @@
+import json
+
+import pytest
+
+from blog_seo.cli import main
+
+LISTING = """<html><head><meta name="generator" content="WordPress 6.4"></head><body><main>
+<article class="post type-post"><h2 class="entry-title"><a href="{origin}/one/">Post one</a></h2>
+  <div class="entry-summary"><p>First excerpt</p></div></article>
+<article class="post type-post"><h2 class="entry-title"><a href="{origin}/two/">Post two</a></h2>
+  <div class="entry-summary"><p>Second excerpt</p></div></article>
+</main></body></html>"""
+
+
+@pytest.fixture(autouse=True)
+def fresh_singletons(monkeypatch):
+    """Give every run its own stores under the test's cache directory."""
+    for name in ('scraper.http_cache._cache', 'scraper.post_store._store', 'scraper.dedupe._index',
+                 'scraper.politeness._scheduler', 'scraper.profiles._registry', 'telemetry._telemetry'):
+        monkeypatch.setattr(f'blog_seo.{name}', None)
+
+
+@pytest.fixture
+def blog(server):
+    listing = LISTING.format(origin=server.origin).encode()
+    server.routes['/blog/'] = lambda request: (200, {}, listing)
+    return server
+
+
+def read_jsonl(path) -> list[dict]:
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_scrape_only_writes_one_line_per_post(blog, tmp_path):
+    output = tmp_path / 'posts.jsonl'
+
+    assert main([blog.url('/blog/'), '-n', '5', '--no-content', '-o', str(output)]) == 0
+
+    posts = read_jsonl(output)
+    assert [post['title'] for post in posts] == ['Post one', 'Post two']
+    assert all(post['blog_url'] == blog.url('/blog/') for post in posts)
+    assert not blog.hits('/one/')
+
+
+def test_incremental_runs_only_output_new_posts(blog, tmp_path):
+    output = tmp_path / 'posts.jsonl'
+    args = [blog.url('/blog/'), '--no-content', '--incremental', '-o', str(output)]
+
+    assert main(args) == 0
+    assert main(args) == 0
+
+    assert len(read_jsonl(output)) == 2
+
+
+def test_export_and_metrics_are_written(blog, tmp_path):
+    export = tmp_path / 'export.jsonl'
+    metrics = tmp_path / 'metrics.prom'
+
+    code = main([
+        blog.url('/blog/'), '--no-content', '-o', str(tmp_path / 'out.jsonl'),
+        '--export', str(export), '--metrics', str(metrics)
+    ])
+
+    assert code == 0
+    assert [post['link'] for post in read_jsonl(export)] == [blog.url('/one/'), blog.url('/two/')]
+    assert 'blog_seo_stage_calls_total{stage="parse_listing"} 1' in metrics.read_text()
+
+
+def test_no_posts_found_fails(server, tmp_path):
+    assert main([server.url('/missing/'), '--no-content', '-o', str(tmp_path / 'out.jsonl')]) == 1
+
+
+@pytest.mark.parametrize('option', [['--analyze', 'keywords,sentiment'], ['--export', 'posts.csv']])
+def test_invalid_options_fail_before_scraping(server, tmp_path, option):
+    assert main([server.url('/blog/'), '-o', str(tmp_path / 'out.jsonl'), *option]) == 2
+    assert not server.requests
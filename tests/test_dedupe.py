@@ -0,0 +1,90 @@
+import random
+
+import pytest
+
+from blog_seo.scraper.dedupe import NearDuplicateIndex, mark_duplicates, share_analysis
+
+rng = random.Random(7)
+VOCABULARY = [f"word{i}" for i in range(2000)]
+BASE = [rng.choice(VOCABULARY) for _ in range(300)]
+
+
+def edited(every: int, offset: int = 0) -> str:
+    """The base text with every ``every``-th word replaced."""
+    return ' '.join(
+        f"changed{index}" if (index + offset) % every == 0 else word for index, word in enumerate(BASE)
+    )
+
+
+def jaccard(index: NearDuplicateIndex, a: str, b: str) -> float:
+    first, second = set(index._shingles(a)), set(index._shingles(b))
+    return len(first & second) / len(first | second)
+
+
+def test_near_identical_posts_are_duplicates():
+    index = NearDuplicateIndex()
+    assert index.add('original', ' '.join(BASE)) is None
+    # One word in 150 changed: about 97% of shingles survive
+    assert index.add('copy', edited(150)) == 'original'
+
+
+def test_heavily_edited_posts_are_distinct():
+    index = NearDuplicateIndex()
+    index.add('original', ' '.join(BASE))
+    text = edited(5)
+
+    assert jaccard(index, ' '.join(BASE), text) < 0.3
+    assert index.add('rewrite', text) is None
+
+
+def test_threshold_decides_moderate_edits():
+    text = edited(30)
+    strict = NearDuplicateIndex(threshold=0.9, bands=32)
+    loose = NearDuplicateIndex(threshold=0.5, bands=32)
+    assert 0.6 < jaccard(strict, ' '.join(BASE), text) < 0.9
+
+    for index in (strict, loose):
+        index.add('original', ' '.join(BASE))
+    assert strict.add('edit', text) is None
+    assert loose.add('edit', text) == 'original'
+
+
+def test_duplicates_point_at_the_first_of_their_group():
+    index = NearDuplicateIndex()
+    index.add('original', ' '.join(BASE))
+    index.add('copy', edited(150))
+
+    assert index.add('second copy', edited(150, offset=75)) == 'original'
+    assert index.query(' '.join(BASE)) == 'original'
+
+
+def test_readding_a_key_replaces_its_text():
+    index = NearDuplicateIndex()
+    index.add('original', ' '.join(BASE))
+    index.add('copy', edited(150))
+
+    assert index.add('copy', 'something else entirely different from the base text') is None
+    assert index.add('original', ' '.join(BASE)) is None
+    assert len(index) == 2
+    index.remove('copy')
+    assert 'copy' not in index
+
+
+def test_bands_must_divide_num_perm():
+    with pytest.raises(ValueError):
+        NearDuplicateIndex(num_perm=128, bands=10)
+
+
+def test_mark_duplicates_and_share_analysis():
+    posts = [
+        {'title': 'Original', 'link': 'a', 'content': ' '.join(BASE), 'keywords': 'kw', 'analyzed': True},
+        {'title': 'Original', 'link': 'b', 'content': edited(150), 'keywords': '', 'analyzed': False},
+        {'title': 'Other', 'link': 'c', 'content': edited(3), 'keywords': '', 'analyzed': False},
+    ]
+    mark_duplicates(posts)
+
+    assert posts[1]['duplicate_of'] == 'a'
+    assert 'duplicate_of' not in posts[0] and 'duplicate_of' not in posts[2]
+    assert share_analysis(posts, ('keywords',)) == [posts[1]]
+    assert posts[1]['keywords'] == 'kw' and posts[1]['analyzed']
+    assert not posts[2]['analyzed']
@@ -0,0 +1,77 @@
+import io
+
+import pytest
+
+from blog_seo.scraper.export import export_format, export_posts, import_posts
+from blog_seo.scraper.posts import COMPRESS_MIN_CHARS, BlogPost, compact_posts
+
+POSTS = [
+    {
+        'title': 'Sleep and mood', 'link': 'https://example.com/sleep/', 'excerpt': 'Why the first hour matters.',
+        'keywords': 'sleep, mood', 'summary': '', 'analyzed': True, 'blog_url': 'https://example.com/blog/',
+        'headings': [{'level': 2, 'text': 'Why this matters'}], 'content': 'Sleep is linked to mood. ' * 50,
+        'keywords_source': 'llm',
+    },
+    {'title': 'Boundaries', 'link': 'https://example.com/boundaries/', 'excerpt': '', 'analyzed': False},
+]
+# What the posts look like as BlogPost mappings, with defaults filled in
+EXPECTED = [BlogPost.from_dict(post).to_dict() for post in POSTS]
+
+
+def test_blog_post_behaves_like_a_post_dict():
+    post = BlogPost.from_dict(POSTS[0])
+
+    assert post.to_dict() == POSTS[0]
+    assert post['keywords_source'] == 'llm' and 'keywords_source' in post
+    assert 'generated_article' not in post and post.get('generated_article') is None
+    with pytest.raises(KeyError):
+        post['generated_article']
+
+    post['generated_article'] = 'Article'
+    del post['keywords_source']
+    assert post['generated_article'] == 'Article' and 'keywords_source' not in post
+    with pytest.raises(KeyError):
+        del post['keywords_source']
+
+
+def test_long_content_is_stored_compressed():
+    post = BlogPost.from_dict(POSTS[0])
+
+    assert isinstance(post._content, bytes) and len(post._content) < len(POSTS[0]['content'])
+    assert post['content'] == POSTS[0]['content']
+    post['content'] = 'short'
+    assert post._content == 'short' and len('short') < COMPRESS_MIN_CHARS
+
+
+def test_compact_posts_keeps_existing_blog_posts():
+    existing = BlogPost.from_dict(POSTS[1])
+    compacted = compact_posts([POSTS[0], existing])
+
+    assert isinstance(compacted[0], BlogPost)
+    assert compacted[1] is existing
+
+
+def test_jsonl_round_trip():
+    buffer = io.BytesIO()
+    assert export_posts(compact_posts(POSTS), buffer) == 2
+
+    buffer.seek(0)
+    imported = list(import_posts(buffer))
+    assert [post.to_dict() for post in imported] == EXPECTED
+
+
+@pytest.mark.parametrize('fmt', ['parquet', 'arrow'])
+def test_arrow_round_trip(tmp_path, fmt):
+    pytest.importorskip('pyarrow')
+    path = str(tmp_path / f'posts.{fmt}')
+    assert export_posts(POSTS, path, batch_size=1) == 2
+
+    imported = [post.to_dict() for post in import_posts(path)]
+    assert imported == EXPECTED
+
+
+def test_export_format_from_extension():
+    assert export_format('posts.NDJSON') == 'jsonl'
+    assert export_format('posts.feather') == 'arrow'
+    with pytest.raises(ValueError):
+        export_format('posts.csv')
@@ -0,0 +1,119 @@
+import time
+
+import pytest
+
+from blog_seo.scraper.blog_scraper import BlogScraper
+from blog_seo.scraper.http_cache import ResponseCache, parse_cache_control
+from blog_seo.scraper.politeness import PolitenessScheduler
+from blog_seo.telemetry import Telemetry
+
+
+def make_scraper(cache: ResponseCache) -> BlogScraper:
+    return BlogScraper(
+        cache=cache, dedupe=False, telemetry=Telemetry(),
+        scheduler=PolitenessScheduler(respect_robots=False)
+    )
+
+
+def etag_route(body: bytes, etag: str = '"v1"', cache_control: str | None = None):
+    def route(request):
+        headers = {'ETag': etag}
+        if cache_control:
+            headers['Cache-Control'] = cache_control
+        if request.headers.get('If-None-Match') == etag:
+            return 304, headers, b''
+        return 200, headers, body
+    return route
+
+
+@pytest.mark.parametrize('header, expected', [
+    (None, (True, None)),
+    ('max-age=60', (True, 60.0)),
+    ('public, max-age="30"', (True, 30.0)),
+    ('no-cache', (True, 0.0)),
+    ('no-store', (False, None)),
+    ('max-age=bogus', (True, 0.0)),
+])
+def test_parse_cache_control(header, expected):
+    assert parse_cache_control(header) == expected
+
+
+def test_stale_entry_is_revalidated_with_a_conditional_get(server, tmp_path):
+    server.routes['/page'] = etag_route(b'hello')
+    scraper = make_scraper(ResponseCache(str(tmp_path / 'http.sqlite3'), ttl=0))
+
+    assert scraper.fetch(server.url('/page')) == b'hello'
+    assert scraper.fetch(server.url('/page')) == b'hello'
+
+    first, second = server.hits('/page')
+    assert 'If-None-Match' not in first.headers
+    assert second.headers['If-None-Match'] == '"v1"'
+    fetches = [event for event in scraper.telemetry.events if event['stage'] == 'fetch']
+    assert fetches[1]['status'] == 304 and fetches[1]['cache_hit']
+
+
+def test_304_restarts_the_freshness_window(server, tmp_path):
+    server.routes['/page'] = etag_route(b'hello')
+    cache = ResponseCache(str(tmp_path / 'http.sqlite3'), ttl=60)
+    scraper = make_scraper(cache)
+    scraper.fetch(server.url('/page'))
+    # Age the entry past the TTL so the next fetch revalidates
+    cache._conn.execute('UPDATE responses SET stored_at = ?', (time.time() - 120,))
+
+    scraper.fetch(server.url('/page'))
+    scraper.fetch(server.url('/page'))
+
+    assert len(server.hits('/page')) == 2
+    assert cache.get(server.url('/page')).is_fresh(cache.ttl)
+
+
+def test_fresh_entry_is_served_without_a_request(server, tmp_path):
+    server.routes['/page'] = etag_route(b'hello')
+    scraper = make_scraper(ResponseCache(str(tmp_path / 'http.sqlite3'), ttl=60))
+
+    scraper.fetch(server.url('/page'))
+    scraper.fetch(server.url('/page'))
+
+    assert len(server.hits('/page')) == 1
+
+
+def test_max_age_overrides_the_ttl(server, tmp_path):
+    server.routes['/page'] = etag_route(b'hello', cache_control='max-age=0')
+    scraper = make_scraper(ResponseCache(str(tmp_path / 'http.sqlite3'), ttl=3600))
+
+    scraper.fetch(server.url('/page'))
+    scraper.fetch(server.url('/page'))
+
+    assert len(server.hits('/page')) == 2
+    assert server.hits('/page')[1].headers['If-None-Match'] == '"v1"'
+
+
+def test_no_store_responses_are_not_cached(server, tmp_path):
+    server.routes['/page'] = lambda request: (200, {'Cache-Control': 'no-store'}, b'secret')
+    cache = ResponseCache(str(tmp_path / 'http.sqlite3'), ttl=3600)
+    scraper = make_scraper(cache)
+
+    scraper.fetch(server.url('/page'))
+    scraper.fetch(server.url('/page'))
+
+    assert len(server.hits('/page')) == 2
+    assert cache.get(server.url('/page')) is None
+
+
+def test_stale_entry_without_validators_is_dropped(tmp_path):
+    cache = ResponseCache(str(tmp_path / 'http.sqlite3'), ttl=0)
+    cache.put('http://example.com/', b'body')
+
+    assert cache.get('http://example.com/') is None
+    assert cache._conn.execute('SELECT COUNT(*) FROM responses').fetchone()[0] == 0
+
+
+def test_lru_entries_are_evicted_over_the_size_limit(tmp_path):
+    cache = ResponseCache(str(tmp_path / 'http.sqlite3'), max_bytes=10)
+    cache.put('http://example.com/a', b'12345', etag='a')
+    cache.put('http://example.com/b', b'12345', etag='b')
+    cache.get('http://example.com/a')
+    cache.put('http://example.com/c', b'12345', etag='c')
+
+    assert cache.get('http://example.com/b') is None
+    assert cache.get('http://example.com/a') is not None
@@ -0,0 +1,168 @@
+import sqlite3
+import threading
+import time
+
+from blog_seo.analyzer.jobs import JobQueue, JobWorkerPool
+from blog_seo.scraper.post_store import PostStore
+
+LINK = 'https://example.com/sleep/'
+
+
+class FakeAnalyzer:
+    def run_task(self, task: str, text: str, inputs: dict) -> str:
+        if 'fail' in text:
+            raise RuntimeError('model unavailable')
+        return f"{task} result"
+
+
+class FakePool(JobWorkerPool):
+    def _analyzer(self, mode: str) -> FakeAnalyzer:
+        return FakeAnalyzer()
+
+
+def wait_for(condition, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.02)
+
+
+def test_submitting_the_same_work_returns_the_job_in_flight(tmp_path):
+    queue = JobQueue(str(tmp_path / 'jobs.sqlite3'))
+    job, created = queue.submit(LINK, 'keywords', 'fast', 'text', {})
+    again, created_again = queue.submit(LINK, 'keywords', 'fast', 'text', {})
+
+    assert created and not created_again
+    assert again.id == job.id
+    queue.finish(job.id)
+    assert queue.submit(LINK, 'keywords', 'fast', 'text', {})[1]
+
+
+def test_running_jobs_are_requeued_after_a_crash(tmp_path):
+    path = str(tmp_path / 'jobs.sqlite3')
+    queue = JobQueue(path)
+    job, _ = queue.submit(LINK, 'summary', 'thorough', 'text', {'keywords': 'kw'})
+    assert queue.claim('crashed')[0].id == job.id
+    # The process dies here, leaving the job marked as running
+
+    restarted = JobQueue(path)
+    assert restarted.claim('restarted') is None
+    # Its last heartbeat is recent, so it might still be running elsewhere
+    assert restarted.requeue_stale() == 0
+    assert restarted.requeue_stale(stale_after=-1) == 1
+
+    claimed, text, existing = restarted.claim('restarted')
+    assert (claimed.id, text, existing) == (job.id, 'text', {'keywords': 'kw'})
+    assert restarted.latest(LINK)['summary'].status == 'running'
+
+
+def test_heartbeat_keeps_running_jobs_from_being_requeued(tmp_path):
+    queue = JobQueue(str(tmp_path / 'jobs.sqlite3'))
+    queue.submit(LINK, 'summary', 'fast', 'text', {})
+    queue.submit(LINK, 'keywords', 'fast', 'text', {})
+    queue.claim('alive')
+    queue.claim('dead')
+    queue._conn.execute('UPDATE jobs SET heartbeat_at = ?', (time.time() - 120,))
+    queue._conn.commit()
+
+    queue.heartbeat('alive')
+
+    assert queue.requeue_stale(stale_after=60) == 1
+    jobs = queue.latest(LINK)
+    assert jobs['summary'].status == 'running' and jobs['keywords'].status == 'queued'
+
+
+def test_each_job_is_claimed_by_exactly_one_process(tmp_path):
+    path = str(tmp_path / 'jobs.sqlite3')
+    JobQueue(path)
+    queue = JobQueue(path)
+    for index in range(40):
+        queue.submit(f'{LINK}{index}', 'summary', 'fast', 'text', {})
+    processes = [JobQueue(path) for _ in range(4)]
+    claims = [[] for _ in processes]
+
+    def drain(process: JobQueue, claimed: list) -> None:
+        while (job := process.claim(str(id(process)))) is not None:
+            claimed.append(job[0].id)
+
+    threads = [threading.Thread(target=drain, args=pair) for pair in zip(processes, claims)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    claimed = [job_id for ids in claims for job_id in ids]
+    assert sorted(claimed) == sorted(set(claimed)) and len(claimed) == 40
+
+
+def test_starting_a_pool_leaves_jobs_of_live_processes_alone(tmp_path):
+    store = PostStore(str(tmp_path / 'posts.sqlite3'))
+    queue = JobQueue(str(tmp_path / 'jobs.sqlite3'))
+    job, _ = queue.submit(LINK, 'summary', 'fast', 'text', {})
+    queue.claim('other-process')
+
+    pool = FakePool(queue=queue, store=store, workers=1).start()
+    try:
+        time.sleep(0.2)
+    finally:
+        pool.stop()
+
+    assert queue.latest(LINK)['summary'].status == 'running'
+
+
+def test_queues_without_owner_columns_are_migrated(tmp_path):
+    path = str(tmp_path / 'jobs.sqlite3')
+    conn = sqlite3.connect(path)
+    conn.execute(
+        'CREATE TABLE jobs (id INTEGER PRIMARY KEY AUTOINCREMENT, link TEXT NOT NULL, task TEXT NOT NULL, '
+        'mode TEXT NOT NULL, text TEXT NOT NULL, existing TEXT NOT NULL, status TEXT NOT NULL, error TEXT, '
+        'created_at REAL NOT NULL, started_at REAL, finished_at REAL)'
+    )
+    conn.execute(
+        "INSERT INTO jobs (link, task, mode, text, existing, status, created_at, started_at) "
+        "VALUES (?, 'summary', 'fast', 'text', '{}', 'running', 0, 0)",
+        (LINK,)
+    )
+    conn.commit()
+    conn.close()
+
+    queue = JobQueue(path)
+
+    assert queue.requeue_stale() == 1
+    assert queue.claim('new')[0].task == 'summary'
+
+
+def test_finished_jobs_are_pruned(tmp_path):
+    queue = JobQueue(str(tmp_path / 'jobs.sqlite3'))
+    done, _ = queue.submit(LINK, 'summary', 'fast', 'text', {})
+    queue.finish(done.id)
+    queue.submit(LINK, 'keywords', 'fast', 'text', {})
+
+    queue.prune(max_age=-1)
+
+    assert set(queue.latest(LINK)) == {'keywords'}
+
+
+def test_pool_recovers_interrupted_jobs_and_stores_results(tmp_path):
+    store = PostStore(str(tmp_path / 'posts.sqlite3'))
+    store.sync('https://example.com/blog/', [{'title': 'Sleep', 'link': LINK, 'excerpt': 'About sleep.'}])
+    queue = JobQueue(str(tmp_path / 'jobs.sqlite3'))
+    queue.submit(LINK, 'summary', 'fast', 'Sleep text', {})
+    queue.claim('crashed')
+    queue._conn.execute('UPDATE jobs SET heartbeat_at = 0')
+    queue._conn.commit()
+
+    pool = FakePool(queue=queue, store=store, workers=2).start()
+    try:
+        wait_for(lambda: not queue.latest(LINK)['summary'].active)
+        post = {'title': 'Sleep', 'link': LINK, 'excerpt': 'fail'}
+        job = pool.submit(post, 'keywords')
+        wait_for(lambda: not queue.latest(LINK)['keywords'].active)
+    finally:
+        pool.stop()
+
+    assert queue.latest(LINK)['summary'].status == 'done'
+    assert store.get(LINK)['summary'] == 'summary result'
+    failed = queue.latest(LINK)['keywords']
+    assert failed.id == job.id and failed.status == 'failed' and failed.error == 'model unavailable'
+    assert store.get(LINK)['keywords'].startswith('Error')
@@ -0,0 +1,65 @@
+import pytest
+
+from blog_seo.analyzer.keywords import KeywordEngine, extract_keywords, extract_post_keywords
+
+CORPUS = [
+    "Solar panels lower energy bills. Installing solar panels takes a day.",
+    "Heat pumps heat homes efficiently. A heat pump also cools in summer.",
+    "Solar panels and heat pumps work well together for energy savings.",
+]
+
+
+def test_keywords_for_each_document():
+    keywords = [entry.split(', ') for entry in extract_keywords(CORPUS)]
+
+    assert len(keywords) == len(CORPUS)
+    assert keywords[0][0] == 'solar panels'
+    assert 'heat pumps' in keywords[1] or 'heat' in keywords[1]
+    # Phrases contained in a chosen phrase are not repeated on their own
+    assert 'solar' not in keywords[0] and 'panels' not in keywords[0]
+
+
+def test_stopwords_and_punctuation_never_become_keywords():
+    for entry in extract_keywords(CORPUS):
+        for keyword in entry.split(', '):
+            assert keyword not in {'the', 'and', 'a', 'also', '.'}
+            assert '.' not in keyword
+
+
+def test_phrases_seen_once_are_dropped():
+    engine = KeywordEngine(min_phrase_count=2).fit(CORPUS)
+    grams = set(engine.scores['gram'])
+
+    assert 'solar panels' in grams
+    assert 'lower energy bills' not in grams
+    assert 'bills' in grams
+
+
+def test_top_n_limits_the_keywords():
+    assert all(len(entry.split(', ')) <= 2 for entry in extract_keywords(CORPUS, top_n=2))
+
+
+def test_single_document_matches_corpus_scoring():
+    engine = KeywordEngine().fit(CORPUS)
+    assert [engine.keywords(index) for index in range(len(CORPUS))] == engine.keywords_all()
+
+
+@pytest.mark.parametrize('texts, expected', [
+    ([], []),
+    ([''], ['']),
+    (['the and of it'], ['']),
+    ([None], ['']),
+])
+def test_empty_documents(texts, expected):
+    assert extract_keywords(texts) == expected
+
+
+def test_keywords_require_fit():
+    with pytest.raises(RuntimeError):
+        KeywordEngine().keywords_all()
+
+
+def test_extract_post_keywords_sets_local_keywords():
+    posts = [{'title': 'Solar panels', 'excerpt': text} for text in CORPUS]
+    extract_post_keywords(posts)
+    assert all(post['local_keywords'] for post in posts)
@@ -0,0 +1,46 @@
+import time
+
+from blog_seo.analyzer.llm_cache import LLMCache, get_llm_cache, make_cache_key
+
+
+def test_cache_key_depends_on_every_part():
+    base = make_cache_key('keywords', 'v1', 'model', 'text')
+    assert base == make_cache_key('keywords', 'v1', 'model', 'text')
+    assert len({
+        base,
+        make_cache_key('summary', 'v1', 'model', 'text'),
+        make_cache_key('keywords', 'v2', 'model', 'text'),
+        make_cache_key('keywords', 'v1', 'other', 'text'),
+        make_cache_key('keywords', 'v1', 'model', 'other'),
+        # Parts are delimited, so shifting characters between them changes the key
+        make_cache_key('keyword', 'sv1', 'model', 'text'),
+    }) == 6
+
+
+def test_expired_entries_are_misses(tmp_path):
+    cache = LLMCache(str(tmp_path / 'llm.sqlite3'), max_age=60)
+    cache.put('key', 'keywords', 'value')
+    assert cache.get('key') == 'value'
+
+    cache._conn.execute('UPDATE results SET created_at = ?', (time.time() - 120,))
+    assert cache.get('key') is None
+    assert cache.stats() == {'hits': 1, 'misses': 1, 'hit_rate': 0.5, 'entries': 0}
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = LLMCache(str(tmp_path / 'llm.sqlite3'), max_entries=2)
+    cache.put('a', 'keywords', '1')
+    time.sleep(0.01)
+    cache.put('b', 'keywords', '2')
+    time.sleep(0.01)
+    cache.get('a')
+    time.sleep(0.01)
+    cache.put('c', 'keywords', '3')
+
+    assert cache.get('b') is None
+    assert cache.get('a') == '1' and cache.get('c') == '3'
+
+
+def test_default_cache_lives_in_the_shared_cache_dir(cache_dir, monkeypatch):
+    monkeypatch.setattr('blog_seo.analyzer.llm_cache._cache', None)
+    assert get_llm_cache().path == str(cache_dir / 'llm.sqlite3')
@@ -0,0 +1,100 @@
+import os
+
+import pytest
+
+from blog_seo.scraper.parsers import (
+    PARSER_BACKENDS, LxmlBackend, ParserBackend, SelectolaxBackend, SoupBackend,
+    StreamingListingParser, get_parser
+)
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+LISTINGS = {
+    'wordpress_listing.html': 'wordpress',
+    'ghost_listing.html': 'ghost',
+    # Elementor cards also carry WordPress's post classes
+    'elementor_listing.html': 'elementor',
+}
+BACKENDS = [
+    pytest.param(name, marks=pytest.mark.skipif(not backend.available(), reason=f"{name} is not installed"))
+    for name, backend in PARSER_BACKENDS.items()
+]
+
+
+def read_fixture(name: str) -> bytes:
+    with open(os.path.join(FIXTURES, name), 'rb') as f:
+        return f.read()
+
+
+def stream_listing(content: bytes, limit: int | None = None, chunk_size: int = 64):
+    parser = StreamingListingParser(limit=limit)
+    text = content.decode('utf-8')
+    for start in range(0, len(text), chunk_size):
+        parser.feed(text[start:start + chunk_size])
+        if parser.done:
+            break
+    parser.close()
+    return parser.listing
+
+
+def test_parser_backend_is_abstract():
+    with pytest.raises(TypeError):
+        ParserBackend()
+
+
+def test_wordpress_listing_posts():
+    listing = get_parser('soup').parse_listing(read_fixture('wordpress_listing.html'))
+
+    assert listing.profile == 'wordpress'
+    assert [(post['title'], post['link'], post['excerpt']) for post in listing.posts] == [
+        ('Growing tomatoes indoors', 'https://example.com/tomatoes/', 'Light, warmth and patience & a bigger pot.'),
+        ('Compost in small spaces', 'https://example.com/compost/', 'A bokashi bin fits under the sink.'),
+        ('Seed catalogue notes', 'https://example.com/seeds/', 'What to order before March.'),
+    ]
+    assert ('https://example.com/blog/page/2/', True) in listing.page_links
+    assert ('https://example.com/blog/page/3/', False) in listing.page_links
+    assert all('about' not in href for href, _ in listing.page_links)
+
+
+@pytest.mark.parametrize('fixture, profile', LISTINGS.items())
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_backends_agree_with_the_soup_backend(backend, fixture, profile):
+    content = read_fixture(fixture)
+    expected = get_parser('soup').parse_listing(content)
+    listing = get_parser(backend).parse_listing(content)
+
+    assert listing.profile == expected.profile == profile
+    assert listing.posts == expected.posts
+    assert sorted(listing.page_links) == sorted(expected.page_links)
+
+
+@pytest.mark.parametrize('fixture, profile', LISTINGS.items())
+def test_streaming_parser_agrees_with_the_soup_backend(fixture, profile):
+    content = read_fixture(fixture)
+    expected = get_parser('soup').parse_listing(content)
+    listing = stream_listing(content)
+
+    assert listing.profile == profile
+    assert listing.posts == expected.posts
+    assert sorted(listing.page_links) == sorted(expected.page_links)
+
+
+def test_streaming_parser_stops_at_the_limit():
+    listing = stream_listing(read_fixture('wordpress_listing.html'), limit=2)
+
+    assert [post['link'] for post in listing.posts] == [
+        'https://example.com/tomatoes/', 'https://example.com/compost/'
+    ]
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_limit_is_applied_by_every_backend(backend):
+    listing = get_parser(backend).parse_listing(read_fixture('wordpress_listing.html'), limit=1)
+    assert len(listing.posts) == 1
+
+
+def test_get_parser_prefers_the_fastest_installed_backend(monkeypatch):
+    monkeypatch.delenv('BLOG_SEO_PARSER', raising=False)
+    expected = next((backend for backend in (SelectolaxBackend, LxmlBackend) if backend.available()), SoupBackend)
+    assert isinstance(get_parser(), expected)
+    with pytest.raises(ValueError):
+        get_parser('html5')
@@ -0,0 +1,135 @@
+import asyncio
+import logging
+import threading
+import time
+
+import pytest
+
+from blog_seo.analyzer.pipeline import KEYWORDS_SOURCE, AnalysisPipeline, run_sync
+from blog_seo.analyzer.seo_analyzer import ERROR_MESSAGES
+
+TEXT = "Solar panels cut energy bills. Solar panels need little maintenance."
+
+
+class FakeAnalyzer:
+    """Stands in for SEOAnalyzer: returns canned results, failing the tasks in ``fail``."""
+
+    def __init__(self, fail: tuple[str, ...] = (), delay: float = 0.0):
+        self.fail = fail
+        self.delay = delay
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def run_task(self, task: str, text: str, inputs: dict) -> str:
+        with self._lock:
+            self.calls.append((task, dict(inputs)))
+        time.sleep(self.delay)
+        if task in self.fail:
+            raise RuntimeError(f"{task} exploded")
+        return f"{task} result"
+
+
+def run(pipeline: AnalysisPipeline, tasks, existing=None):
+    return run_sync(pipeline.run_detailed(TEXT, tasks, existing))
+
+
+def test_article_waits_for_its_dependencies():
+    analyzer = FakeAnalyzer()
+    results, errors = run(AnalysisPipeline(analyzer), ['generated_article'])
+
+    assert errors == {}
+    tasks = [task for task, _ in analyzer.calls]
+    assert sorted(tasks[:2]) == ['headlines_and_keypoints', 'keywords']
+    assert analyzer.calls[2] == ('generated_article', {
+        'headlines_and_keypoints': 'headlines_and_keypoints result', 'keywords': 'keywords result'
+    })
+    assert results['generated_article'] == 'generated_article result'
+
+
+def test_failed_dependency_fails_its_dependents():
+    analyzer = FakeAnalyzer(fail=('headlines_and_keypoints',))
+    results, errors = run(AnalysisPipeline(analyzer), ['generated_article', 'summary'])
+
+    assert errors == {
+        'headlines_and_keypoints': 'headlines_and_keypoints exploded',
+        'generated_article': 'headlines_and_keypoints failed',
+    }
+    assert results == {'keywords': 'keywords result', KEYWORDS_SOURCE: 'llm', 'summary': 'summary result'}
+    assert 'generated_article' not in [task for task, _ in analyzer.calls]
+
+
+def test_existing_results_are_reused_unless_they_are_errors():
+    analyzer = FakeAnalyzer()
+    existing = {
+        'keywords': 'known keywords',
+        'headlines_and_keypoints': ERROR_MESSAGES['headlines_and_keypoints'].format('timeout'),
+    }
+    results, _ = run(AnalysisPipeline(analyzer), ['generated_article'], existing)
+
+    assert sorted(task for task, _ in analyzer.calls) == ['generated_article', 'headlines_and_keypoints']
+    assert analyzer.calls[-1][1]['keywords'] == 'known keywords'
+    assert results['keywords'] == 'known keywords'
+
+
+def test_independent_tasks_run_concurrently():
+    analyzer = FakeAnalyzer(delay=0.2)
+    start = time.perf_counter()
+    run(AnalysisPipeline(analyzer), ['keywords', 'summary', 'headlines_and_keypoints'])
+
+    assert time.perf_counter() - start < 0.5
+
+
+def test_keyword_fallback_is_off_by_default(monkeypatch):
+    monkeypatch.delenv('BLOG_SEO_KEYWORD_FALLBACK', raising=False)
+    results, errors = run(AnalysisPipeline(FakeAnalyzer(fail=('keywords',))), ['keywords'])
+
+    assert results == {}
+    assert errors == {'keywords': 'keywords exploded'}
+
+
+def test_keyword_fallback_is_logged_and_marked_local(caplog):
+    pipeline = AnalysisPipeline(FakeAnalyzer(fail=('keywords',)), keyword_fallback=True)
+    with caplog.at_level(logging.WARNING, logger='blog_seo.analyzer.pipeline'):
+        results, errors = run(pipeline, ['keywords'])
+
+    assert errors == {}
+    assert 'solar panels' in results['keywords']
+    assert results[KEYWORDS_SOURCE] == 'local'
+    assert 'keywords exploded' in caplog.text
+    assert caplog.records[0].exc_info is not None
+
+
+def test_keyword_fallback_can_be_enabled_from_the_environment(monkeypatch):
+    monkeypatch.setenv('BLOG_SEO_KEYWORD_FALLBACK', '1')
+    assert AnalysisPipeline(FakeAnalyzer()).keyword_fallback
+
+
+def test_model_keywords_are_marked_llm():
+    results, _ = run(AnalysisPipeline(FakeAnalyzer()), ['keywords'])
+    assert results == {'keywords': 'keywords result', KEYWORDS_SOURCE: 'llm'}
+
+
+def test_local_keywords_are_recomputed_by_the_model():
+    analyzer = FakeAnalyzer()
+    existing = {'keywords': 'solar panels', KEYWORDS_SOURCE: 'local', 'summary': 'kept'}
+    results, _ = run(AnalysisPipeline(analyzer), ['keywords', 'summary'], existing)
+
+    assert [task for task, _ in analyzer.calls] == ['keywords']
+    assert results == {'keywords': 'keywords result', KEYWORDS_SOURCE: 'llm', 'summary': 'kept'}
+
+
+def test_run_formats_error_messages():
+    results = run_sync(AnalysisPipeline(FakeAnalyzer(fail=('summary',))).run(TEXT, ['summary']))
+    assert results == {'summary': ERROR_MESSAGES['summary'].format('summary exploded')}
+
+
+def test_run_sync_works_inside_a_running_loop():
+    async def main():
+        return run_sync(AnalysisPipeline(FakeAnalyzer()).run(TEXT, ['summary']))
+
+    assert asyncio.run(main()) == {'summary': 'summary result'}
+
+
+def test_unknown_task_is_rejected():
+    with pytest.raises(ValueError):
+        run(AnalysisPipeline(FakeAnalyzer()), ['sentiment'])
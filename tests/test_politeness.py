@@ -0,0 +1,130 @@
+import socket
+import time
+
+import pytest
+import requests
+
+from blog_seo.scraper.politeness import PolitenessScheduler, RobotsDisallowed, retry_after
+
+
+def sequence(*responses):
+    """Route answering with each response in turn, then repeating the last one."""
+    remaining = list(responses)
+
+    def route(request):
+        return remaining.pop(0) if len(remaining) > 1 else remaining[0]
+    return route
+
+
+@pytest.fixture
+def session():
+    with requests.Session() as session:
+        yield session
+
+
+def scheduler(**kwargs) -> PolitenessScheduler:
+    kwargs.setdefault('backoff', 0.01)
+    kwargs.setdefault('respect_robots', False)
+    return PolitenessScheduler(**kwargs)
+
+
+def test_retried_server_errors_shrink_the_limit(server, session):
+    server.routes['/page'] = sequence((500, {}, b''), (502, {}, b''), (200, {}, b'ok'))
+    polite = scheduler(initial_per_host=4)
+    event = {}
+
+    response = polite.get(session, server.url('/page'), event=event)
+
+    assert response.status_code == 200
+    assert event['retries'] == 2
+    # Halved by each of the two errors (4 -> 2 -> 1), then grown by the success
+    assert polite.limit(server.url('/page')) == 2
+
+
+def test_final_server_error_is_not_counted_as_healthy(server, session):
+    server.routes['/page'] = sequence((504, {}, b''))
+    polite = scheduler(initial_per_host=4, retries=0)
+
+    assert polite.get(session, server.url('/page')).status_code == 504
+    assert polite.limit(server.url('/page')) == 2
+
+
+def test_fast_responses_grow_the_limit(server, session):
+    server.routes['/page'] = sequence((200, {}, b'ok'))
+    polite = scheduler(initial_per_host=2, max_per_host=3)
+
+    for _ in range(10):
+        polite.get(session, server.url('/page'))
+
+    assert polite.limit(server.url('/page')) == 3
+
+
+def test_retry_after_pauses_the_host_before_retrying(server, session):
+    server.routes['/page'] = sequence((429, {'Retry-After': '1'}, b''), (200, {}, b'ok'))
+    polite = scheduler()
+
+    start = time.monotonic()
+    response = polite.get(session, server.url('/page'))
+
+    assert response.status_code == 200
+    assert time.monotonic() - start >= 0.9
+    assert len(server.hits('/page')) == 2
+
+
+def test_retry_after_beyond_the_cap_is_returned(server, session):
+    server.routes['/page'] = sequence((503, {'Retry-After': '3600'}, b''), (200, {}, b'ok'))
+    polite = scheduler(max_retry_after=60)
+
+    assert polite.get(session, server.url('/page')).status_code == 503
+    assert len(server.hits('/page')) == 1
+
+
+@pytest.mark.parametrize('value, expected', [('', None), ('7', 7.0), ('soon', None)])
+def test_retry_after_values(value, expected):
+    response = requests.Response()
+    response.headers['Retry-After'] = value
+    assert retry_after(response) == expected
+
+
+def test_retry_after_http_date():
+    response = requests.Response()
+    response.headers['Retry-After'] = time.strftime('%a, %d %b %Y %H:%M:%S GMT', time.gmtime(time.time() + 30))
+    assert 25 <= retry_after(response) <= 31
+
+
+def test_robots_disallow_is_refused(server, session):
+    server.routes['/robots.txt'] = sequence((200, {}, b'User-agent: *\nDisallow: /private/\n'))
+    server.routes['/private/page'] = sequence((200, {}, b'secret'))
+    polite = scheduler(respect_robots=True)
+
+    with pytest.raises(RobotsDisallowed):
+        polite.get(session, server.url('/private/page'))
+    assert not server.hits('/private/page')
+    # robots.txt is fetched once per host
+    polite.allowed(session, server.url('/public/'))
+    assert len(server.hits('/robots.txt')) == 1
+
+
+def test_crawl_delay_spaces_out_requests(server, session):
+    server.routes['/robots.txt'] = sequence((200, {}, b'User-agent: *\nCrawl-delay: 1\n'))
+    server.routes['/page'] = sequence((200, {}, b'ok'))
+    polite = scheduler(respect_robots=True)
+
+    start = time.monotonic()
+    for _ in range(2):
+        polite.get(session, server.url('/page'))
+
+    assert time.monotonic() - start >= 0.9
+
+
+def test_connection_errors_are_retried_then_raised(session):
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    polite = scheduler(retries=2, initial_per_host=4)
+    event = {}
+
+    with pytest.raises(requests.ConnectionError):
+        polite.get(session, f'http://127.0.0.1:{port}/', event=event)
+    assert event['retries'] == 2
+    assert polite.limit(f'http://127.0.0.1:{port}/') == 1
@@ -0,0 +1,140 @@
+import json
+import sqlite3
+
+from blog_seo.scraper.post_store import PostStore
+from blog_seo.scraper.posts import BlogPost
+
+BLOG = 'https://example.com/blog/'
+
+
+def make_store(tmp_path) -> PostStore:
+    return PostStore(str(tmp_path / 'posts.sqlite3'))
+
+
+def post(slug: str, **fields) -> dict:
+    return {'title': slug.title(), 'link': f'https://example.com/{slug}/', 'excerpt': f'About {slug}.', **fields}
+
+
+def test_upsert_stores_imported_posts_so_updates_reach_them(tmp_path):
+    store = make_store(tmp_path)
+    imported = [BlogPost.from_dict(post('sleep', blog_url=BLOG, keywords='sleep')), post('no-blog'), {'title': 'x'}]
+
+    assert store.upsert(imported) == 2
+    assert store.update('https://example.com/sleep/', {'summary': 'Short.'})['keywords'] == 'sleep'
+    assert store.get('https://example.com/no-blog/')['title'] == 'No-Blog'
+    assert [stored['link'] for stored in store.get_posts(BLOG)] == ['https://example.com/sleep/']
+
+
+def test_upsert_overwrites_stored_analysis(tmp_path):
+    store = make_store(tmp_path)
+    store.sync(BLOG, [post('sleep', keywords='old')])
+
+    store.upsert([post('sleep', keywords='imported', blog_url=BLOG)])
+
+    assert store.get('https://example.com/sleep/')['keywords'] == 'imported'
+    assert store.count(BLOG) == 1
+
+
+def test_sync_marks_new_unchanged_and_changed_posts(tmp_path):
+    store = make_store(tmp_path)
+    first = store.sync(BLOG, [post('sleep'), post('grief')])
+    assert [p['status'] for p in first] == ['new', 'new']
+    store.update('https://example.com/sleep/', {'keywords': 'sleep', 'content': 'Body', 'analyzed': True})
+    store.update('https://example.com/grief/', {'keywords': 'grief', 'keywords_source': 'llm', 'analyzed': True})
+
+    second = store.sync(BLOG, [post('sleep'), post('grief', excerpt='Rewritten.'), post('walking')])
+
+    assert [p['status'] for p in second] == ['unchanged', 'changed', 'new']
+    # Unchanged posts come back with their stored content and analysis
+    assert second[0]['keywords'] == 'sleep' and second[0]['content'] == 'Body' and second[0]['analyzed']
+    # The analysis of an edited post no longer applies
+    assert second[1]['keywords'] == '' and second[1]['keywords_source'] == '' and not second[1]['analyzed']
+    assert store.get('https://example.com/grief/')['keywords'] == ''
+
+
+def test_post_found_another_way_keeps_its_analysis(tmp_path):
+    store = make_store(tmp_path)
+    feed_post = post('sleep', excerpt='Full RSS description.', updated='2024-05-01', source='feed')
+    store.sync(BLOG, [feed_post])
+    store.update('https://example.com/sleep/', {'keywords': 'sleep', 'generated_article': 'Article', 'analyzed': True})
+
+    # The feed fetch failed, so the same post is found in the HTML listing instead
+    listing = store.sync(BLOG, [post('sleep', excerpt='Listing teaser', source='listing')])
+
+    assert listing[0]['status'] == 'unchanged'
+    assert listing[0]['generated_article'] == 'Article' and listing[0]['source'] == 'listing'
+    assert store.get('https://example.com/sleep/')['generated_article'] == 'Article'
+
+    # Later listings are compared with the listing representation
+    assert store.sync(BLOG, [post('sleep', excerpt='Listing teaser', source='listing')])[0]['status'] == 'unchanged'
+    edited = store.sync(BLOG, [post('sleep', excerpt='Rewritten teaser', source='listing')])
+    assert edited[0]['status'] == 'changed' and edited[0]['generated_article'] == ''
+
+
+def test_stores_without_a_source_column_are_migrated(tmp_path):
+    path = str(tmp_path / 'posts.sqlite3')
+    conn = sqlite3.connect(path)
+    conn.execute(
+        'CREATE TABLE posts (link TEXT PRIMARY KEY, blog_url TEXT NOT NULL, content_hash TEXT NOT NULL, '
+        'data TEXT NOT NULL, position INTEGER NOT NULL, first_seen REAL NOT NULL, last_seen REAL NOT NULL)'
+    )
+    conn.execute(
+        'INSERT INTO posts VALUES (?, ?, ?, ?, 0, 0, 0)',
+        ('https://example.com/sleep/', BLOG, 'old-hash', json.dumps(post('sleep', keywords='sleep')))
+    )
+    conn.commit()
+    conn.close()
+
+    synced = PostStore(path).sync(BLOG, [post('sleep', source='feed')])
+
+    assert synced[0]['status'] == 'unchanged' and synced[0]['keywords'] == 'sleep'
+
+
+def test_status_is_never_persisted(tmp_path):
+    store = make_store(tmp_path)
+    store.sync(BLOG, [post('sleep')])
+    assert 'status' not in store.get('https://example.com/sleep/')
+
+
+def test_get_posts_follows_the_latest_listing_order(tmp_path):
+    store = make_store(tmp_path)
+    store.sync(BLOG, [post('a'), post('b')])
+    store.sync(BLOG, [post('c'), post('a')])
+
+    links = [stored['link'] for stored in store.get_posts(BLOG)]
+    assert links[:2] == ['https://example.com/c/', 'https://example.com/a/']
+    assert store.count(BLOG) == 3
+
+
+def test_update_merges_fields_and_ignores_unknown_links(tmp_path):
+    store = make_store(tmp_path)
+    store.sync(BLOG, [post('sleep')])
+
+    store.update('https://example.com/sleep/', {'keywords': 'sleep'})
+    updated = store.update('https://example.com/sleep/', {'summary': 'Short.'})
+
+    assert updated['keywords'] == 'sleep' and updated['summary'] == 'Short.'
+    assert store.update('https://example.com/missing/', {'summary': 'x'}) is None
+    assert store.get('https://example.com/missing/') is None
+
+
+def test_save_only_touches_stored_posts(tmp_path):
+    store = make_store(tmp_path)
+    posts = store.sync(BLOG, [post('sleep')])
+    posts[0]['summary'] = 'Saved.'
+
+    store.save(posts + [post('unknown', summary='x')])
+
+    assert store.get('https://example.com/sleep/')['summary'] == 'Saved.'
+    assert store.get('https://example.com/unknown/') is None
+
+
+def test_clear_one_blog(tmp_path):
+    store = make_store(tmp_path)
+    store.sync(BLOG, [post('a')])
+    store.sync('https://other.example/blog/', [{'title': 'B', 'link': 'https://other.example/b/', 'excerpt': ''}])
+
+    store.clear(BLOG)
+
+    assert store.count(BLOG) == 0
+    assert store.count('https://other.example/blog/') == 1
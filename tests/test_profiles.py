@@ -0,0 +1,72 @@
+import json
+
+import pytest
+
+from blog_seo.scraper.parsers import get_parser
+from blog_seo.scraper.profiles import (
+    BUILTIN_PROFILES, ProfileRegistry, SelectorProfile, SimpleSelector, order_by_generator, parse_selector
+)
+
+CUSTOM_LISTING = b"""<html><head><meta name="generator" content="Hugo 0.120"></head><body>
+<div class="card"><span class="card-heading"><a href="https://example.com/one/">One</a></span>
+  <p class="card-teaser">First teaser</p></div>
+<div class="card"><span class="card-heading"><a href="https://example.com/two/">Two</a></span>
+  <p class="card-teaser">Second teaser</p></div>
+</body></html>"""
+
+HUGO = {'article': 'div.card', 'title': 'span.card-heading', 'excerpt': '.card-teaser', 'generators': 'Hugo'}
+
+
+def test_parse_selector_alternatives():
+    assert parse_selector('h2.entry-title, .post-title') == (
+        SimpleSelector('h2', ('entry-title',)),
+        SimpleSelector(None, ('post-title',)),
+    )
+
+
+@pytest.mark.parametrize('selector', ['div > a', 'a[href]', '#main', '', 'h2,'])
+def test_unsupported_selectors_fail_on_load(selector):
+    with pytest.raises(ValueError):
+        SelectorProfile(name='bad', article='article', title=selector)
+
+
+def test_order_by_generator_moves_hinted_profiles_first():
+    names = [profile.name for profile in order_by_generator(BUILTIN_PROFILES, ['Ghost 5.0'])]
+    assert names[0] == 'ghost'
+    assert names[1:] == [profile.name for profile in BUILTIN_PROFILES if profile.name != 'ghost']
+
+
+def test_load_registers_file_profiles_first(tmp_path):
+    path = tmp_path / 'profiles.json'
+    path.write_text(json.dumps({'hugo': HUGO, 'wordpress': {'article': 'article', 'title': 'h1'}}))
+    registry = ProfileRegistry()
+
+    loaded = registry.load(str(path))
+
+    assert [profile.name for profile in loaded] == ['hugo', 'wordpress']
+    assert registry.names()[:2] == ['hugo', 'wordpress']
+    assert registry.names().count('wordpress') == 1
+    assert registry.get('hugo').generators == ('hugo',)
+    with pytest.raises(ValueError):
+        registry.get('missing')
+
+
+def test_custom_profile_parses_unknown_markup():
+    registry = ProfileRegistry()
+    registry.register(SelectorProfile.from_dict({'name': 'hugo', **HUGO}))
+
+    listing = get_parser('soup').parse_listing(CUSTOM_LISTING, profiles=list(registry))
+
+    assert listing.profile == 'hugo'
+    assert [(post['title'], post['excerpt']) for post in listing.posts] == [
+        ('One', 'First teaser'), ('Two', 'Second teaser')
+    ]
+
+
+def test_detected_profile_is_tried_first_for_its_host():
+    registry = ProfileRegistry()
+    registry.remember('blog.example.com', 'ghost')
+
+    assert registry.candidates('blog.example.com')[0].name == 'ghost'
+    assert registry.candidates('other.example.com')[0].name == BUILTIN_PROFILES[0].name
+    assert registry.detected('other.example.com') is None
@@ -0,0 +1,127 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from blog_seo.analyzer.llm_cache import LLMCache
+from blog_seo.analyzer.seo_analyzer import COMBINED_TASKS, SEOAnalyzer, parse_combined_output
+from blog_seo.telemetry import Telemetry
+
+
+def stream(chunks: list[str]):
+    # A generator, like the real model stream, so it can be closed
+    return lambda prompt, system: (text for text in chunks)
+
+
+def make_analyzer(tmp_path, chunks: list[str]) -> SEOAnalyzer:
+    analyzer = SEOAnalyzer(cache=LLMCache(str(tmp_path / 'llm.sqlite3')), telemetry=Telemetry())
+    analyzer._stream = stream(chunks)
+    return analyzer
+
+
+def test_streamed_article_is_cached(tmp_path):
+    analyzer = make_analyzer(tmp_path, ['Intro. ', 'Body.'])
+    assert ''.join(analyzer.stream_article('H1', 'seo')) == 'Intro. Body.'
+
+    analyzer._stream = stream(['never called'])
+    assert list(analyzer.stream_article('H1', 'seo')) == ['Intro. Body.']
+
+
+def test_abandoned_stream_closes_the_request_and_caches_nothing(tmp_path):
+    analyzer = make_analyzer(tmp_path, [])
+    closed = threading.Event()
+
+    def model_stream(prompt, system):
+        try:
+            yield from ['one ', 'two ', 'three']
+        finally:
+            closed.set()
+
+    analyzer._stream = model_stream
+    # A Streamlit rerun drops the stream like this, between two chunks
+    article = analyzer.stream_article('H1', 'seo')
+    assert next(article) == 'one '
+    article.close()
+
+    assert closed.is_set()
+    assert analyzer.cache.stats()['entries'] == 0
+
+
+COMBINED_RESPONSE = """Here you go:
+```json
+{"keywords": ["holiday anxiety", "", "counselling"],
+ "headlines": [{"headline": " Why it happens ", "key_points": ["Busy calendars", "Family"]}, "Getting help"],
+ "summary": " Holidays can be stressful. "}
+```"""
+
+
+class StubLLM:
+    """Stands in for crewai's LLM, counting calls and answering from a fixed response."""
+
+    def __init__(self, response: str, delay: float = 0):
+        self.response = response
+        self.delay = delay
+        self.calls = 0
+
+    def call(self, messages):
+        self.calls += 1
+        time.sleep(self.delay)
+        return self.response
+
+
+def make_fast_analyzer(tmp_path, llm: StubLLM) -> SEOAnalyzer:
+    analyzer = SEOAnalyzer(cache=LLMCache(str(tmp_path / 'llm.sqlite3')), mode='fast', telemetry=Telemetry())
+    analyzer.fast_llm = llm
+    return analyzer
+
+
+def test_parse_combined_output():
+    assert parse_combined_output(COMBINED_RESPONSE) == {
+        'keywords': 'holiday anxiety, counselling',
+        'headlines_and_keypoints': '**Why it happens**\n- Busy calendars\n- Family\n\n**Getting help**',
+        'summary': 'Holidays can be stressful.',
+    }
+    assert parse_combined_output('{"keywords": "a, b"}')['keywords'] == 'a, b'
+    with pytest.raises(ValueError):
+        parse_combined_output('no json here')
+
+
+def test_unknown_mode_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        SEOAnalyzer(cache=LLMCache(str(tmp_path / 'llm.sqlite3')), mode='quick')
+
+
+def test_fast_mode_shares_one_call_across_concurrent_tasks(tmp_path):
+    llm = StubLLM(COMBINED_RESPONSE, delay=0.2)
+    analyzer = make_fast_analyzer(tmp_path, llm)
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        results = dict(zip(COMBINED_TASKS, executor.map(lambda task: analyzer.run_task(task, 'text'), COMBINED_TASKS)))
+
+    assert llm.calls == 1
+    assert results == parse_combined_output(COMBINED_RESPONSE)
+    assert analyzer.estimated_calls('summary') == 1 / 3
+    assert analyzer.estimated_calls('generated_article') == 1
+
+
+def test_fast_mode_result_is_cached(tmp_path):
+    llm = StubLLM(COMBINED_RESPONSE)
+    analyzer = make_fast_analyzer(tmp_path, llm)
+
+    analyzer.run_task('keywords', 'text')
+    assert analyzer.run_task('summary', 'text') == 'Holidays can be stressful.'
+    assert llm.calls == 1
+
+
+def test_fast_mode_does_not_cache_unparseable_responses(tmp_path):
+    llm = StubLLM('Sorry, I cannot help with that.')
+    analyzer = make_fast_analyzer(tmp_path, llm)
+
+    with pytest.raises(ValueError):
+        analyzer.run_task('keywords', 'text')
+    assert analyzer.cache.stats()['entries'] == 0
+
+    llm.response = COMBINED_RESPONSE
+    assert analyzer.run_task('keywords', 'text') == 'holiday anxiety, counselling'
+    assert llm.calls == 2
@@ -0,0 +1,103 @@
+import asyncio
+import json
+
+import pytest
+
+from blog_seo.telemetry import JsonlSink, Telemetry, estimate_cost
+
+
+def test_span_records_fields_duration_and_parent():
+    telemetry = Telemetry()
+
+    with telemetry.span('analyze', url='u') as outer:
+        outer['bytes'] = 10
+        with telemetry.span('llm_call') as inner:
+            inner['prompt_tokens'] = 100
+
+    inner_event, outer_event = telemetry.events
+    assert inner_event['stage'] == 'llm_call' and inner_event['parent'] == 'analyze'
+    assert outer_event['parent'] is None and outer_event['url'] == 'u'
+    assert outer_event['duration'] >= inner_event['duration'] >= 0
+
+
+def test_parent_stage_reaches_worker_threads():
+    telemetry = Telemetry()
+
+    def work():
+        with telemetry.span('parse'):
+            pass
+
+    async def main():
+        with telemetry.span('fetch'):
+            await asyncio.to_thread(work)
+
+    asyncio.run(main())
+
+    assert telemetry.events[0]['parent'] == 'fetch'
+
+
+def test_errors_are_recorded_and_reraised():
+    telemetry = Telemetry()
+
+    with pytest.raises(RuntimeError):
+        with telemetry.span('fetch'):
+            raise RuntimeError('boom')
+
+    assert telemetry.events[0]['error'] == 'RuntimeError: boom'
+    assert telemetry.summary()[0]['errors'] == 1
+
+
+def test_summary_aggregates_counted_fields():
+    telemetry = Telemetry()
+    for hit in (True, False, False):
+        with telemetry.span('fetch') as event:
+            event.update(bytes=100, retries=1, cache_hit=hit)
+    cost = estimate_cost('claude-3-5-sonnet-20241022', 1000, 100)
+    with telemetry.span('llm_call') as event:
+        event.update(prompt_tokens=1000, completion_tokens=100, cost=cost)
+
+    rows = {row['stage']: row for row in telemetry.summary()}
+
+    assert rows['fetch']['calls'] == 3
+    assert rows['fetch']['bytes'] == 300 and rows['fetch']['retries'] == 3
+    assert rows['fetch']['cache_hits'] == 1
+    assert rows['llm_call']['prompt_tokens'] == 1000
+    assert rows['llm_call']['cost_usd'] == round((1000 * 3.0 + 100 * 15.0) / 1_000_000, 4)
+
+
+def test_estimate_cost_of_unknown_model_is_zero():
+    assert estimate_cost('local-model', 10_000, 10_000) == 0
+
+
+def test_prometheus_histogram_is_cumulative():
+    telemetry = Telemetry()
+    for duration in (0.001, 0.2, 100.0):
+        telemetry.record({'stage': 'fetch', 'duration': duration})
+
+    text = telemetry.prometheus()
+
+    assert 'blog_seo_stage_calls_total{stage="fetch"} 3' in text
+    assert 'blog_seo_stage_duration_seconds_bucket{stage="fetch",le="0.005"} 1' in text
+    assert 'blog_seo_stage_duration_seconds_bucket{stage="fetch",le="0.25"} 2' in text
+    assert 'blog_seo_stage_duration_seconds_bucket{stage="fetch",le="120"} 3' in text
+    assert 'blog_seo_stage_duration_seconds_bucket{stage="fetch",le="+Inf"} 3' in text
+    assert 'blog_seo_stage_duration_seconds_count{stage="fetch"} 3' in text
+
+
+def test_jsonl_sink_appends_events_and_failing_sinks_are_ignored(tmp_path):
+    path = tmp_path / 'events.jsonl'
+
+    def broken(event):
+        raise OSError('disk full')
+
+    telemetry = Telemetry([broken, JsonlSink(str(path))])
+    with telemetry.span('fetch', url='a'):
+        pass
+    with telemetry.span('fetch', url='b'):
+        pass
+
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [line['url'] for line in lines] == ['a', 'b']
+
+    telemetry.reset()
+    assert not telemetry.events and telemetry.summary() == []